@@ -0,0 +1,59 @@
+"""Import-time benchmark of preseeapy.
+
+Imports each module in a fresh interpreter and reports the best wall
+time of --repeat runs together with the heavy packages it loaded.
+Analysis and cached-data modules should load without Scrapy, Twisted
+or NumPy; the crawl machinery is loaded on the first crawl.
+
+    python -m benchmarks.bench_import --repeat 5
+"""
+import argparse
+import subprocess
+import sys
+
+MODULES = ['preseeapy.PRESEEA', 'preseeapy.VerbClassifier',
+           'preseeapy.Pronoun', 'preseeapy.BatchAnalyser',
+           'preseeapy.ASPXTwister']
+HEAVY_PACKAGES = ['scrapy', 'twisted', 'numpy']
+
+PROBE = """
+import sys, time
+start = time.perf_counter()
+import {module}
+elapsed = time.perf_counter() - start
+loaded = [name for name in {packages!r} if name in sys.modules]
+print(elapsed, ",".join(loaded))
+"""
+
+
+def measure(module: str, repeat: int) -> (float, list):
+    best = float('inf')
+    loaded = []
+    for _ in range(repeat):
+        output = subprocess.run(
+            [sys.executable, '-c', PROBE.format(module=module,
+                                                packages=HEAVY_PACKAGES)],
+            check=True, capture_output=True, text=True).stdout.split()
+        best = min(best, float(output[0]))
+        loaded = output[1].split(",") if len(output) > 1 else []
+
+    return best, loaded
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[0])
+    parser.add_argument('--repeat', type=int, default=5)
+    parser.add_argument('--module', action='append',
+                        help='Module to import, repeatable. '
+                             'Defaults to a selection of preseeapy.')
+    args = parser.parse_args()
+
+    print("{:28} {:>10}  {}".format('module', 'time [ms]', 'loaded'))
+    for module in args.module or MODULES:
+        elapsed, loaded = measure(module, args.repeat)
+        print("{:28} {:>10.1f}  {}".format(module, 1000 * elapsed,
+                                           ", ".join(loaded) or "-"))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,101 @@
+"""Benchmark of phrase lookups with InvertedIndex.
+
+Crawls --phrases phrases from a local stand-in of Corpus.aspx, indexes
+the crawled samples with their phrases and answers the same phrases
+three ways: with the live crawl, with a brute-force scan of all samples
+and with the index. The index has to answer exactly the crawled records,
+and its positional search has to find the samples of the scan.
+
+    python -m benchmarks.bench_inverted_index --rows 2000 --latency 0.05
+"""
+import argparse
+import time
+from preseeapy.InvertedIndex import InvertedIndex
+from preseeapy.WordClassifier import WordClassifier, iter_sequence
+from preseeapy.tests.aspx_server import (AspxStandInServer,
+                                         StandInPreseeabotSpider,
+                                         stand_in_settings)
+from benchmarks.bench_scaling import crawl
+
+
+def scan(sample_list: list, phrase: str) -> list:
+    """Search every sample text for the phrase, kept for comparison"""
+    sequence = WordClassifier(phrase).get_word_list()
+    return [sample for sample in sample_list
+            if any(True for _ in iter_sequence(
+                WordClassifier(sample['text']).get_word_list(), sequence))]
+
+
+def measure(function, phrase_list: list, repeat: int) -> (float, list):
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = [function(phrase) for phrase in phrase_list]
+        best = min(best, time.perf_counter() - start)
+
+    return best, result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[0])
+    parser.add_argument('--rows', type=int, default=2000,
+                        help='Result rows of every phrase')
+    parser.add_argument('--page-size', type=int, default=200,
+                        help='Rows per result page')
+    parser.add_argument('--latency', type=float, default=0.05,
+                        help='Seconds every response is delayed')
+    parser.add_argument('--phrases', type=int, default=4)
+    parser.add_argument('--repeat', type=int, default=3)
+    args = parser.parse_args()
+
+    phrase_list = ["{} ".format(word) for word in
+                   ["ustedes", "vosotros", "nosotros", "yo"][:args.phrases]]
+    filter_list = [{'phrase': phrase, 'city': 'Madrid', 'gender': 'all',
+                    'education': 'all', 'age': 'all'}
+                   for phrase in phrase_list]
+
+    with AspxStandInServer(args.rows, args.page_size,
+                           args.latency) as server:
+        start = time.perf_counter()
+        crawled = crawl(StandInPreseeabotSpider, filter_list, 1,
+                        stand_in_settings(server.get_url(),
+                                          {'LOG_LEVEL': 'WARNING'}))
+        crawl_time = time.perf_counter() - start
+    if isinstance(crawled, Exception):
+        raise crawled
+
+    sample_list = [sample for result in crawled for sample in result]
+    start = time.perf_counter()
+    index = InvertedIndex()
+    for phrase, result in zip(phrase_list, crawled):
+        index.add_samples(result, 'Madrid', phrase)
+    build_time = time.perf_counter() - start
+
+    scan_time, scanned = measure(lambda phrase: scan(sample_list, phrase),
+                                 phrase_list, args.repeat)
+    index_time, found = measure(
+        lambda phrase: index.lookup(phrase, 'Madrid'), phrase_list,
+        args.repeat)
+
+    if found != crawled:
+        raise AssertionError('Index and crawl disagree')
+    for phrase, samples in zip(phrase_list, scanned):
+        positions = index.find(phrase)
+        if [sample_list[idx] for idx in sorted(
+                {sample_idx for sample_idx, _ in positions})] != samples:
+            raise AssertionError('Index and scan disagree')
+
+    n_lookups = len(phrase_list)
+    print("Samples:       {} ({} phrases)".format(len(sample_list),
+                                                  n_lookups))
+    print("Index build:   {:8.3f} s".format(build_time))
+    for name, elapsed in [("Live crawl:", crawl_time),
+                          ("Scan:", scan_time),
+                          ("Index:", index_time)]:
+        print("{:14} {:8.3f} s ({:.2f} ms per phrase, {:.0f} x)".format(
+            name, elapsed, 1000 * elapsed / n_lookups,
+            crawl_time / elapsed))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,118 @@
+"""Benchmark of the result page parser of PreseeabotSpider.
+
+Compares the single-pass row parser with the former parser, which
+extracted every cell of the grid again for each phrase. Without --page a
+synthetic result page is saved to disk first. The former parser is
+quadratic (about 18 s for 300 rows), so it parses only the first
+--legacy-rows rows of the page once. Each of its rows costs the same on
+a given page, so its time for the whole page is extrapolated from them.
+
+    python -m benchmarks.bench_parse_results --rows 3000
+    python -m benchmarks.bench_parse_results --page saved_corpus.html
+"""
+import argparse
+import itertools
+import os
+import re
+import tempfile
+import time
+from scrapy.http import HtmlResponse
+from preseeapy.preseeaspider.spiders.preseeabot import PreseeabotSpider
+from preseeapy.tests import synthetic
+
+
+def legacy_parse_page(spider, response):
+    """Parser before the single-pass rewrite, kept for comparison"""
+    phrase_table = response.css("table.preseea_grid")
+
+    phrase_list = phrase_table.css("tr span").extract()
+    phrase_list = [element for element in phrase_list if 'TextMatch' in element]
+
+    NUM_ELEMENTS_PER_ITEM = 5
+
+    for idx, phrase in enumerate(phrase_list):
+        phrase = phrase.split("TextMatch")[1]
+
+        if spider._search_phrase != " ":
+            phrase = phrase.split("<span")[0] + " {} ".format(spider._search_phrase) + phrase.split("{}</span>".format(spider._search_phrase))[1]
+            phrase = re.sub(r'\<.*?\>', '', phrase)
+            phrase = re.sub(r'&lt.*?&gt;', '', phrase)
+            phrase = spider.cut_begin(phrase)
+
+        date_info = phrase_table.css("tr td").extract()[2 + idx*NUM_ELEMENTS_PER_ITEM]
+        country_info = phrase_table.css("tr td").extract()[3 + idx*NUM_ELEMENTS_PER_ITEM]
+
+        label = phrase_table.css("tr td").extract()[0 + idx*NUM_ELEMENTS_PER_ITEM]
+        label = label.split(")\">")[1].split("</a>")[0]
+
+        yield {
+            'label': label,
+            'text': phrase,
+            'date': date_info.split("px;\">")[1].split('</td>')[0],
+            'country': country_info.split("<td>")[1].split('</td>')[0],
+        }
+
+
+def measure(function, repeat: int) -> (float, list):
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        records = function()
+        best = min(best, time.perf_counter() - start)
+
+    return best, records
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[0])
+    parser.add_argument('--page', help='Saved Corpus.aspx result page')
+    parser.add_argument('--phrase', default='ustedes ',
+                        help='Phrase the page was searched with')
+    parser.add_argument('--rows', type=int, default=3000,
+                        help='Rows of the synthetic page')
+    parser.add_argument('--repeat', type=int, default=3)
+    parser.add_argument('--legacy-rows', type=int, default=20,
+                        help='Rows parsed by the former parser, 0 for all')
+    args = parser.parse_args()
+
+    page = args.page
+    if page is None:
+        rows = synthetic.build_rows(args.rows, args.phrase)
+        page = os.path.join(tempfile.mkdtemp(), 'corpus_result.html')
+        with open(page, 'w', encoding='utf-8') as file:
+            file.write(synthetic.build_result_page(rows, args.phrase))
+
+    with open(page, 'rb') as file:
+        body = file.read()
+    response = HtmlResponse(url=PreseeabotSpider.start_urls[0], body=body,
+                            encoding='utf-8')
+    spider = PreseeabotSpider({'phrase': args.phrase, 'city': 'all',
+                               'gender': 'all', 'education': 'all',
+                               'age': 'all'})
+
+    new_time, new_records = measure(
+        lambda: list(spider._parse_page(response)), args.repeat)
+
+    print("Page: {} ({} rows)".format(page, len(new_records)))
+    print("Single-pass parser: {:9.3f} s ({:.0f} rows/s)".format(
+        new_time, len(new_records) / new_time))
+
+    n_legacy = len(new_records)
+    if 0 < args.legacy_rows < n_legacy:
+        n_legacy = args.legacy_rows
+    old_time, old_records = measure(
+        lambda: list(itertools.islice(legacy_parse_page(spider, response),
+                                      n_legacy)), 1)
+    if new_records[:n_legacy] != old_records:
+        raise AssertionError('Parsers disagree on {}'.format(page))
+
+    old_time *= len(new_records) / max(n_legacy, 1)
+    estimate = ""
+    if n_legacy < len(new_records):
+        estimate = ", extrapolated from {} rows".format(n_legacy)
+    print("Legacy parser:      {:9.3f} s{}".format(old_time, estimate))
+    print("Speedup:            {:9.1f} x".format(old_time / new_time))
+
+
+if __name__ == '__main__':
+    main()
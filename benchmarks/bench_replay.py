@@ -0,0 +1,66 @@
+"""End-to-end benchmark of a replayed crawl and its verb analysis.
+
+Runs PRESEEA.retrieve_phrase_data and PRESEEA.analyse_verbs against an
+HTTP archive of RecordReplayDownloaderMiddleware, so the whole
+PreseeabotSpider -> parse_results -> analyse_verbs pipeline is measured
+without network access. Without --archive a synthetic archive is written.
+
+Record an archive of the live site once:
+    python -m benchmarks.bench_replay --record --archive madrid.jsonl.gz
+Replay it:
+    python -m benchmarks.bench_replay --archive madrid.jsonl.gz
+"""
+import argparse
+import os
+import tempfile
+import time
+from preseeapy.PRESEEA import PRESEEA
+from preseeapy.SampleCountIndex import ALL_SAMPLES_PHRASE
+from preseeapy.preseeaspider.middlewares import archive_settings
+from preseeapy.tests import synthetic
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[0])
+    parser.add_argument('--archive', help='HTTP archive file')
+    parser.add_argument('--record', action='store_true',
+                        help='Record the archive from the live site')
+    parser.add_argument('--city', default='Madrid')
+    parser.add_argument('--phrase', default='ustedes ')
+    parser.add_argument('--rows', type=int, default=2000,
+                        help='Rows of a synthetic archive')
+    parser.add_argument('--repeat', type=int, default=3)
+    args = parser.parse_args()
+
+    archive = args.archive
+    if archive is None:
+        archive = os.path.join(tempfile.mkdtemp(), 'archive.jsonl.gz')
+        filter_list = [{'phrase': phrase, 'city': args.city, 'gender': 'all',
+                        'education': 'all', 'age': 'all'}
+                       for phrase in [args.phrase, ALL_SAMPLES_PHRASE]]
+        synthetic.write_archive(archive, filter_list, args.rows)
+
+    mode = 'record' if args.record else 'replay'
+    corpus = PRESEEA(author='bench_replay',
+                     crawler_settings=archive_settings(mode, archive))
+    corpus.set_filter(city=args.city, gender='all', age='all',
+                      education='all', phrase=args.phrase)
+
+    for run in range(args.repeat):
+        start = time.perf_counter()
+        sample_list = corpus.retrieve_phrase_data()
+        crawled = time.perf_counter()
+        corpus.analyse_verbs(sample_list)
+        analysed = time.perf_counter()
+
+        total = analysed - start
+        print("Run {}: {} samples, crawl {:.3f} s, analysis {:.3f} s, "
+              "{:.0f} samples/s".format(run + 1, len(sample_list),
+                                        crawled - start, analysed - crawled,
+                                        len(sample_list) / total))
+        if args.record:
+            break
+
+
+if __name__ == '__main__':
+    main()
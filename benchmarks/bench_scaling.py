@@ -0,0 +1,83 @@
+"""Scaling benchmark of concurrent crawls against a local Corpus.aspx.
+
+Starts an AspxStandInServer on localhost and crawls --queries filters
+with PreseeabotSpider at each concurrency level, one reactor per level.
+Reports requests/s seen by the server and rows/s returned to the caller.
+
+    python -m benchmarks.bench_scaling --rows 500 --page-size 100 \\
+        --latency 0.05 --concurrency 1 2 4 8
+"""
+import argparse
+import functools
+import time
+from preseeapy.ASPXTwister import ASPXTwisterClass
+from preseeapy.preseeaspider.spiders.preseeabot import PreseeabotSpider
+from preseeapy.utils import ProcessHandler
+from preseeapy.tests import synthetic
+from preseeapy.tests.aspx_server import (AspxStandInServer,
+                                         StandInPreseeabotSpider,
+                                         stand_in_settings)
+
+
+def crawl(spider, filter_list: list, concurrency: int, settings: dict) -> list:
+    twister = ASPXTwisterClass({}, spider, settings)
+    process_instance = ProcessHandler(functools.partial(
+        twister._retrieve_many_subprocess, filter_list, concurrency))
+    results = process_instance.get_queue_content()
+    process_instance.close()
+
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[0])
+    parser.add_argument('--rows', type=int, default=500,
+                        help='Result rows of every query')
+    parser.add_argument('--page-size', type=int, default=100,
+                        help='Rows per result page')
+    parser.add_argument('--latency', type=float, default=0.05,
+                        help='Seconds every response is delayed')
+    parser.add_argument('--queries', type=int, default=8,
+                        help='Filters crawled per concurrency level')
+    parser.add_argument('--concurrency', type=int, nargs='+',
+                        default=[1, 2, 4, 8],
+                        help='Simultaneous crawls')
+    parser.add_argument('--pages', type=int,
+                        default=PreseeabotSpider.MAX_CONCURRENT_PAGES,
+                        help='Result pages requested at the same time')
+    args = parser.parse_args()
+
+    filter_list = [{'phrase': "{} ".format(word), 'city': 'Madrid',
+                    'gender': 'all', 'education': 'all', 'age': 'all'}
+                   for word in synthetic.WORDS[:args.queries]]
+    settings = {'MAX_CONCURRENT_PAGES': args.pages,
+                'LOG_LEVEL': 'WARNING'}
+
+    with AspxStandInServer(args.rows, args.page_size,
+                           args.latency) as server:
+        print("{} queries of {} rows, {} pages each, {:.3f} s latency".format(
+            len(filter_list), args.rows, server.get_page_count(),
+            args.latency))
+        print("{:>11} {:>9} {:>9} {:>11} {:>11}".format(
+            'concurrency', 'requests', 'time [s]', 'requests/s', 'rows/s'))
+
+        for concurrency in args.concurrency:
+            server.reset_number_requests()
+            start = time.perf_counter()
+            results = crawl(StandInPreseeabotSpider, filter_list,
+                            concurrency,
+                            stand_in_settings(server.get_url(), settings))
+            elapsed = time.perf_counter() - start
+
+            if isinstance(results, Exception):
+                raise results
+            n_rows = sum(len(result) for result in results
+                         if isinstance(result, list))
+            n_requests = server.get_number_requests()
+            print("{:>11} {:>9} {:>9.3f} {:>11.1f} {:>11.0f}".format(
+                concurrency, n_requests, elapsed, n_requests / elapsed,
+                n_rows / elapsed))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,90 @@
+"""Micro-benchmark of Tokenizer.
+
+Tokenizes synthetic transcriptions with the compiled tokenizer, with
+spans and with integer ids, and through VerbClassifier.set_phrase as the
+package does. Compares them with the former two step path of
+WordClassifier.set_word_list and VerbClassifier.set_word_list.
+
+    python -m benchmarks.bench_tokenizer --samples 20000
+"""
+import argparse
+import time
+from preseeapy.Tokenizer import Tokenizer
+from preseeapy.VerbClassifier import VerbClassifier
+from preseeapy.tests import synthetic
+
+
+def legacy_tokenize(text: str) -> list:
+    """Split and filter, then strip every word, kept for comparison"""
+    no_word_list = ["", "/", "…"]
+    word_list = [word for word in text.split(" ")
+                 if word not in no_word_list]
+
+    checked_list = []
+    for word in word_list:
+        if type(word) != str or len(word) < 2:
+            continue
+        if (word[-1] == "?" or word[-1] == "!"):
+            word = word[:-1]
+        if (word[0] == "¿" or word[0] == "¡"):
+            word = word[1:]
+        checked_list.append(word)
+
+    return checked_list
+
+
+def measure(function, text_list: list, repeat: int) -> (float, list):
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = [function(text) for text in text_list]
+        best = min(best, time.perf_counter() - start)
+
+    return best, result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[0])
+    parser.add_argument('--samples', type=int, default=20000)
+    parser.add_argument('--phrase', default='ustedes ')
+    parser.add_argument('--repeat', type=int, default=3)
+    args = parser.parse_args()
+
+    rows = synthetic.build_rows(args.samples, args.phrase)
+    text_list = [synthetic.expected_record(row, args.phrase)['text']
+                 for row in rows]
+
+    tokenizer = Tokenizer(strip=True)
+    vocabulary = {}
+    classifier = VerbClassifier([])
+
+    def classifier_words(text):
+        classifier.set_phrase(text)
+        return classifier.get_word_list()
+
+    timings = []
+    for name, function in [
+            ("Words:", tokenizer.tokenize),
+            ("Spans:", tokenizer.tokenize_spans),
+            ("Ids:", lambda text: tokenizer.tokenize_ids(text, vocabulary)),
+            ("VerbClassifier:", classifier_words),
+            ("Legacy path:", legacy_tokenize)]:
+        timings.append((name,) + measure(function, text_list, args.repeat))
+
+    word_lists = [result for _, _, result in timings]
+    if word_lists[0] != word_lists[4] or word_lists[0] != word_lists[3] or \
+            word_lists[0] != [[word for word, _, _ in spans]
+                              for spans in word_lists[1]]:
+        raise AssertionError('Tokenizers disagree')
+
+    n_tokens = sum(len(word_list) for word_list in word_lists[0])
+    legacy_time = timings[4][1]
+    print("Samples:       {}".format(len(text_list)))
+    print("Tokens:        {}".format(n_tokens))
+    for name, elapsed, _ in timings:
+        print("{:16} {:7.3f} s ({:.0f} tokens/s, {:.1f} x)".format(
+            name, elapsed, n_tokens / elapsed, legacy_time / elapsed))
+
+
+if __name__ == '__main__':
+    main()
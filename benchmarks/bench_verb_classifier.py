@@ -0,0 +1,76 @@
+"""Micro-benchmark of VerbClassifier.classify_verbs.
+
+Compares the compiled suffix trie, with and without the classification
+cache, against the former method-by-method path, which ran all six is_*
+methods on every word, on a synthetic token list.
+
+    python -m benchmarks.bench_verb_classifier --tokens 1000000
+"""
+import argparse
+import random
+import time
+from preseeapy.VerbClassifier import VerbClassifier
+from preseeapy.tests import synthetic
+
+SUFFIXES = ['', 'o', 'oy', 'as', 'es', 'a', 'mos', 'áis', 'an', 'iendo']
+
+
+def legacy_classify_verbs(classifier: VerbClassifier) -> dict:
+    """Method-by-method classification, kept for comparison"""
+    verb_class = {key: [] for key in classifier.VERB_CLASSES}
+    for word in classifier.get_word_list():
+        for key, name in classifier.VERB_CLASSES.items():
+            if getattr(classifier, name)(word):
+                verb_class[key].append(word)
+
+    return verb_class
+
+
+def measure(function, repeat: int) -> (float, dict):
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = function()
+        best = min(best, time.perf_counter() - start)
+
+    return best, result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[0])
+    parser.add_argument('--tokens', type=int, default=1000000)
+    parser.add_argument('--repeat', type=int, default=3)
+    args = parser.parse_args()
+
+    generator = random.Random(0)
+    tokens = [generator.choice(synthetic.WORDS) + generator.choice(SUFFIXES)
+              for _ in range(args.tokens)]
+    classifier = VerbClassifier(tokens)
+
+    cache_size = VerbClassifier.CACHE_SIZE
+    VerbClassifier.set_cache_size(0)
+    trie_time, trie_result = measure(classifier.classify_verbs, args.repeat)
+
+    VerbClassifier.set_cache_size(cache_size)
+    cached_time, cached_result = measure(classifier.classify_verbs,
+                                         args.repeat)
+    cache_info = VerbClassifier.get_cache_info()
+
+    old_time, old_result = measure(
+        lambda: legacy_classify_verbs(classifier), args.repeat)
+    if not old_result == trie_result == cached_result:
+        raise AssertionError('Classifiers disagree')
+
+    n_tokens = len(classifier.get_word_list())
+    print("Tokens:        {}".format(n_tokens))
+    for name, elapsed in [("Cached trie:", cached_time),
+                          ("Suffix trie:", trie_time),
+                          ("Method path:", old_time)]:
+        print("{:14} {:7.3f} s ({:.0f} tokens/s, {:.1f} x)".format(
+            name, elapsed, n_tokens / elapsed, old_time / elapsed))
+    print("Cache:         {hits} hits, {misses} misses, "
+          "{size} word forms".format(**cache_info))
+
+
+if __name__ == '__main__':
+    main()
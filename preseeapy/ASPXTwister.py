@@ -1,23 +1,33 @@
-from twisted.internet import reactor
+from twisted.internet import defer
 from multiprocessing import Queue
 from scrapy.signalmanager import dispatcher
 from scrapy.crawler import CrawlerRunner
 from scrapy import signals
 import scrapy
+from .Sample import to_sample
+
+
+CRAWLER_SETTINGS = {
+    'USER_AGENT': "Mozilla/5.0 (X11; Linux x86_64) AppleWebKit/537.36 \
+                   (KHTML, like Gecko) Chrome/55.0.2883.75 \
+                   Safari/537.36",
+    'DOWNLOAD_TIMEOUT': 100,
+    'REDIRECT_ENABLED': False,
+    'SPIDER_MIDDLEWARES': {
+        'scrapy.spidermiddlewares.httperror.HttpErrorMiddleware': True
+    }
+}
+
+# Marks the end of a streamed crawl on the queue
+END_OF_STREAM = '__END_OF_STREAM__'
 
 
 class ASPXTwisterClass():
-    def __init__(self, parameters: dict, spider: scrapy.Spider):
-        self._crawler_meta = {
-            'USER_AGENT': "Mozilla/5.0 (X11; Linux x86_64) AppleWebKit/537.36 \
-                           (KHTML, like Gecko) Chrome/55.0.2883.75 \
-                           Safari/537.36",
-            'DOWNLOAD_TIMEOUT': 100,
-            'REDIRECT_ENABLED': False,
-            'SPIDER_MIDDLEWARES': {
-                'scrapy.spidermiddlewares.httperror.HttpErrorMiddleware': True
-            }
-        }
+    def __init__(self, parameters: dict, spider: scrapy.Spider,
+                 settings: dict = None):
+        self._crawler_meta = dict(CRAWLER_SETTINGS)
+        if settings is not None:
+            self._crawler_meta.update(settings)
 
         # Save crawled results iteratively within a list
         self._crawler_results = []
@@ -26,7 +36,31 @@ class ASPXTwisterClass():
 
     # Signal process function definition
     def crawler_results(self, signal, sender, item, response, spider):
-        self._crawler_results.append(item)
+        self._crawler_results.append(to_sample(item))
+
+    def get_settings(self) -> dict:
+        return self._crawler_meta
+
+    def crawl(self, runner: CrawlerRunner):
+        """Schedule a crawl for the instances' filter parameters on an
+           already running CrawlerRunner. The item signal is connected
+           to this crawler only, so several crawls can share one runner.
+
+        Args:
+            runner (CrawlerRunner): Runner within a running reactor
+
+        Returns:
+            Deferred: Fires with the list of crawled results
+        """
+        self._crawler_results = []
+        crawler = runner.create_crawler(self._spider_bot)
+        crawler.signals.connect(self.crawler_results,
+                                signal=signals.item_scraped)
+
+        deferred = runner.crawl(crawler, self._parameter_dict)
+        deferred.addCallback(lambda _: self._crawler_results)
+
+        return deferred
 
     def _retrieve_phrase_data_subprocess(self, queue: Queue) -> list:
         """This method retrieves a list of phrases from an html document
@@ -34,6 +68,9 @@ class ASPXTwisterClass():
         Returns:
             list: List of strings with phrases containing searched phrase
         """
+        # The global reactor is installed within the crawl process only
+        from twisted.internet import reactor
+
         # Set up a crawler process to use a spider
         runner = CrawlerRunner(self._crawler_meta)
 
@@ -56,6 +93,76 @@ class ASPXTwisterClass():
         else:
             queue.put(None)
 
+    def _stream_phrase_data_subprocess(self, chunk_size: int, queue: Queue):
+        """This method streams the phrases from an html document while
+           they are crawled. Items are put onto the queue in chunks of
+           chunk_size, followed by END_OF_STREAM.
+
+        Args:
+            chunk_size (int): Maximum number of items per chunk
+        """
+        if not self.check_parameters():
+            queue.put(END_OF_STREAM)
+            return None
+
+        from twisted.internet import reactor
+
+        runner = CrawlerRunner(self._crawler_meta)
+        crawler = runner.create_crawler(self._spider_bot)
+
+        chunk = []
+
+        def stream_results(item):
+            chunk.append(to_sample(item))
+            if len(chunk) >= chunk_size:
+                # Blocks the reactor while the queue is full, so the
+                # crawl does not run ahead of the reading process
+                queue.put(list(chunk))
+                chunk.clear()
+
+        crawler.signals.connect(stream_results, signal=signals.item_scraped)
+
+        try:
+            defered = runner.crawl(crawler, self._parameter_dict)
+            defered.addErrback(lambda failure: queue.put(failure.value))
+            defered.addBoth(lambda _: reactor.stop())
+
+            reactor.run()
+            if chunk:
+                queue.put(list(chunk))
+        except Exception as e:
+            queue.put(e)
+
+        queue.put(END_OF_STREAM)
+
+    def _retrieve_many_subprocess(self, parameter_list: list,
+                                  concurrency: int, queue: Queue):
+        """This method retrieves the phrase lists for several filter
+           dictionaries within a single reactor run
+
+        Args:
+            parameter_list (list): List of filter dictionaries
+            concurrency (int): Maximum number of simultaneous crawls
+
+        Returns:
+            list: List of result lists in the order of the filters
+        """
+        from twisted.internet import reactor
+
+        runner = CrawlerRunner(self._crawler_meta)
+
+        results = []
+        try:
+            defered = crawl_many(runner, self._spider_bot, parameter_list,
+                                 concurrency, self._crawler_meta)
+            defered.addCallback(results.extend)
+            defered.addBoth(lambda _: reactor.stop())
+
+            reactor.run()
+            queue.put(results)
+        except Exception as e:
+            queue.put(e)
+
     def set_parameters(self, parameters: dict):
         self._parameter_dict = parameters
 
@@ -77,3 +184,39 @@ class ASPXTwisterClass():
                 check_filters = False
 
         return check_filters
+
+
+def crawl_many(runner: CrawlerRunner, spider: scrapy.Spider,
+               parameter_list: list, concurrency: int = 8,
+               settings: dict = None):
+    """Schedule one crawl per filter dictionary on a single runner.
+       At most concurrency crawls are running at the same time.
+
+    Args:
+        runner (CrawlerRunner): Runner within a running reactor
+        spider (scrapy.Spider): Spider class to crawl with
+        parameter_list (list): List of filter dictionaries
+        concurrency (int, optional): Maximum number of simultaneous
+            crawls. Defaults to 8.
+        settings (dict, optional): Crawler settings. Defaults to None.
+
+    Returns:
+        Deferred: Fires with a list of results in the order of the
+            filters. Incomplete filters give None, failed crawls
+            their exception.
+    """
+    if type(concurrency) is not int or concurrency < 1:
+        raise ValueError('Concurrency has to be a positive integer!')
+
+    semaphore = defer.DeferredSemaphore(concurrency)
+    deferred_list = []
+    for parameters in parameter_list:
+        twister = ASPXTwisterClass(parameters, spider, settings)
+        if twister.check_parameters():
+            deferred = semaphore.run(twister.crawl, runner)
+            deferred.addErrback(lambda failure: failure.value)
+        else:
+            deferred = defer.succeed(None)
+        deferred_list.append(deferred)
+
+    return defer.gatherResults(deferred_list)
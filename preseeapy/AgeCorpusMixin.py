@@ -8,8 +8,7 @@ class AgeCorpusMixin():
         Args:
             name (str): Name of the age the corpus should be filtered on
         """
-        age_list = self._feature_dict['Age']
-        if name in age_list:
+        if self._schema.is_valid('Age', name):
             self._age = name
         elif name == "all":
             self._age = "all"
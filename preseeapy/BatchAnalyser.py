@@ -0,0 +1,277 @@
+import os
+from concurrent.futures import ProcessPoolExecutor
+import numpy as np
+from .WordClassifier import WordClassifier
+from .VerbClassifier import VerbClassifier
+from .Pronoun import Pronoun
+from .Vocabulary import Vocabulary
+
+
+class BatchAnalyser():
+    """Analyse the verbs around a search phrase for a whole batch of
+       samples. All texts are encoded into one token id array, every
+       distinct token is classified once and the context windows of all
+       samples are evaluated with NumPy.
+    """
+    def __init__(self, search_phrase: str, vocabulary: Vocabulary = None):
+        """Prepare the analysis of a search phrase
+
+        Args:
+            search_phrase (str): Phrase the samples were searched with
+            vocabulary (Vocabulary, optional): Lexicon encoding the texts.
+                Defaults to None (Vocabulary.shared).
+        """
+        word_classifier = WordClassifier("")
+        self._vocabulary = vocabulary or Vocabulary.shared()
+        self._word_range = word_classifier.WORD_RANGE
+
+        # Several words are matched as a sequence like in WordClassifier
+        self._search_phrase = search_phrase
+        self._search_words = word_classifier.set_word_list(search_phrase)
+        self._verb_classes = list(VerbClassifier.VERB_CLASSES.keys())
+
+        # The pronoun of the search phrase is the same for every sample
+        pronoun_key = Pronoun().get_pronoun_key(search_phrase)
+        self._pronoun_column = None
+        if pronoun_key is not None:
+            self._pronoun_column = self._verb_classes.index(pronoun_key)
+
+        # Token data and windows of the last analysed batch
+        self._batch = None
+
+    def get_verb_classes(self) -> list:
+        return self._verb_classes
+
+    def _find_sequence(self, token_ids, offsets, search_ids: list):
+        """Start positions of the search words as a sequence, which
+           does not cross the end of its sample
+
+        Args:
+            token_ids (numpy.ndarray): Token ids of all samples
+            offsets (numpy.ndarray): Start offset of every sample
+            search_ids (list): Token ids of the search words, None if a
+                search word is unknown
+
+        Returns:
+            numpy.ndarray: Start positions in ascending order
+        """
+        n_search = len(search_ids)
+        n_candidates = len(token_ids) - n_search + 1
+        if not search_ids or None in search_ids or n_candidates < 1:
+            return np.zeros(0, dtype=np.int64)
+
+        is_match = token_ids[:n_candidates] == search_ids[0]
+        for shift, search_id in enumerate(search_ids[1:], 1):
+            is_match &= token_ids[shift:shift + n_candidates] == search_id
+        positions = np.flatnonzero(is_match)
+
+        sample_ends = offsets[np.searchsorted(offsets, positions,
+                                              side='right')]
+        return positions[positions + n_search <= sample_ends]
+
+    def _window_positions(self, token_ids, offsets,
+                          search_ids: list) -> tuple:
+        """Token positions of the leading and following windows
+
+        Args:
+            token_ids (numpy.ndarray): Token ids of all samples
+            offsets (numpy.ndarray): Start offset of every sample
+            search_ids (list): Token ids of the search words
+
+        Returns:
+            tuple: Position of the search phrase per sample (-1 if it is
+                missing), leading and following positions as arrays of
+                shape (samples, word range), -1 outside of the sample
+        """
+        n_samples = len(offsets) - 1
+        starts, ends = offsets[:-1], offsets[1:]
+
+        # First occurrence of the search phrase within each sample
+        hits = np.full(n_samples, -1, dtype=np.int64)
+        hit_positions = self._find_sequence(token_ids, offsets, search_ids)
+        if len(hit_positions):
+            hit_samples = np.searchsorted(offsets, hit_positions,
+                                          side='right') - 1
+            samples, first = np.unique(hit_samples, return_index=True)
+            hits[samples] = hit_positions[first]
+
+        found = hits >= 0
+        steps = np.arange(1, self._word_range + 1)
+        lead = hits[:, None] - steps[::-1][None, :]
+        follow = hits[:, None] + len(search_ids) - 1 + steps[None, :]
+        lead[~found[:, None] | (lead < starts[:, None])] = -1
+        follow[~found[:, None] | (follow >= ends[:, None])] = -1
+
+        return hits, lead, follow
+
+    def _count(self, positions, token_ids, masks):
+        n_classes = len(self._verb_classes)
+        if len(token_ids) == 0:
+            return np.zeros((len(positions), n_classes), dtype=np.int64)
+
+        window_masks = np.where(positions >= 0,
+                                masks[token_ids[np.maximum(positions, 0)]], 0)
+        bits = np.arange(n_classes)
+
+        return ((window_masks[:, :, None] >> bits) & 1).sum(axis=1)
+
+    def analyse(self, text_list: list) -> dict:
+        """Analyse a batch of sample texts
+
+        Args:
+            text_list (list): Sample texts
+
+        Returns:
+            dict: Columnar results with one row per sample:
+                'Leading counts' and 'Following counts' (int arrays of
+                shape (samples, verb classes) in the order of
+                get_verb_classes) and 'Unmatch' (bool array)
+        """
+        vocabulary = self._vocabulary
+        token_ids, offsets = vocabulary.encode_many(text_list)
+        masks = vocabulary.get_verb_masks()
+
+        search_ids = [vocabulary.find_id(word) for word in self._search_words]
+        hits, lead, follow = self._window_positions(token_ids, offsets,
+                                                    search_ids)
+
+        lead_counts = self._count(lead, token_ids, masks)
+        follow_counts = self._count(follow, token_ids, masks)
+
+        if self._pronoun_column is None:
+            unmatch = np.ones(len(text_list), dtype=bool)
+        else:
+            unmatch = (lead_counts[:, self._pronoun_column] == 0) & \
+                (follow_counts[:, self._pronoun_column] == 0)
+
+        self._batch = (lead, follow, token_ids, masks)
+
+        return {'Leading counts': lead_counts,
+                'Following counts': follow_counts,
+                'Unmatch': unmatch}
+
+    def get_verb_lists(self) -> tuple:
+        """Expand the last analysed batch into the verbs per class and
+           sample, as VerbClassifier.get_environment_verbs returns them
+
+        Returns:
+            tuple: Lists of leading and following verb dictionaries
+        """
+        if self._batch is None:
+            raise ValueError('No batch analysed yet!')
+
+        lead, follow, token_ids, masks = self._batch
+        mask_keys = VerbClassifier._compile()[3]
+        words = self._vocabulary.get_words()
+        normalize_word = VerbClassifier.TOKENIZER.get_word
+        ids = token_ids.tolist()
+
+        verb_lists = []
+        for positions in [lead, follow]:
+            window_masks = np.zeros(positions.shape, dtype=np.int64)
+            if len(token_ids):
+                window_masks = np.where(
+                    positions >= 0,
+                    masks[token_ids[np.maximum(positions, 0)]], 0)
+
+            sample_verbs = []
+            for row, row_masks in zip(positions.tolist(),
+                                      window_masks.tolist()):
+                verb_class = {key: [] for key in self._verb_classes}
+                for position, mask in zip(row, row_masks):
+                    # Only verbs are looked up
+                    if mask:
+                        word = normalize_word(words[ids[position]])
+                        for key in mask_keys[mask]:
+                            verb_class[key].append(word)
+                sample_verbs.append(verb_class)
+            verb_lists.append(sample_verbs)
+
+        return verb_lists[0], verb_lists[1]
+
+
+# Smallest sample list analysed in parallel, smaller ones are serial
+PARALLEL_MIN_SAMPLES = 20000
+# Chunks per worker, more chunks balance uneven workers better
+CHUNKS_PER_WORKER = 4
+
+# Analyser of a worker process, built once by _init_worker
+_worker_analyser = None
+
+
+def _init_worker(search_phrase: str):
+    global _worker_analyser
+    _worker_analyser = BatchAnalyser(search_phrase)
+
+
+def _analyse_chunk(text_list: list) -> tuple:
+    result = _worker_analyser.analyse(text_list)
+    lead, follow = _worker_analyser.get_verb_lists()
+
+    return result, lead, follow
+
+
+def get_number_workers(n_samples: int) -> int:
+    """Number of analysis processes for a sample list
+
+    Args:
+        n_samples (int): Length of the sample list
+
+    Returns:
+        int: Worker processes, 1 for a serial analysis
+    """
+    if n_samples < PARALLEL_MIN_SAMPLES:
+        return 1
+
+    if hasattr(os, 'sched_getaffinity'):
+        n_cpus = len(os.sched_getaffinity(0))
+    else:
+        n_cpus = os.cpu_count() or 1
+    n_workers = min(n_cpus, n_samples // (PARALLEL_MIN_SAMPLES // 2))
+
+    return max(n_workers, 1)
+
+
+def analyse_parallel(text_list: list, search_phrase: str,
+                     n_workers: int = None) -> tuple:
+    """Analyse sample texts in chunks on a process pool. Every worker
+       builds its BatchAnalyser once, results are merged in order.
+
+    Args:
+        text_list (list): Sample texts
+        search_phrase (str): Phrase the samples were searched with
+        n_workers (int, optional): Worker processes. Defaults to None
+            (chosen by get_number_workers, serial for small lists).
+
+    Returns:
+        tuple: Columnar result as of BatchAnalyser.analyse, lists of
+            leading and following verb dictionaries
+    """
+    if n_workers is None:
+        n_workers = get_number_workers(len(text_list))
+    if type(n_workers) is not int or n_workers < 1:
+        raise ValueError('Number of workers has to be a positive integer!')
+
+    if n_workers == 1 or not text_list:
+        analyser = BatchAnalyser(search_phrase)
+        result = analyser.analyse(text_list)
+        lead, follow = analyser.get_verb_lists()
+        return result, lead, follow
+
+    n_chunks = n_workers * CHUNKS_PER_WORKER
+    chunk_size = -(-len(text_list) // n_chunks)
+    chunks = [text_list[begin:begin + chunk_size]
+              for begin in range(0, len(text_list), chunk_size)]
+
+    with ProcessPoolExecutor(n_workers, initializer=_init_worker,
+                             initargs=(search_phrase,)) as executor:
+        chunk_results = list(executor.map(_analyse_chunk, chunks))
+
+    result = {key: np.concatenate([chunk[0][key] for chunk in chunk_results])
+              for key in chunk_results[0][0]}
+    lead, follow = [], []
+    for _, chunk_lead, chunk_follow in chunk_results:
+        lead.extend(chunk_lead)
+        follow.extend(chunk_follow)
+
+    return result, lead, follow
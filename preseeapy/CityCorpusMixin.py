@@ -8,8 +8,7 @@ class CityCorpusMixin():
         Args:
             name (str): Name of the city the corpus should be filtered on
         """
-        city_list = list(self._feature_dict['City'].keys())
-        if name in city_list:
+        if self._schema.is_valid('City', name):
             self._city = name
         elif name == "all":
             self._city = "all"
@@ -29,12 +28,7 @@ class CityCorpusMixin():
         """
 
         # Compare demanded sample with the available feature list
-        try:
-            feature_list = self._feature_dict["Country"][sample]
-        except KeyError:
-            raise KeyError('{} not available in Corpus'.format(sample))
-
-        return feature_list
+        return self._schema.get_country_cities(sample)
 
     def get_cities(self, country: str) -> list:
         """Return the cities available in the given country
@@ -75,18 +69,24 @@ class CityCorpusMixin():
         return number_cities
 
     def retrieve_city_info(self) -> int:
-        """Get general information about a city.
+        """Get general information about a city. The precomputed
+           sample index is used if it contains the city.
 
         Args:
             n_total (int): Total number of samples for a city
         """
-        city_list = list(self._feature_dict['City'].keys())
-        if self._city not in city_list:
+        if not self._schema.is_valid('City', self._city):
             Warning('City not available in Corpus.')
             return None
 
+        n_total = None
+        if self._sample_index is not None:
+            n_total = self._sample_index.get_count(self._city, self._gender,
+                                                   self._age, self._education)
+
         # Number of samples per city
-        n_total = self.get_number_city_samples()
+        if n_total is None:
+            n_total = self.get_number_city_samples()
 
         return n_total
 
@@ -115,14 +115,15 @@ class CityCorpusMixin():
         Returns:
             list: List of strings with the city names
         """
+        return self._schema.get_all_cities()
 
-        temporary_city_list = []
-        for country in self.get_corpus_countries():
-            temporary_city_list.append(self._feature_dict["Country"][country])
-
-        city_list = list(it.chain.from_iterable(temporary_city_list))
+    def get_corpus_countries(self) -> list:
+        """Return all the available countries in the Corpus
 
-        return city_list
+        Returns:
+            list: List of strings with the country names
+        """
+        return self._schema.get_countries()
 
     def __str__(self):
         return "city_{}".format(self._city)
@@ -0,0 +1,259 @@
+import argparse
+import hashlib
+import json
+import os
+import sqlite3
+import time
+import zlib
+from .utils import get_data_dir, freeze_filter
+from .ResultCache import SCHEMA_VERSION
+from .Sample import Sample, to_sample
+from .SampleCountIndex import ALL_SAMPLES_PHRASE
+from .QueryPlanner import filter_samples
+from .CorpusSchema import CorpusSchema
+
+
+class CorpusMirror():
+    """Local copy of the corpus. The samples of every city and phrase are
+       crawled once with all demographic filters set to "all" and stored
+       in a SQLite database, queries are answered locally by the sample
+       labels. A sync only crawls the phrases of new cities and of cities
+       whose sample labels changed.
+    """
+    def __init__(self, path: str = None):
+        """Open or create a corpus mirror.
+
+        Args:
+            path (str, optional): SQLite file. Defaults to
+                mirror.sqlite within utils.get_data_dir().
+        """
+        if path is None:
+            path = os.path.join(get_data_dir(), 'mirror.sqlite')
+        self._path = path
+
+        self._connection = sqlite3.connect(path)
+        self._connection.execute(
+            "CREATE TABLE IF NOT EXISTS cities ("
+            "city TEXT PRIMARY KEY, schema INTEGER, digest TEXT, "
+            "synced REAL)")
+        self._connection.execute(
+            "CREATE TABLE IF NOT EXISTS samples ("
+            "city TEXT, phrase TEXT, data BLOB, PRIMARY KEY (city, phrase))")
+        self._connection.commit()
+
+    def get_path(self) -> str:
+        return self._path
+
+    def get_cities(self) -> list:
+        """Get the mirrored cities of the current schema version
+
+        Returns:
+            list: City names
+        """
+        rows = self._connection.execute(
+            "SELECT city FROM cities WHERE schema = ? ORDER BY city",
+            (SCHEMA_VERSION,))
+
+        return [city for city, in rows]
+
+    def get_phrases(self, city: str) -> list:
+        rows = self._connection.execute(
+            "SELECT phrase FROM samples WHERE city = ? ORDER BY phrase",
+            (city,))
+
+        return [phrase for phrase, in rows]
+
+    def get_synced_time(self, city: str) -> float:
+        row = self._connection.execute(
+            "SELECT synced FROM cities WHERE city = ? AND schema = ?",
+            (city, SCHEMA_VERSION)).fetchone()
+
+        return None if row is None else row[0]
+
+    def _get_digest(self, city: str) -> str:
+        row = self._connection.execute(
+            "SELECT digest FROM cities WHERE city = ? AND schema = ?",
+            (city, SCHEMA_VERSION)).fetchone()
+
+        return None if row is None else row[0]
+
+    def make_digest(self, sample_list: list) -> str:
+        """Fingerprint of the samples of a city by their labels
+
+        Args:
+            sample_list (list): All samples of a city
+
+        Returns:
+            str: Hash of the sorted labels
+        """
+        labels = sorted(sample['label'] for sample in sample_list)
+
+        return hashlib.sha1("\n".join(labels).encode('utf-8')).hexdigest()
+
+    def get_samples(self, city: str, phrase: str) -> list:
+        """Get the mirrored samples of a city and phrase
+
+        Args:
+            city (str): City within the Corpus
+            phrase (str): Search phrase
+
+        Returns:
+            list: Samples or None if not mirrored
+        """
+        if self._get_digest(city) is None:
+            return None
+
+        row = self._connection.execute(
+            "SELECT data FROM samples WHERE city = ? AND phrase = ?",
+            (city, phrase)).fetchone()
+        if row is None:
+            return None
+
+        return json.loads(zlib.decompress(row[0]).decode('utf-8'),
+                          object_hook=to_sample)
+
+    def set_samples(self, city: str, phrase: str, sample_list: list):
+        data = zlib.compress(json.dumps(sample_list, ensure_ascii=False,
+                                        default=Sample.to_dict)
+                             .encode('utf-8'))
+        self._connection.execute(
+            "INSERT OR REPLACE INTO samples VALUES (?, ?, ?)",
+            (city, phrase, data))
+
+    def query(self, filter_dict: dict) -> list:
+        """Answer a filter from the mirror. The city "all" joins the
+           samples of every city of the corpus, which all have to be
+           mirrored for the phrase.
+
+        Args:
+            filter_dict (dict): Filter as returned by PRESEEA.get_filter
+
+        Raises:
+            KeyError: A city of the filter is not mirrored for the phrase
+
+        Returns:
+            list: Samples of the filter
+        """
+        cities = [filter_dict['city']]
+        if filter_dict['city'] == "all":
+            cities = sorted(CorpusSchema.shared().get_values('City'))
+
+        sample_list = []
+        for city in cities:
+            city_samples = self.get_samples(city, filter_dict['phrase'])
+            if city_samples is None:
+                raise KeyError('Filter is not mirrored: {}'.format(
+                    filter_dict))
+            sample_list.extend(city_samples)
+        if not cities:
+            raise KeyError('Filter is not mirrored: {}'.format(filter_dict))
+
+        return filter_samples(sample_list, filter_dict['gender'],
+                              filter_dict['age'], filter_dict['education'])
+
+    def sync(self, corpus, phrase_list: list, cities: list = None,
+             concurrency: int = 8) -> list:
+        """Bring the mirror up to date. The labels of all samples of
+           every city are crawled and compared with the mirrored ones.
+           Changed and new cities get all their phrases crawled again,
+           unchanged cities only the phrases not mirrored yet.
+
+        Args:
+            corpus (PRESEEA): Corpus instance to crawl with
+            phrase_list (list): Phrases to mirror
+            cities (list, optional): Cities to mirror.
+                Defaults to None (all cities of the corpus).
+            concurrency (int, optional): Maximum number of simultaneous
+                crawls. Defaults to 8.
+
+        Returns:
+            list: Cities whose samples were crawled
+        """
+        if cities is None:
+            cities = list(corpus._feature_dict['City'].keys())
+
+        def make_filter(city, phrase):
+            return {'phrase': phrase, 'city': city, 'gender': "all",
+                    'education': "all", 'age': "all"}
+
+        label_results = corpus.retrieve_many(
+            [make_filter(city, ALL_SAMPLES_PHRASE) for city in cities],
+            concurrency, True, False)
+
+        digests = {}
+        filter_list = []
+        for city in cities:
+            sample_list = label_results[freeze_filter(
+                make_filter(city, ALL_SAMPLES_PHRASE))]
+            if type(sample_list) is not list:
+                # City is kept as it is and synced again next time
+                continue
+
+            digests[city] = self.make_digest(sample_list)
+            phrases = list(phrase_list)
+            if digests[city] == self._get_digest(city):
+                mirrored = set(self.get_phrases(city))
+                phrases = [phrase for phrase in phrases
+                           if phrase not in mirrored]
+            else:
+                phrases = list(dict.fromkeys(self.get_phrases(city) +
+                                             phrases))
+            filter_list.extend(make_filter(city, phrase)
+                               for phrase in phrases)
+
+        results = {}
+        if filter_list:
+            results = corpus.retrieve_many(filter_list, concurrency,
+                                           True, False)
+
+        failed = set()
+        for filter_key, sample_list in results.items():
+            filter_dict = dict(filter_key)
+            if type(sample_list) is list:
+                self.set_samples(filter_dict['city'], filter_dict['phrase'],
+                                 sample_list)
+            else:
+                failed.add(filter_dict['city'])
+
+        now = time.time()
+        for city, digest in digests.items():
+            if city in failed:
+                digest = None
+            self._connection.execute(
+                "INSERT OR REPLACE INTO cities VALUES (?, ?, ?, ?)",
+                (city, SCHEMA_VERSION, digest, now))
+        self._connection.commit()
+
+        return list(dict.fromkeys(dict(filter_key)['city']
+                                  for filter_key in results))
+
+    def close(self):
+        self._connection.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description='Mirror PRESEEA phrase data locally.')
+    parser.add_argument('--sync', action='store_true',
+                        help='Crawl new or changed cities into the mirror')
+    parser.add_argument('--path', help='Mirror file')
+    parser.add_argument('--phrase', action='append', default=[],
+                        help='Phrase to mirror, repeatable')
+    parser.add_argument('--city', action='append',
+                        help='City to mirror, repeatable. Defaults to all.')
+    parser.add_argument('--concurrency', type=int, default=8)
+    args = parser.parse_args()
+
+    mirror = CorpusMirror(args.path)
+    if args.sync:
+        from .PRESEEA import PRESEEA
+        corpus = PRESEEA(author='CorpusMirror')
+        mirror.sync(corpus, args.phrase, args.city, args.concurrency)
+
+    for city in mirror.get_cities():
+        print("{}: {}".format(city, ", ".join(
+            repr(phrase) for phrase in mirror.get_phrases(city))))
+
+
+if __name__ == '__main__':
+    main()
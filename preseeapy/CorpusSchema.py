@@ -0,0 +1,113 @@
+import json
+import pkgutil
+
+# Prefixes of the filter checkboxes in the PRESEEA search form, the
+# feature values are numbered from 1 in the order of preseea.json,
+# 0 selects all of them
+FORM_KEY_PREFIXES = {'City': "dnn$ctr520$TranscriptionQuery$chkFtCity$",
+                     'Gender': "dnn$ctr520$TranscriptionQuery$chkFtSex$",
+                     'Age': "dnn$ctr520$TranscriptionQuery$chkFtAgeGroup$",
+                     'Education':
+                     "dnn$ctr520$TranscriptionQuery$chkFtStudyLevel$"}
+
+
+class CorpusSchema():
+    """Features of the PRESEEA corpus as defined by preseea.json. The
+       file is loaded once per process from the package resources, the
+       lookups needed for filtering and crawling are precomputed.
+    """
+    def __init__(self, feature_dict: dict):
+        """Precompute the lookups of a feature definition
+
+        Args:
+            feature_dict (dict): Content of preseea.json
+        """
+        self._feature_dict = feature_dict
+
+        self._country_cities = {country: list(city_list) for country, city_list
+                                in feature_dict['Country'].items()}
+        self._all_cities = [city for city_list in self._country_cities.values()
+                            for city in city_list]
+
+        # Valid values and form keys per filterable feature
+        self._values = {}
+        self._form_keys = {}
+        for feature, prefix in FORM_KEY_PREFIXES.items():
+            if feature == 'City':
+                numbers = feature_dict['City']
+            else:
+                numbers = {value: idx + 1 for idx, value
+                           in enumerate(feature_dict[feature])}
+            self._values[feature] = frozenset(numbers)
+
+            form_keys = {value: prefix + str(number)
+                         for value, number in numbers.items()}
+            form_keys['all'] = prefix + "0"
+            self._form_keys[feature] = form_keys
+
+    @classmethod
+    def shared(cls):
+        """Schema of the packaged preseea.json, loaded once per process
+           independent of the working directory
+
+        Returns:
+            CorpusSchema: Process-wide schema
+        """
+        if '_shared' not in cls.__dict__:
+            content = pkgutil.get_data('preseeapy', 'preseea.json')
+            cls._shared = cls(json.loads(content.decode('utf-8')))
+
+        return cls._shared
+
+    def get_feature_dict(self) -> dict:
+        return self._feature_dict
+
+    def get_countries(self) -> list:
+        return list(self._country_cities.keys())
+
+    def get_country_cities(self, country: str) -> list:
+        """Get the cities of a country
+
+        Args:
+            country (str): Country within the Corpus
+
+        Returns:
+            list: City names
+        """
+        try:
+            return list(self._country_cities[country])
+        except KeyError:
+            raise KeyError('{} not available in Corpus'.format(country))
+
+    def get_all_cities(self) -> list:
+        return list(self._all_cities)
+
+    def get_values(self, feature: str) -> frozenset:
+        return self._values[feature]
+
+    def is_valid(self, feature: str, value: str) -> bool:
+        """Check if a value is defined for a feature
+
+        Args:
+            feature (str): City, Gender, Age or Education
+            value (str): Feature value, e.g. Madrid
+
+        Returns:
+            bool: Value is defined, "all" is not
+        """
+        return value in self._values[feature]
+
+    def get_form_key(self, feature: str, value: str) -> str:
+        """Get the form key selecting a feature value on the webpage
+
+        Args:
+            feature (str): City, Gender, Age or Education
+            value (str): Feature value or "all"
+
+        Raises:
+            KeyError: Value is not defined for the feature
+
+        Returns:
+            str: Name of the form checkbox
+        """
+        return self._form_keys[feature][value]
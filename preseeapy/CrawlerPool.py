@@ -0,0 +1,231 @@
+import collections
+import itertools
+import queue
+from multiprocessing import Process, Queue
+import scrapy
+from .ASPXTwister import ASPXTwisterClass
+
+
+def _run_crawler_worker(job_queue: Queue, result_queue: Queue,
+                        spider: scrapy.Spider, settings: dict):
+    """Worker process loop. The twisted reactor and the CrawlerRunner are
+       started once and stay alive until a stop sentinel (None) is taken
+       from the job queue.
+
+    Args:
+        job_queue (multiprocessing.Queue): Tuples of (job id, filter dict)
+        result_queue (multiprocessing.Queue): Tuples of (job id, results)
+        spider (scrapy.Spider): Spider class to crawl with
+        settings (dict): Crawler settings overriding the default ones
+    """
+    from twisted.internet import reactor, threads
+    from scrapy.crawler import CrawlerRunner
+
+    runner = CrawlerRunner(ASPXTwisterClass({}, spider,
+                                            settings).get_settings())
+
+    def _put_result(content, job_id):
+        if hasattr(content, 'value'):
+            # Twisted failure, only the exception is sent to the parent
+            content = content.value
+        result_queue.put((job_id, content))
+
+    def _handle_job(job):
+        if job is None:
+            reactor.stop()
+            return None
+
+        job_id, parameters = job
+        twister = ASPXTwisterClass(parameters, spider, settings)
+        if not twister.check_parameters():
+            result_queue.put((job_id, None))
+            _next_job()
+            return None
+
+        deferred = twister.crawl(runner)
+        deferred.addBoth(_put_result, job_id)
+        deferred.addBoth(lambda _: _next_job())
+
+    def _next_job():
+        # Blocking queue access is kept off the reactor thread
+        deferred = threads.deferToThread(job_queue.get)
+        deferred.addCallback(_handle_job)
+
+    reactor.callWhenRunning(_next_job)
+    reactor.run()
+
+
+class CrawlerPool():
+    """A pool of long-lived crawler processes. Each worker keeps its
+       reactor and CrawlerRunner alive and takes filter dictionaries
+       from its own job queue, so process spawn and reactor start are
+       paid once per worker instead of once per query. Jobs are handed
+       to idle workers one at a time, so the job of a worker dying
+       mid-crawl is known and fails instead of being awaited forever.
+    """
+    # Seconds to wait for a result before the workers are checked
+    POLL_INTERVAL = 1.0
+
+    def __init__(self, spider: scrapy.Spider, n_workers: int = 2,
+                 settings: dict = None):
+        if type(n_workers) is not int or n_workers < 1:
+            raise ValueError('A crawler pool needs at least one worker!')
+
+        self._spider_bot = spider
+        self._settings = settings
+        self._result_queue = Queue()
+        self._job_ids = itertools.count()
+        self._finished_jobs = {}
+        # Jobs not handed to a worker yet and the job of every busy worker
+        self._pending_jobs = collections.deque()
+        self._running_jobs = {}
+        self._job_queues = [Queue() for _ in range(n_workers)]
+        self._workers = [self._start_worker(job_queue)
+                         for job_queue in self._job_queues]
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def _start_worker(self, job_queue: Queue) -> Process:
+        p = Process(target=_run_crawler_worker,
+                    args=(job_queue, self._result_queue,
+                          self._spider_bot, self._settings))
+        p.daemon = True
+        p.start()
+
+        return p
+
+    def get_number_workers(self) -> int:
+        return len(self._workers)
+
+    def is_alive(self) -> bool:
+        return any(worker.is_alive() for worker in self._workers)
+
+    def submit(self, parameters: dict) -> int:
+        """Put a filter dictionary onto the job queue.
+
+        Args:
+            parameters (dict): Filter dictionary for the spider
+
+        Returns:
+            int: Job id to collect the results with
+        """
+        if not self._workers:
+            raise RuntimeError('Crawler pool is already closed!')
+
+        job_id = next(self._job_ids)
+        self._pending_jobs.append((job_id, parameters))
+        self._dispatch()
+
+        return job_id
+
+    def _dispatch(self):
+        """Hand pending jobs to the idle living workers"""
+        for idx, worker in enumerate(self._workers):
+            if not self._pending_jobs:
+                break
+            if idx in self._running_jobs or not worker.is_alive():
+                continue
+            job_id, parameters = self._pending_jobs.popleft()
+            self._running_jobs[idx] = job_id
+            self._job_queues[idx].put((job_id, parameters))
+
+    def _finish_job(self, job_id: int, content):
+        self._finished_jobs[job_id] = content
+        for idx, running_id in list(self._running_jobs.items()):
+            if running_id == job_id:
+                del self._running_jobs[idx]
+        self._dispatch()
+
+    def _check_workers(self):
+        """Fail the jobs of dead workers, their pending jobs are handed
+           to the remaining ones
+        """
+        # Results sent right before a worker died are taken first
+        while True:
+            try:
+                self._finish_job(*self._result_queue.get_nowait())
+            except queue.Empty:
+                break
+
+        for idx, job_id in list(self._running_jobs.items()):
+            if not self._workers[idx].is_alive():
+                self._finish_job(job_id, RuntimeError(
+                    'Crawler worker {} died during the crawl!'.format(idx)))
+
+    def get_result(self, job_id: int):
+        """Block until the results of a submitted job are available.
+           Results of other jobs arriving meanwhile are kept back.
+
+        Args:
+            job_id (int): Id returned by submit
+
+        Raises:
+            RuntimeError: All workers died before the job was started
+
+        Returns:
+            list: Crawled results, None for incomplete filters, the
+                exception raised within the worker or a RuntimeError if
+                the worker died during the crawl
+        """
+        while job_id not in self._finished_jobs:
+            try:
+                finished_id, content = self._result_queue.get(
+                    timeout=self.POLL_INTERVAL)
+            except queue.Empty:
+                self._check_workers()
+                if job_id not in self._finished_jobs and \
+                        not self.is_alive():
+                    raise RuntimeError('All crawler workers have died!')
+                continue
+            self._finish_job(finished_id, content)
+
+        return self._finished_jobs.pop(job_id)
+
+    def retrieve(self, parameters: dict):
+        """Crawl a single filter dictionary on the pool.
+
+        Args:
+            parameters (dict): Filter dictionary for the spider
+
+        Returns:
+            list: Crawled results
+        """
+        return self.get_result(self.submit(parameters))
+
+    def map(self, parameter_list: list) -> list:
+        """Crawl several filter dictionaries, spread over all workers.
+
+        Args:
+            parameter_list (list): List of filter dictionaries
+
+        Returns:
+            list: Crawled results in the order of the given filters
+        """
+        job_ids = [self.submit(parameters) for parameters in parameter_list]
+
+        return [self.get_result(job_id) for job_id in job_ids]
+
+    def close(self, timeout: float = None):
+        """Shut down the pool gracefully. Every worker finishes its
+           running crawl before its reactor stops.
+
+        Args:
+            timeout (float, optional): Seconds to wait for each worker
+                before it is terminated. Defaults to None (wait).
+        """
+        for job_queue in self._job_queues:
+            job_queue.put(None)
+
+        for worker in self._workers:
+            worker.join(timeout)
+            if worker.is_alive():
+                worker.terminate()
+                worker.join()
+
+        self._workers = []
+        self._job_queues = []
+        self._running_jobs = {}
@@ -5,8 +5,7 @@ class EducationCorpusMixin():
         Args:
             name (str): Name of the education the corpus should be filtered on
         """
-        education_list = self._feature_dict['Education']
-        if name in education_list:
+        if self._schema.is_valid('Education', name):
             self._education = name
         elif name == "all":
             self._education = "all"
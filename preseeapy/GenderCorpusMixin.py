@@ -5,8 +5,7 @@ class GenderCorpusMixin():
         Args:
             name (str): Name of the gender the corpus should be filtered on
         """
-        gender_list = self._feature_dict['Gender']
-        if name in gender_list:
+        if self._schema.is_valid('Gender', name):
             self._gender = name
         elif name == "all":
             self._gender = "all"
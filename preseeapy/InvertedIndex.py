@@ -0,0 +1,203 @@
+from array import array
+from bisect import bisect_left, bisect_right
+from .Vocabulary import Vocabulary
+from .SampleLabel import parse_label
+from .CorpusSchema import CorpusSchema
+
+
+class InvertedIndex():
+    """Positional inverted index over local samples. Every word maps to
+       its postings, the samples and positions it occurs at. Postings
+       are two parallel integer arrays in ascending order, so the
+       positions of a word within a sample are found by binary search.
+       Phrases of one or several words are found without scanning
+       the sample texts. Every sample keeps the phrase it was crawled
+       for, lookups answer with the samples of their phrase only, since
+       a crawled text is just the context of its own phrase.
+    """
+    # Postings read per binary search of a candidate, the postings of a
+    # word are read completely if that is cheaper
+    SEARCH_COST = 16
+
+    def __init__(self):
+        self._vocabulary = Vocabulary()
+        # Indexed records with their city and parsed label
+        self._samples = []
+        self._labels = []
+        # Sample indices per indexed city and crawl phrase
+        self._phrase_samples = {}
+        # Per token id: sample index and position of every posting
+        self._posting_samples = []
+        self._posting_positions = []
+
+    def __len__(self):
+        return len(self._samples)
+
+    @classmethod
+    def from_mirror(cls, mirror, cities: list = None):
+        """Index all samples of a corpus mirror with their phrases
+
+        Args:
+            mirror (CorpusMirror): Local copy of the corpus
+            cities (list, optional): Cities to index.
+                Defaults to None (all mirrored cities).
+
+        Returns:
+            InvertedIndex: Index of the mirrored samples
+        """
+        index = cls()
+        for city in cities or mirror.get_cities():
+            for phrase in mirror.get_phrases(city):
+                index.add_samples(mirror.get_samples(city, phrase) or [],
+                                  city, phrase)
+
+        return index
+
+    def add_samples(self, sample_list: list, city: str, phrase: str):
+        """Add the crawled samples of a city and phrase to the index
+
+        Args:
+            sample_list (list): Records as returned by retrieve_phrase_data
+            city (str): City of the samples
+            phrase (str): Phrase the samples were crawled for
+        """
+        phrase_samples = self._phrase_samples.setdefault((city, phrase),
+                                                         array('I'))
+        vocabulary = self._vocabulary
+        posting_samples = self._posting_samples
+        posting_positions = self._posting_positions
+
+        for sample in sample_list:
+            sample_idx = len(self._samples)
+            phrase_samples.append(sample_idx)
+            self._samples.append(sample)
+            self._labels.append(parse_label(sample['label']))
+
+            token_ids = vocabulary.encode(sample['text'])
+            # Postings lists of words, which are new to the index
+            for _ in range(len(vocabulary) - len(posting_samples)):
+                posting_samples.append(array('I'))
+                posting_positions.append(array('I'))
+
+            for position, token_id in enumerate(token_ids):
+                posting_samples[token_id].append(sample_idx)
+                posting_positions[token_id].append(position)
+
+    def get_postings(self, word: str) -> list:
+        """Get the postings of a word
+
+        Args:
+            word (str): Single word
+
+        Returns:
+            list: Pairs of sample index and position in ascending order
+        """
+        token_id = self._vocabulary.find_id(word)
+        if token_id is None:
+            return []
+
+        return list(zip(self._posting_samples[token_id],
+                        self._posting_positions[token_id]))
+
+    def find(self, phrase: str) -> list:
+        """Find every occurrence of a phrase in all indexed texts,
+           several words are matched as a sequence
+
+        Args:
+            phrase (str): Word or words to search
+
+        Returns:
+            list: Pairs of sample index and position of the first word
+        """
+        words = self._vocabulary.get_tokenizer().tokenize(phrase)
+        token_ids = [self._vocabulary.find_id(word) for word in words]
+        if not token_ids or None in token_ids:
+            return []
+
+        # Only the postings of the rarest word are read completely, the
+        # other words are looked up at its candidate positions
+        offset = min(range(len(token_ids)), key=lambda idx: len(
+            self._posting_samples[token_ids[idx]]))
+        candidates = [(sample_idx, position - offset) for sample_idx, position
+                      in zip(self._posting_samples[token_ids[offset]],
+                             self._posting_positions[token_ids[offset]])
+                      if position >= offset]
+
+        for shift, token_id in enumerate(token_ids):
+            if shift == offset or not candidates:
+                continue
+            samples = self._posting_samples[token_id]
+            positions = self._posting_positions[token_id]
+            if len(candidates) * self.SEARCH_COST >= len(samples):
+                # Reading the whole postings is cheaper than searching
+                posting_set = set(zip(samples, positions))
+                candidates = [(sample_idx, position) for sample_idx, position
+                              in candidates
+                              if (sample_idx, position + shift) in posting_set]
+                continue
+
+            matches = []
+            for sample_idx, position in candidates:
+                start = bisect_left(samples, sample_idx)
+                end = bisect_right(samples, sample_idx, start)
+                idx = bisect_left(positions, position + shift, start, end)
+                if idx < end and positions[idx] == position + shift:
+                    matches.append((sample_idx, position))
+            candidates = matches
+
+        return candidates
+
+    def lookup(self, phrase: str, city: str = "all", gender: str = "all",
+               age: str = "all", education: str = "all") -> list:
+        """Get the samples crawled for a phrase, as retrieve_phrase_data
+           returns them
+
+        Args:
+            phrase (str): Word or words to search
+            city (str, optional): City filter. Defaults to "all".
+            gender (str, optional): Gender filter. Defaults to "all".
+            age (str, optional): Age filter. Defaults to "all".
+            education (str, optional): Education filter. Defaults to "all".
+
+        Raises:
+            KeyError: The phrase is not indexed for a city of the filter,
+                "all" needs every city of the corpus
+
+        Returns:
+            list: Records as returned by retrieve_phrase_data, in the
+                order they were indexed
+        """
+        cities = [city]
+        if city == "all":
+            cities = sorted(CorpusSchema.shared().get_values('City'))
+
+        sample_list = []
+        for city_name in cities:
+            phrase_samples = self._phrase_samples.get((city_name, phrase))
+            if phrase_samples is None:
+                raise KeyError('{!r} is not indexed for {}'.format(
+                    phrase, city_name))
+
+            for sample_idx in phrase_samples:
+                if not gender == age == education == "all":
+                    # Samples with unknown labels are only part of "all"
+                    label = self._labels[sample_idx]
+                    if label is None or not label.matches(gender, age,
+                                                          education):
+                        continue
+                sample_list.append(self._samples[sample_idx])
+
+        return sample_list
+
+    def query(self, filter_dict: dict) -> list:
+        """Answer a filter from the index
+
+        Args:
+            filter_dict (dict): Filter as returned by PRESEEA.get_filter
+
+        Returns:
+            list: Samples of the filter
+        """
+        return self.lookup(filter_dict['phrase'], filter_dict['city'],
+                           filter_dict['gender'], filter_dict['age'],
+                           filter_dict['education'])
@@ -1,16 +1,19 @@
-import json
 import csv
 import os
-from .utils import ProcessHandler
+import functools
+from .utils import ProcessHandler, freeze_filter
 from .CorpusDefinition import Corpus
 from .CityCorpusMixin import CityCorpusMixin
 from .AgeCorpusMixin import AgeCorpusMixin
 from .GenderCorpusMixin import GenderCorpusMixin
 from .EducationCorpusMixin import EducationCorpusMixin
 from .VerbClassifier import VerbClassifier
-from .ASPXTwister import ASPXTwisterClass
-from .preseeaspider.spiders.preseeabot import PreseeabotSpider
 from .Pronoun import Pronoun
+from .ResultCache import ResultCache
+from .SampleCountIndex import SampleCountIndex
+from .CorpusMirror import CorpusMirror
+from .QueryPlanner import QueryPlanner
+from .CorpusSchema import CorpusSchema
 
 
 class PRESEEA(Corpus, CityCorpusMixin, AgeCorpusMixin,
@@ -22,18 +25,34 @@ class PRESEEA(Corpus, CityCorpusMixin, AgeCorpusMixin,
         Corpus (class): General Corpus description
     """
 
-    def __init__(self, author: str, search_phrase=""):
+    def __init__(self, author: str, search_phrase="", n_workers=0,
+                 result_cache: ResultCache = None,
+                 sample_index: SampleCountIndex = None,
+                 crawler_settings: dict = None,
+                 corpus_mirror: CorpusMirror = None):
         """Generate a PRESEEA corpus instance.
 
         Args:
             search_phrase (str, optional): Phrase to search
                 within corpus database. Defaults to "".
+            n_workers (int, optional): Number of persistent crawler
+                processes. Defaults to 0 (one new process per query).
+            result_cache (ResultCache, optional): Persistent cache for
+                crawled phrase data. Defaults to None (always crawl).
+            sample_index (SampleCountIndex, optional): Precomputed number
+                of samples per city. Defaults to None (crawl the totals).
+            crawler_settings (dict, optional): Scrapy settings overriding
+                the crawler defaults, e.g. middlewares.archive_settings.
+                Defaults to None.
+            corpus_mirror (CorpusMirror, optional): Local copy of the
+                corpus for retrieve_phrase_data(source="local").
+                Defaults to None (mirror.sqlite within the data directory).
         """
         super().__init__('PRESEEA', author, search_phrase)
 
-        # Open PRESEEA configuration file to load available features
-        with open('preseeapy/preseea.json', 'r') as file:
-            self._feature_dict = json.load(file)
+        # Available features of the PRESEEA configuration file
+        self._schema = CorpusSchema.shared()
+        self._feature_dict = self._schema.get_feature_dict()
 
         # PRESEEA specifc filter values
         self.set_city("")
@@ -41,6 +60,14 @@ class PRESEEA(Corpus, CityCorpusMixin, AgeCorpusMixin,
         self.set_age("")
         self.set_education("")
 
+        self._result_cache = result_cache
+        self._sample_index = sample_index
+        self._crawler_settings = crawler_settings
+        self._corpus_mirror = corpus_mirror
+        self._crawler_pool = None
+        if n_workers > 0:
+            self.start_pool(n_workers)
+
     def __str__(self):
         return "PRESEEA" + "_"\
             + CityCorpusMixin.__str__(self) + "_"\
@@ -67,18 +94,172 @@ class PRESEEA(Corpus, CityCorpusMixin, AgeCorpusMixin,
 
         return filter_dict
 
-    def retrieve_phrase_data(self) -> list:
-        """Retrieve phrase data with a separate process.
+    def start_pool(self, n_workers: int = 2):
+        """Crawl on a pool of long-lived worker processes instead of
+           starting a new process for every query.
+
+        Args:
+            n_workers (int, optional): Pool size. Defaults to 2.
+        """
+        # Scrapy and twisted are imported when a crawl is set up
+        from .CrawlerPool import CrawlerPool
+        from .preseeaspider.spiders.preseeabot import PreseeabotSpider
+
+        self.close_pool()
+        self._crawler_pool = CrawlerPool(spider=PreseeabotSpider,
+                                         n_workers=n_workers,
+                                         settings=self._crawler_settings)
+
+    def close_pool(self, timeout: float = None):
+        """Shut down the crawler pool after its running crawls finished.
+
+        Args:
+            timeout (float, optional): Seconds to wait for each worker.
+                Defaults to None (wait).
+        """
+        if self._crawler_pool is not None:
+            self._crawler_pool.close(timeout)
+            self._crawler_pool = None
+
+    def set_result_cache(self, result_cache: ResultCache):
+        self._result_cache = result_cache
+
+    def get_result_cache(self) -> ResultCache:
+        return self._result_cache
+
+    def set_sample_index(self, sample_index: SampleCountIndex):
+        self._sample_index = sample_index
+
+    def get_sample_index(self) -> SampleCountIndex:
+        return self._sample_index
+
+    def rebuild_sample_index(self, cities: list = None, concurrency: int = 8):
+        """Crawl and save the number of samples per city and demographic
+           cell for the instances' sample index
+
+        Args:
+            cities (list, optional): Cities to index.
+                Defaults to None (all cities of the corpus).
+            concurrency (int, optional): Maximum number of simultaneous
+                crawls. Defaults to 8.
+        """
+        if self._sample_index is None:
+            self._sample_index = SampleCountIndex()
+
+        self._sample_index.rebuild(self, cities, concurrency)
+
+    def set_corpus_mirror(self, corpus_mirror: CorpusMirror):
+        self._corpus_mirror = corpus_mirror
+
+    def get_corpus_mirror(self) -> CorpusMirror:
+        if self._corpus_mirror is None:
+            self._corpus_mirror = CorpusMirror()
+
+        return self._corpus_mirror
+
+    def sync_mirror(self, phrase_list: list, cities: list = None,
+                    concurrency: int = 8) -> list:
+        """Crawl the phrases of new or changed cities into the
+           instances' corpus mirror, see CorpusMirror.sync
+
+        Args:
+            phrase_list (list): Phrases to mirror
+            cities (list, optional): Cities to mirror.
+                Defaults to None (all cities of the corpus).
+            concurrency (int, optional): Maximum number of simultaneous
+                crawls. Defaults to 8.
+
+        Returns:
+            list: Cities whose samples were crawled
+        """
+        return self.get_corpus_mirror().sync(self, phrase_list, cities,
+                                             concurrency)
+
+    def _get_cached_data(self, filter_dict: dict, refresh: bool,
+                         cache_only: bool) -> list:
+        """Look up crawled phrase data in the result cache
+
+        Args:
+            filter_dict (dict): Filter of the query
+            refresh (bool): Ignore the cached data
+            cache_only (bool): Raise instead of crawling on a miss
+
+        Returns:
+            list: Cached phrase data or None if it has to be crawled
+        """
+        phrase_list = None
+        if self._result_cache is not None and not refresh:
+            phrase_list = self._result_cache.get(filter_dict)
+
+        if phrase_list is None and cache_only:
+            raise KeyError('No cached results for filter: \
+                            {}'.format(filter_dict))
+
+        return phrase_list
+
+    def _set_cached_data(self, filter_dict: dict, phrase_list: list):
+        # Incomplete filters and failed crawls are not cached
+        if self._result_cache is not None and type(phrase_list) is list:
+            self._result_cache.set(filter_dict, phrase_list)
+
+    def retrieve_phrase_data(self, refresh: bool = False,
+                             cache_only: bool = False,
+                             source: str = "remote") -> list:
+        """Retrieve phrase data from the result cache or with a separate
+           process or, if started, with the crawler pool.
+
+        Args:
+            refresh (bool, optional): Crawl even if the data is cached.
+                Defaults to False.
+            cache_only (bool, optional): Never crawl, raise a KeyError
+                if the data is not cached. Defaults to False.
+            source (str, optional): "remote" to crawl the webpage or
+                "local" to answer from the corpus mirror, which raises a
+                KeyError if the city and phrase are not mirrored.
+                Defaults to "remote".
 
         Returns:
             list: List of dictionaries with phrases
                 and PRESEEA metadata
                 meta: date, sample number, country
         """
-        # Initialize a subprocess instance
+        if source not in ["remote", "local"]:
+            raise ValueError('Unknown source: {}'.format(source))
+
         filter_dict = self.get_filter()
-        twister = ASPXTwisterClass(parameters=filter_dict,
-                                   spider=PreseeabotSpider)
+        if source == "local":
+            return self.get_corpus_mirror().query(filter_dict)
+
+        phrase_list = self._get_cached_data(filter_dict, refresh, cache_only)
+        if phrase_list is None:
+            phrase_list = self._crawl_phrase_data(filter_dict)
+            self._set_cached_data(filter_dict, phrase_list)
+
+        return phrase_list
+
+    def _create_twister(self, filter_dict: dict):
+        """Set up a crawl. Scrapy and twisted are only imported here,
+           so analyses and cached queries start without them.
+
+        Args:
+            filter_dict (dict): Filter of the crawl
+
+        Returns:
+            ASPXTwisterClass: Crawler of the PRESEEA spider
+        """
+        from .ASPXTwister import ASPXTwisterClass
+        from .preseeaspider.spiders.preseeabot import PreseeabotSpider
+
+        return ASPXTwisterClass(parameters=filter_dict,
+                                spider=PreseeabotSpider,
+                                settings=self._crawler_settings)
+
+    def _crawl_phrase_data(self, filter_dict: dict) -> list:
+        if self._crawler_pool is not None:
+            return self._crawler_pool.retrieve(filter_dict)
+
+        # Initialize a subprocess instance
+        twister = self._create_twister(filter_dict)
         attach_function = twister._retrieve_phrase_data_subprocess
         process_instance = ProcessHandler(attach_function)
 
@@ -88,6 +269,132 @@ class PRESEEA(Corpus, CityCorpusMixin, AgeCorpusMixin,
 
         return phrase_list
 
+    def iter_phrase_data(self, chunk_size: int = 50, queue_size: int = 4):
+        """Retrieve phrase data as a stream. Samples are yielded as soon
+           as their chunk was crawled, so the analysis can start while
+           later pages are still downloading. At most queue_size chunks
+           are held between both processes.
+
+        Args:
+            chunk_size (int, optional): Samples sent at once.
+                Defaults to 50.
+            queue_size (int, optional): Chunks buffered ahead of the
+                caller. Defaults to 4.
+
+        Yields:
+            dict: Phrase with PRESEEA metadata
+                meta: date, sample number, country
+        """
+        if type(chunk_size) is not int or chunk_size < 1:
+            raise ValueError('Chunk size has to be a positive integer!')
+
+        from .ASPXTwister import END_OF_STREAM
+
+        twister = self._create_twister(self.get_filter())
+        attach_function = functools.partial(
+            twister._stream_phrase_data_subprocess, chunk_size)
+        process_instance = ProcessHandler(attach_function, queue_size)
+
+        finished = False
+        try:
+            for chunk in process_instance.iter_queue_content(END_OF_STREAM):
+                if isinstance(chunk, Exception):
+                    raise chunk
+                yield from chunk
+            finished = True
+        finally:
+            if finished:
+                process_instance.close()
+            else:
+                # Caller stopped early, the crawl is not needed anymore
+                process_instance.terminate()
+
+    def retrieve_many(self, filters: list, concurrency: int = 8,
+                      refresh: bool = False, cache_only: bool = False) -> dict:
+        """Retrieve phrase data for several filter dictionaries at once.
+           All crawls share one reactor run, so their requests are
+           downloaded in parallel instead of one query after another.
+           Filters are built with set_filter and get_filter.
+
+        Args:
+            filters (list): List of filter dictionaries
+            concurrency (int, optional): Maximum number of simultaneous
+                crawls. Defaults to 8.
+            refresh (bool, optional): Crawl even if the data is cached.
+                Defaults to False.
+            cache_only (bool, optional): Never crawl, raise a KeyError
+                if any data is not cached. Defaults to False.
+
+        Returns:
+            dict: Results per filter, keyed by utils.freeze_filter
+        """
+        # Every distinct filter is looked up or crawled once
+        filter_keys = list(dict.fromkeys(freeze_filter(filter_dict)
+                                         for filter_dict in filters))
+        results = {}
+        for key in filter_keys:
+            phrase_list = self._get_cached_data(dict(key), refresh, cache_only)
+            if phrase_list is not None:
+                results[key] = phrase_list
+
+        missing_keys = [key for key in filter_keys if key not in results]
+        if missing_keys:
+            crawled = self._crawl_many([dict(key) for key in missing_keys],
+                                       concurrency)
+            for key, phrase_list in zip(missing_keys, crawled):
+                self._set_cached_data(dict(key), phrase_list)
+                results[key] = phrase_list
+
+        return {key: results[key] for key in filter_keys}
+
+    def retrieve_breakdown(self, concurrency: int = 8,
+                           refresh: bool = False,
+                           cache_only: bool = False) -> dict:
+        """Retrieve the phrase data of the instances' city and phrase for
+           every combination of gender, age and education. A single crawl
+           with "all" is split locally by the sample labels.
+
+        Args:
+            concurrency (int, optional): Maximum number of simultaneous
+                crawls. Defaults to 8.
+            refresh (bool, optional): Crawl even if the data is cached.
+                Defaults to False.
+            cache_only (bool, optional): Never crawl, raise a KeyError
+                if the data is not cached. Defaults to False.
+
+        Returns:
+            dict: Results per filter, keyed by utils.freeze_filter
+        """
+        filters = []
+        for gender in self._feature_dict['Gender']:
+            for age in self._feature_dict['Age']:
+                for education in self._feature_dict['Education']:
+                    filter_dict = self.get_filter()
+                    filter_dict['gender'] = gender
+                    filter_dict['education'] = education
+                    filter_dict['age'] = age
+                    filters.append(filter_dict)
+
+        return QueryPlanner(self).retrieve(filters, concurrency,
+                                           refresh, cache_only)
+
+    def _crawl_many(self, filter_list: list, concurrency: int) -> list:
+        if self._crawler_pool is not None:
+            results = self._crawler_pool.map(filter_list)
+        else:
+            twister = self._create_twister({})
+            attach_function = functools.partial(
+                twister._retrieve_many_subprocess, filter_list, concurrency)
+            process_instance = ProcessHandler(attach_function)
+
+            results = process_instance.get_queue_content()
+            process_instance.close()
+
+            if not isinstance(results, list):
+                raise results
+
+        return results
+
     def get_number_samples(self) -> int:
         """Get number of samples for a specific phrase.
 
@@ -216,16 +523,23 @@ class PRESEEA(Corpus, CityCorpusMixin, AgeCorpusMixin,
                              analysis_data['Unmatch'][idx]])
         return writer
 
-    def analyse_verbs(self, samples_list: list) -> dict:
+    def analyse_verbs(self, samples_list: list,
+                      parallel: bool = False) -> dict:
         """Analyse the given data according to basic statistical measures.
            Summation of general information, which means the total amount of
-           samples, regarding a city from corpus.
+           samples, regarding a city from corpus. All samples are analysed
+           as one batch, see BatchAnalyser.
 
         Args:
             samples_list (list): List of dictionaries with corpus data
+            parallel (bool, optional): Analyse large sample lists on a
+                process pool, the number of workers is chosen
+                automatically. Defaults to False.
 
         Returns:
-            data (list): Retrieved data from PRESEEA
+            data (list): Retrieved data from PRESEEA. 'Leading counts' and
+                'Following counts' hold the verbs per sample and class
+                (in the order of 'Verb classes') as NumPy arrays.
         """
         # Get total amount of samples for that city
         n_samples_city = self.retrieve_city_info()
@@ -238,25 +552,86 @@ class PRESEEA(Corpus, CityCorpusMixin, AgeCorpusMixin,
         if type(samples_list) is not list:
             Warning("No samples list introduced! City might not be available.")
         else:
-            classfier = VerbClassifier("")
-            pronoun = Pronoun()
-            for idx, sample in enumerate(samples_list):
-                classfier.set_phrase(sample['text'])
-                lead, follow = classfier.get_environment_verbs(self._search_phrase)
-                data['Leading verbs'][idx] = lead
-                data['Following verbs'][idx] = follow
-
-                # Get key for search phrase
-                pp_key = pronoun.get_pronoun_key(self._search_phrase)
-
-                # Check if given pronombre has no entry -> Unmatch
-                if pp_key is None or (not lead[pp_key] and not follow[pp_key]):
-                    data['Unmatch'][idx] = 'x'
-                else:
-                    data['Unmatch'][idx] = ''
+            # NumPy is imported with the first analysis
+            from .BatchAnalyser import analyse_parallel
+
+            result, data['Leading verbs'], data['Following verbs'] = \
+                analyse_parallel([sample['text'] for sample in samples_list],
+                                 self._search_phrase,
+                                 None if parallel else 1)
+
+            # Given pronombre has no entry -> Unmatch
+            data['Unmatch'] = ['x' if unmatch else ''
+                               for unmatch in result['Unmatch'].tolist()]
+            data['Verb classes'] = list(VerbClassifier.VERB_CLASSES.keys())
+            data['Leading counts'] = result['Leading counts']
+            data['Following counts'] = result['Following counts']
 
         return data
 
+    def retrieve_pronoun_data(self, phrase_list: list = None,
+                              concurrency: int = 8, refresh: bool = False,
+                              cache_only: bool = False) -> list:
+        """Retrieve the samples of several phrases with the instances'
+           filters in one batch, see retrieve_many. Samples found for
+           more than one phrase are kept once.
+
+        Args:
+            phrase_list (list, optional): Search phrases. Defaults to
+                None (all pronouns of Pronoun).
+            concurrency (int, optional): Maximum number of simultaneous
+                crawls. Defaults to 8.
+            refresh (bool, optional): Crawl even if the data is cached.
+                Defaults to False.
+            cache_only (bool, optional): Never crawl, raise a KeyError
+                if any data is not cached. Defaults to False.
+
+        Returns:
+            list: Samples of all phrases
+        """
+        if phrase_list is None:
+            phrase_list = ["{} ".format(pronoun) for pronoun_list
+                           in Pronoun().get_pronouns().values()
+                           for pronoun in pronoun_list]
+
+        filters = []
+        for phrase in phrase_list:
+            filter_dict = self.get_filter()
+            filter_dict['phrase'] = phrase
+            filters.append(filter_dict)
+
+        samples = {}
+        results = self.retrieve_many(filters, concurrency, refresh, cache_only)
+        for sample_list in results.values():
+            if type(sample_list) is not list:
+                continue
+            for sample in sample_list:
+                samples.setdefault((sample['label'], sample['text']), sample)
+
+        return list(samples.values())
+
+    def analyse_pronouns(self, samples_list: list, phrase_list: list = None,
+                         first_only: bool = True) -> dict:
+        """Analyse the verb environment of several phrases in one pass
+           over the samples, see PronounAnalyser
+
+        Args:
+            samples_list (list): List of dictionaries with corpus data
+            phrase_list (list, optional): Search phrases. Defaults to
+                None (all pronouns of Pronoun).
+            first_only (bool, optional): Only analyse the first occurrence
+                of a phrase per sample. Defaults to True.
+
+        Returns:
+            dict: Statistics per phrase, verb counts in the order of
+                VerbClassifier.VERB_CLASSES
+        """
+        from .PronounAnalyser import PronounAnalyser
+
+        analyser = PronounAnalyser(phrase_list, first_only=first_only)
+
+        return analyser.analyse([sample['text'] for sample in samples_list])
+
     def create_report(self, city: str, phrase: str):
         """Create a .csv file as a report for the phrases and their
            corresponding analysis based on the PRESEEA corpus data for
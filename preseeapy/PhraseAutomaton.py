@@ -0,0 +1,104 @@
+from collections import deque
+
+
+class PhraseAutomaton():
+    """Aho-Corasick automaton over words. Finds every occurrence of many
+       phrases, each a sequence of words, within one scan of a word list.
+    """
+    def __init__(self, phrase_list: list = None):
+        """Build an automaton
+
+        Args:
+            phrase_list (list, optional): Phrases as lists of words.
+                Defaults to None (add them with add_phrase).
+        """
+        # Per state: transitions by word, failure state, phrases ending
+        self._goto = [{}]
+        self._failure = [0]
+        self._output = [[]]
+        self._phrases = []
+        self._built = True
+
+        for phrase in phrase_list or []:
+            self.add_phrase(phrase)
+
+    def add_phrase(self, phrase: list) -> int:
+        """Add a phrase to search for
+
+        Args:
+            phrase (list): Sequence of words
+
+        Returns:
+            int: Index of the phrase within get_phrases
+        """
+        if not phrase:
+            raise ValueError('A phrase needs at least one word!')
+
+        state = 0
+        for word in phrase:
+            if word not in self._goto[state]:
+                self._goto.append({})
+                self._failure.append(0)
+                self._output.append([])
+                self._goto[state][word] = len(self._goto) - 1
+            state = self._goto[state][word]
+
+        phrase_idx = len(self._phrases)
+        self._phrases.append(list(phrase))
+        self._output[state].append(phrase_idx)
+        self._built = False
+
+        return phrase_idx
+
+    def get_phrases(self) -> list:
+        return self._phrases
+
+    def _build(self):
+        """Compute the failure states breadth first and merge the
+           outputs of each failure chain
+        """
+        queue = deque()
+        for state in self._goto[0].values():
+            self._failure[state] = 0
+            queue.append(state)
+
+        while queue:
+            state = queue.popleft()
+            for word, next_state in self._goto[state].items():
+                queue.append(next_state)
+
+                failure = self._failure[state]
+                while failure and word not in self._goto[failure]:
+                    failure = self._failure[failure]
+                failure = self._goto[failure].get(word, 0)
+
+                self._failure[next_state] = failure
+                self._output[next_state] = self._output[next_state] \
+                    + self._output[failure]
+
+        self._built = True
+
+    def iter_matches(self, word_list: list):
+        """Yield every occurrence of every phrase within a word list
+
+        Args:
+            word_list (list): Words to search in
+
+        Yields:
+            tuple: Start index, end index (exclusive) and phrase index,
+                ordered by end index
+        """
+        if not self._built:
+            self._build()
+
+        goto, failure, output = self._goto, self._failure, self._output
+        phrases = self._phrases
+
+        state = 0
+        for idx, word in enumerate(word_list):
+            while state and word not in goto[state]:
+                state = failure[state]
+            state = goto[state].get(word, 0)
+
+            for phrase_idx in output[state]:
+                yield idx + 1 - len(phrases[phrase_idx]), idx + 1, phrase_idx
@@ -10,6 +10,14 @@ class Pronoun():
                 "3ps_pl": ['ellos', 'ellas', 'ustedes'],
             }
 
+    def get_pronouns(self) -> dict:
+        """Get the pronouns of every person and number
+
+        Returns:
+            dict: Lists of pronouns by verb class key
+        """
+        return {key: list(pronouns) for key, pronouns in self._pronoun.items()}
+
     def get_pronoun_key(self, phrase: str) -> str:
         """Get respondign key for a pronoun if phrase is a pronoun
 
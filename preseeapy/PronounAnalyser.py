@@ -0,0 +1,133 @@
+import numpy as np
+from .WordClassifier import WordClassifier
+from .VerbClassifier import VerbClassifier
+from .PhraseAutomaton import PhraseAutomaton
+from .Pronoun import Pronoun
+from .Vocabulary import Vocabulary
+
+
+class PronounAnalyser():
+    """Analyse the verb environment of many pronouns at once. One scan
+       with a PhraseAutomaton finds the occurrences of all pronouns in a
+       sample, so N pronouns cost one pass over the samples instead of N.
+       Samples and phrases are matched as token ids of a Vocabulary.
+    """
+    def __init__(self, phrase_list: list = None, word_range: int = None,
+                 first_only: bool = True, vocabulary: Vocabulary = None):
+        """Prepare the analysis of several search phrases
+
+        Args:
+            phrase_list (list, optional): Search phrases, several words
+                are matched as a sequence. Defaults to None (all pronouns
+                of Pronoun).
+            word_range (int, optional): Number of words around an
+                occurrence. Defaults to None (WordClassifier.WORD_RANGE).
+            first_only (bool, optional): Only analyse the first occurrence
+                of a phrase per sample, like analyse_verbs does.
+                Defaults to True.
+            vocabulary (Vocabulary, optional): Lexicon encoding the texts.
+                Defaults to None (Vocabulary.shared).
+        """
+        word_classifier = WordClassifier("")
+        self._vocabulary = vocabulary or Vocabulary.shared()
+        self._word_range = word_classifier._check_word_range(word_range)
+        self._first_only = first_only
+        self._verb_classes = list(VerbClassifier.VERB_CLASSES.keys())
+
+        pronouns = Pronoun().get_pronouns()
+        if phrase_list is None:
+            phrase_list = [pronoun for pronoun_list in pronouns.values()
+                           for pronoun in pronoun_list]
+        self._phrase_list = list(dict.fromkeys(phrase_list))
+
+        # Column of the verb class agreeing with each phrase
+        pronoun_columns = {pronoun: self._verb_classes.index(key)
+                           for key, pronoun_list in pronouns.items()
+                           for pronoun in pronoun_list}
+        self._automaton = PhraseAutomaton()
+        self._pronoun_columns = []
+        for phrase in self._phrase_list:
+            words = word_classifier.set_word_list(phrase)
+            self._automaton.add_phrase(
+                [self._vocabulary.get_id(word) for word in words])
+            self._pronoun_columns.append(
+                pronoun_columns.get(" ".join(words)))
+
+    def get_phrases(self) -> list:
+        return self._phrase_list
+
+    def get_verb_classes(self) -> list:
+        return self._verb_classes
+
+    def analyse(self, text_list: list) -> dict:
+        """Analyse a batch of sample texts for all phrases
+
+        Args:
+            text_list (list): Sample texts
+
+        Returns:
+            dict: Statistics per phrase: 'Occurrences', 'Samples'
+                (samples containing the phrase), 'Leading counts' and
+                'Following counts' (verbs per class in the order of
+                get_verb_classes) and 'Unmatch' (occurrences without a
+                verb agreeing with the pronoun)
+        """
+        n_phrases = len(self._phrase_list)
+        n_classes = len(self._verb_classes)
+        occurrences = [0]*n_phrases
+        samples = [0]*n_phrases
+        lead_counts = [[0]*n_classes for _ in range(n_phrases)]
+        follow_counts = [[0]*n_classes for _ in range(n_phrases)]
+        unmatch = [0]*n_phrases
+
+        vocabulary = self._vocabulary
+        token_ids, offsets = vocabulary.encode_many(text_list)
+        # Verb class mask per token id and verb class columns per mask
+        verb_masks = vocabulary.get_verb_masks().tolist()
+        mask_columns = [[column for column in range(n_classes)
+                         if mask >> column & 1]
+                        for mask in range(1 << n_classes)]
+
+        def count_verbs(window_ids, counts) -> int:
+            """Add the verbs of a window to the counts of a phrase"""
+            window_mask = 0
+            for token_id in window_ids:
+                mask = verb_masks[token_id]
+                if mask:
+                    for column in mask_columns[mask]:
+                        counts[column] += 1
+                    window_mask |= mask
+            return window_mask
+
+        word_range = self._word_range
+        token_ids = token_ids.tolist()
+        offsets = offsets.tolist()
+        for sample_start, sample_end in zip(offsets[:-1], offsets[1:]):
+            sample_ids = token_ids[sample_start:sample_end]
+            seen = set()
+            for start, end, phrase_idx in self._automaton.iter_matches(
+                    sample_ids):
+                if phrase_idx in seen:
+                    if self._first_only:
+                        continue
+                else:
+                    samples[phrase_idx] += 1
+                    seen.add(phrase_idx)
+                occurrences[phrase_idx] += 1
+
+                window_mask = count_verbs(
+                    sample_ids[max(start - word_range, 0):start],
+                    lead_counts[phrase_idx])
+                window_mask |= count_verbs(sample_ids[end:end + word_range],
+                                           follow_counts[phrase_idx])
+
+                column = self._pronoun_columns[phrase_idx]
+                if column is None or not window_mask >> column & 1:
+                    unmatch[phrase_idx] += 1
+
+        return {phrase: {'Occurrences': occurrences[idx],
+                         'Samples': samples[idx],
+                         'Leading counts': np.array(lead_counts[idx]),
+                         'Following counts': np.array(follow_counts[idx]),
+                         'Unmatch': unmatch[idx]}
+                for idx, phrase in enumerate(self._phrase_list)}
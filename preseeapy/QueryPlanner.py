@@ -0,0 +1,128 @@
+from .utils import freeze_filter
+from .SampleLabel import parse_label
+
+# Filters which can be applied to crawled samples by their label
+DEMOGRAPHIC_FILTERS = ['gender', 'age', 'education']
+
+
+def filter_samples(sample_list: list, gender: str = "all", age: str = "all",
+                   education: str = "all", label_list: list = None) -> list:
+    """Select the samples of a demographic filter by their labels.
+       Samples with unknown labels are only part of the "all" filter.
+
+    Args:
+        sample_list (list): Crawled samples with label
+        gender (str, optional): Gender filter. Defaults to "all".
+        age (str, optional): Age filter. Defaults to "all".
+        education (str, optional): Education filter. Defaults to "all".
+        label_list (list, optional): Parsed labels of the samples, to
+            reuse them for several filters. Defaults to None.
+
+    Returns:
+        list: Samples within the filter
+    """
+    if gender == age == education == "all":
+        return list(sample_list)
+
+    if label_list is None:
+        label_list = [parse_label(sample['label']) for sample in sample_list]
+
+    return [sample for sample, label in zip(sample_list, label_list)
+            if label is not None and label.matches(gender, age, education)]
+
+
+class QueryPlanner():
+    """Answer queries of a corpus with as few crawls as possible. Filters
+       differing only in gender, age or education share one crawl with
+       "all", their samples are selected locally by the sample labels.
+    """
+    def __init__(self, corpus):
+        """Plan the queries of a corpus
+
+        Args:
+            corpus (PRESEEA): Corpus instance to crawl with
+        """
+        self._corpus = corpus
+
+    def get_base_filter(self, filter_dict: dict) -> dict:
+        """Filter crawled to answer a filter dictionary
+
+        Args:
+            filter_dict (dict): Filter as returned by PRESEEA.get_filter
+
+        Returns:
+            dict: Filter with "all" for every demographic filter
+        """
+        base_filter = dict(filter_dict)
+        for name in DEMOGRAPHIC_FILTERS:
+            base_filter[name] = "all"
+
+        return base_filter
+
+    def plan(self, filters: list) -> dict:
+        """Assign the filters to the crawls answering them
+
+        Args:
+            filters (list): List of filter dictionaries
+
+        Returns:
+            dict: Filters keyed by utils.freeze_filter per crawled
+                filter key. Incomplete filters are left out.
+        """
+        crawls = {}
+        for filter_dict in filters:
+            if "" in filter_dict.values():
+                continue
+            base_key = freeze_filter(self.get_base_filter(filter_dict))
+            crawls.setdefault(base_key, {})[freeze_filter(filter_dict)] = \
+                filter_dict
+
+        return crawls
+
+    def retrieve(self, filters: list, concurrency: int = 8,
+                 refresh: bool = False, cache_only: bool = False) -> dict:
+        """Retrieve phrase data for several filter dictionaries with one
+           crawl per city and phrase. Same interface as
+           PRESEEA.retrieve_many.
+
+        Args:
+            filters (list): List of filter dictionaries
+            concurrency (int, optional): Maximum number of simultaneous
+                crawls. Defaults to 8.
+            refresh (bool, optional): Crawl even if the data is cached.
+                Defaults to False.
+            cache_only (bool, optional): Never crawl, raise a KeyError
+                if any data is not cached. Defaults to False.
+
+        Returns:
+            dict: Results per filter, keyed by utils.freeze_filter
+        """
+        crawls = self.plan(filters)
+        crawled = {}
+        if crawls:
+            crawled = self._corpus.retrieve_many(
+                [dict(base_key) for base_key in crawls], concurrency,
+                refresh, cache_only)
+
+        results = {}
+        for base_key, filter_dicts in crawls.items():
+            sample_list = crawled[base_key]
+            label_list = None
+            if type(sample_list) is list:
+                # Each label is parsed once for all filters of a crawl
+                label_list = [parse_label(sample['label'])
+                              for sample in sample_list]
+
+            for key, filter_dict in filter_dicts.items():
+                if label_list is None:
+                    results[key] = sample_list
+                else:
+                    results[key] = filter_samples(
+                        sample_list, filter_dict['gender'],
+                        filter_dict['age'], filter_dict['education'],
+                        label_list)
+
+        # Incomplete filters give None like an incomplete crawl
+        return {freeze_filter(filter_dict):
+                results.get(freeze_filter(filter_dict))
+                for filter_dict in filters}
@@ -0,0 +1,156 @@
+import json
+import os
+import sqlite3
+import time
+import zlib
+from .utils import get_data_dir
+from .Sample import Sample, to_sample
+
+# Increase whenever the crawled records or the corpus definition change,
+# older cache entries are ignored afterwards
+SCHEMA_VERSION = 1
+
+
+class ResultCache():
+    """Persistent cache for crawled phrase data. Entries are stored as
+       compressed JSON in a SQLite database, keyed by the normalized
+       filter dictionary and the schema version.
+    """
+    def __init__(self, path: str = None, ttl: float = None,
+                 max_entries: int = 10000, max_bytes: int = None):
+        """Open or create a result cache.
+
+        Args:
+            path (str, optional): SQLite file. Defaults to
+                results.sqlite within utils.get_data_dir().
+            ttl (float, optional): Seconds an entry stays valid.
+                Defaults to None (no expiry).
+            max_entries (int, optional): Entries kept before the least
+                recently used ones are evicted. Defaults to 10000.
+            max_bytes (int, optional): Compressed size kept before the
+                least recently used entries are evicted.
+                Defaults to None (no limit).
+        """
+        if path is None:
+            path = os.path.join(get_data_dir(), 'results.sqlite')
+
+        self._path = path
+        self._ttl = ttl
+        self._max_entries = max_entries
+        self._max_bytes = max_bytes
+
+        self._connection = sqlite3.connect(path)
+        self._connection.execute(
+            "CREATE TABLE IF NOT EXISTS results ("
+            "key TEXT PRIMARY KEY, created REAL, accessed REAL, "
+            "size INTEGER, data BLOB)")
+        self._connection.commit()
+
+    def __len__(self):
+        return self._connection.execute(
+            "SELECT COUNT(*) FROM results").fetchone()[0]
+
+    def get_path(self) -> str:
+        return self._path
+
+    def make_key(self, filter_dict: dict) -> str:
+        """Normalize a filter dictionary into a cache key, independent
+           of the order of its filters
+
+        Args:
+            filter_dict (dict): Filter as returned by PRESEEA.get_filter
+
+        Returns:
+            str: Cache key
+        """
+        normalized = {str(key): str(value) for key, value in filter_dict.items()}
+
+        return json.dumps({'schema': SCHEMA_VERSION, 'filter': normalized},
+                          sort_keys=True, ensure_ascii=False)
+
+    def get(self, filter_dict: dict) -> list:
+        """Get the cached results for a filter
+
+        Args:
+            filter_dict (dict): Filter as returned by PRESEEA.get_filter
+
+        Returns:
+            list: Cached results or None if missing or expired
+        """
+        key = self.make_key(filter_dict)
+        row = self._connection.execute(
+            "SELECT created, data FROM results WHERE key = ?",
+            (key,)).fetchone()
+        if row is None:
+            return None
+
+        created, data = row
+        now = time.time()
+        if self._ttl is not None and now - created >= self._ttl:
+            self._connection.execute("DELETE FROM results WHERE key = ?",
+                                     (key,))
+            self._connection.commit()
+            return None
+
+        self._connection.execute(
+            "UPDATE results SET accessed = ? WHERE key = ?", (now, key))
+        self._connection.commit()
+
+        return json.loads(zlib.decompress(data).decode('utf-8'),
+                          object_hook=to_sample)
+
+    def set(self, filter_dict: dict, results: list):
+        """Store the results for a filter and evict least recently
+           used entries beyond the size limits
+
+        Args:
+            filter_dict (dict): Filter as returned by PRESEEA.get_filter
+            results (list): Crawled results
+        """
+        data = zlib.compress(json.dumps(results, ensure_ascii=False,
+                                        default=Sample.to_dict)
+                             .encode('utf-8'))
+        now = time.time()
+        self._connection.execute(
+            "INSERT OR REPLACE INTO results VALUES (?, ?, ?, ?, ?)",
+            (self.make_key(filter_dict), now, now, len(data), data))
+        self._evict()
+        self._connection.commit()
+
+    def _evict(self):
+        n_entries, n_bytes = self._connection.execute(
+            "SELECT COUNT(*), COALESCE(SUM(size), 0) FROM results").fetchone()
+
+        rows = self._connection.execute(
+            "SELECT key, size FROM results ORDER BY accessed ASC")
+        evict_keys = []
+        for key, size in rows:
+            too_many = self._max_entries is not None and \
+                n_entries > self._max_entries
+            too_large = self._max_bytes is not None and \
+                n_bytes > self._max_bytes
+            if not (too_many or too_large):
+                break
+            evict_keys.append((key,))
+            n_entries -= 1
+            n_bytes -= size
+
+        self._connection.executemany("DELETE FROM results WHERE key = ?",
+                                     evict_keys)
+
+    def invalidate(self, filter_dict: dict = None):
+        """Remove the entry of a filter or, without filter, all entries
+
+        Args:
+            filter_dict (dict, optional): Filter as returned by
+                PRESEEA.get_filter. Defaults to None.
+        """
+        if filter_dict is None:
+            self._connection.execute("DELETE FROM results")
+        else:
+            self._connection.execute("DELETE FROM results WHERE key = ?",
+                                     (self.make_key(filter_dict),))
+        self._connection.commit()
+
+    def close(self):
+        self._connection.close()
@@ -0,0 +1,72 @@
+import sys
+from collections.abc import Mapping
+
+
+class Sample(Mapping):
+    """Compact record of a crawled PRESEEA sample. Fields are stored in
+       slots instead of a per-row dict, and the often repeated label,
+       date and country strings are interned. Samples are read-only
+       mappings, so sample['text'] keeps working for dict callers.
+    """
+    __slots__ = ('label', 'text', 'date', 'country')
+
+    def __init__(self, label: str, text: str, date: str, country: str):
+        self.label = sys.intern(label)
+        self.text = text
+        self.date = sys.intern(date)
+        self.country = sys.intern(country)
+
+    @classmethod
+    def from_dict(cls, record: dict):
+        """Create a sample from a record yielded by the spider
+
+        Args:
+            record (dict): Dictionary with label, text, date and country
+
+        Returns:
+            Sample: Sample of the record
+        """
+        return cls(record['label'], record['text'],
+                   record['date'], record['country'])
+
+    def to_dict(self) -> dict:
+        return {'label': self.label, 'text': self.text,
+                'date': self.date, 'country': self.country}
+
+    def __getitem__(self, key: str):
+        if key not in self.__slots__:
+            raise KeyError(key)
+
+        return getattr(self, key)
+
+    def __iter__(self):
+        return iter(self.__slots__)
+
+    def __len__(self):
+        return len(self.__slots__)
+
+    def __reduce__(self):
+        # Pickled as a plain tuple, strings are interned again on loading
+        return (Sample, (self.label, self.text, self.date, self.country))
+
+    def __repr__(self):
+        return "Sample({!r}, {!r}, {!r}, {!r})".format(
+            self.label, self.text, self.date, self.country)
+
+
+SAMPLE_FIELDS = frozenset(Sample.__slots__)
+
+
+def to_sample(record):
+    """Turn a spider record into a Sample, other items are kept
+
+    Args:
+        record (object): Item scraped by a spider
+
+    Returns:
+        object: Sample or the unchanged item
+    """
+    if isinstance(record, dict) and record.keys() == SAMPLE_FIELDS:
+        return Sample.from_dict(record)
+
+    return record
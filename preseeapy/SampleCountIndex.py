@@ -0,0 +1,150 @@
+import argparse
+import json
+import os
+import time
+from .utils import get_data_dir
+from .ResultCache import SCHEMA_VERSION
+from .QueryPlanner import QueryPlanner
+
+# Phrase matching every sample of a city
+ALL_SAMPLES_PHRASE = " "
+
+
+class SampleCountIndex():
+    """Persisted number of samples per city and demographic cell
+       (gender, age, education). Built once by a bulk crawl, afterwards
+       the total of a city is a dictionary lookup.
+    """
+    def __init__(self, path: str = None):
+        """Open an index file, an empty index if it does not exist yet.
+
+        Args:
+            path (str, optional): JSON file. Defaults to
+                sample_index.json within utils.get_data_dir().
+        """
+        if path is None:
+            path = os.path.join(get_data_dir(), 'sample_index.json')
+        self._path = path
+
+        self._counts = {}
+        self._built = None
+        if os.path.exists(path):
+            self.load()
+
+    def get_path(self) -> str:
+        return self._path
+
+    def make_key(self, gender: str, age: str, education: str) -> str:
+        return "{}|{}|{}".format(gender, age, education)
+
+    def get_count(self, city: str, gender: str = "all", age: str = "all",
+                  education: str = "all") -> int:
+        """Get the number of samples of a city and demographic cell
+
+        Args:
+            city (str): City within the Corpus
+            gender (str, optional): Gender filter. Defaults to "all".
+            age (str, optional): Age filter. Defaults to "all".
+            education (str, optional): Education filter. Defaults to "all".
+
+        Returns:
+            int: Number of samples or None if not indexed
+        """
+        try:
+            return self._counts[city][self.make_key(gender, age, education)]
+        except KeyError:
+            return None
+
+    def set_count(self, city: str, gender: str, age: str,
+                  education: str, n_samples: int):
+        city_counts = self._counts.setdefault(city, {})
+        city_counts[self.make_key(gender, age, education)] = n_samples
+
+    def get_cities(self) -> list:
+        return list(self._counts.keys())
+
+    def get_built_time(self) -> float:
+        return self._built
+
+    def load(self):
+        with open(self._path, 'r', encoding='utf-8') as file:
+            content = json.load(file)
+
+        # Indices of another corpus definition stay empty until rebuilt
+        if content.get('schema') != SCHEMA_VERSION:
+            return None
+
+        self._counts = content['cities']
+        self._built = content['built']
+
+    def save(self):
+        self._built = time.time()
+        content = {'schema': SCHEMA_VERSION,
+                   'built': self._built,
+                   'cities': self._counts}
+
+        with open(self._path, 'w', encoding='utf-8') as file:
+            json.dump(content, file, ensure_ascii=False, indent=1)
+
+    def rebuild(self, corpus, cities: list = None, concurrency: int = 8):
+        """Crawl all samples per city and save the numbers per
+           demographic cell. Every city is crawled once, its cells are
+           counted by the sample labels.
+
+        Args:
+            corpus (PRESEEA): Corpus instance to crawl with
+            cities (list, optional): Cities to index.
+                Defaults to None (all cities of the corpus).
+            concurrency (int, optional): Maximum number of simultaneous
+                crawls. Defaults to 8.
+        """
+        feature_dict = corpus._feature_dict
+        if cities is None:
+            cities = list(feature_dict['City'].keys())
+
+        filter_list = []
+        for city in cities:
+            for gender in ["all"] + feature_dict['Gender']:
+                for age in ["all"] + feature_dict['Age']:
+                    for education in ["all"] + feature_dict['Education']:
+                        filter_list.append({'phrase': ALL_SAMPLES_PHRASE,
+                                            'city': city,
+                                            'gender': gender,
+                                            'education': education,
+                                            'age': age})
+
+        results = QueryPlanner(corpus).retrieve(filter_list, concurrency)
+        for filter_key, sample_list in results.items():
+            filter_dict = dict(filter_key)
+            if type(sample_list) is not list:
+                continue
+            self.set_count(filter_dict['city'], filter_dict['gender'],
+                           filter_dict['age'], filter_dict['education'],
+                           len(sample_list))
+
+        self.save()
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description='Build the PRESEEA sample count index.')
+    parser.add_argument('--rebuild', action='store_true',
+                        help='Crawl the sample numbers and save the index')
+    parser.add_argument('--path', help='Index file')
+    parser.add_argument('--city', action='append',
+                        help='City to index, repeatable. Defaults to all.')
+    parser.add_argument('--concurrency', type=int, default=8)
+    args = parser.parse_args()
+
+    index = SampleCountIndex(args.path)
+    if args.rebuild:
+        from .PRESEEA import PRESEEA
+        corpus = PRESEEA(author='SampleCountIndex')
+        index.rebuild(corpus, args.city, args.concurrency)
+
+    for city in index.get_cities():
+        print("{}: {}".format(city, index.get_count(city)))
+
+
+if __name__ == '__main__':
+    main()
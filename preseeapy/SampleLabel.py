@@ -0,0 +1,85 @@
+import re
+
+# Informant codes of a PRESEEA sample label, e.g. MADR_H13_013:
+# city MADR, gender H(ombre), age group 1, education level 3
+GENDER_CODES = {'H': 'Hombre', 'M': 'Mujer'}
+AGE_CODES = {'1': 'Grupo 1', '2': 'Grupo 2', '3': 'Grupo 3'}
+EDUCATION_CODES = {'1': 'Bajo', '2': 'Medio', '3': 'Alto'}
+
+# Crawled labels may contain stray spaces, e.g. ' MADR_ M11_004'
+LABEL_PATTERN = re.compile(r'^\s*([A-Z]+)\s*_\s*([HM])\s*([1-3])\s*([1-3])'
+                           r'\s*_\s*(\d+)\s*$')
+
+
+class SampleLabel():
+    """Decoded label of a PRESEEA sample, which identifies the informant
+       by city, gender, age group and education level.
+    """
+    def __init__(self, label: str):
+        """Parse a sample label
+
+        Args:
+            label (str): Label as crawled, e.g. MADR_H13_013
+
+        Raises:
+            ValueError: Label does not follow the PRESEEA scheme
+        """
+        match = LABEL_PATTERN.match(label)
+        if match is None:
+            raise ValueError('Unknown sample label {}!'.format(label))
+
+        city, gender, age, education, number = match.groups()
+        self._city_code = city
+        self._gender = GENDER_CODES[gender]
+        self._age = AGE_CODES[age]
+        self._education = EDUCATION_CODES[education]
+        self._number = int(number)
+
+    def __str__(self):
+        return "{}_{}".format(self._city_code, self._number)
+
+    def get_city_code(self) -> str:
+        return self._city_code
+
+    def get_gender(self) -> str:
+        return self._gender
+
+    def get_age(self) -> str:
+        return self._age
+
+    def get_education(self) -> str:
+        return self._education
+
+    def get_number(self) -> int:
+        return self._number
+
+    def matches(self, gender: str = "all", age: str = "all",
+                education: str = "all") -> bool:
+        """Check if the informant belongs to a demographic filter
+
+        Args:
+            gender (str, optional): Gender filter. Defaults to "all".
+            age (str, optional): Age filter. Defaults to "all".
+            education (str, optional): Education filter. Defaults to "all".
+
+        Returns:
+            bool: Informant is within the filter
+        """
+        return gender in ("all", self._gender) \
+            and age in ("all", self._age) \
+            and education in ("all", self._education)
+
+
+def parse_label(label: str) -> SampleLabel:
+    """Parse a sample label without raising on unknown schemes
+
+    Args:
+        label (str): Label as crawled
+
+    Returns:
+        SampleLabel: Decoded label or None if it is unknown
+    """
+    try:
+        return SampleLabel(label)
+    except ValueError:
+        return None
@@ -0,0 +1,342 @@
+import contextlib
+import json
+import mmap
+import os
+import numpy as np
+from .utils import get_data_dir
+from .ResultCache import SCHEMA_VERSION
+from .Sample import Sample
+from .SampleLabel import (parse_label, GENDER_CODES, AGE_CODES,
+                          EDUCATION_CODES)
+
+# One row per sample: byte range of its text within the text blob,
+# string ids of label, date, country and city and demographic codes
+# (0 for unknown labels, else 1 + index within the code tables)
+SAMPLE_DTYPE = np.dtype([('text_start', '<i8'), ('text_end', '<i8'),
+                         ('label', '<u4'), ('date', '<u4'),
+                         ('country', '<u4'), ('city', '<u4'),
+                         ('gender', 'u1'), ('age', 'u1'),
+                         ('education', 'u1')])
+
+# Byte range of every string within the string blob
+STRING_DTYPE = np.dtype([('start', '<i8'), ('end', '<i8')])
+
+GENDER_VALUES = list(GENDER_CODES.values())
+AGE_VALUES = list(AGE_CODES.values())
+EDUCATION_VALUES = list(EDUCATION_CODES.values())
+
+
+@contextlib.contextmanager
+def locked(path: str):
+    """Hold an exclusive lock on a file, with flock where available and
+       msvcrt on Windows
+
+    Args:
+        path (str): Lock file, created if missing
+    """
+    with open(path, 'a+b') as lock_file:
+        try:
+            import fcntl
+        except ImportError:
+            import msvcrt
+            lock_file.seek(0)
+            msvcrt.locking(lock_file.fileno(), msvcrt.LK_LOCK, 1)
+            try:
+                yield
+            finally:
+                lock_file.seek(0)
+                msvcrt.locking(lock_file.fileno(), msvcrt.LK_UNLCK, 1)
+            return
+
+        fcntl.flock(lock_file, fcntl.LOCK_EX)
+        try:
+            yield
+        finally:
+            fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+
+class SampleStore():
+    """Columnar on-disk store of samples. The texts are one UTF-8 blob,
+       the other fields fixed-size rows of SAMPLE_DTYPE with repeated
+       strings kept once in a string table. The string table is a blob
+       with the byte range of every string, like the texts only ever
+       appended to. Readers map the files into memory and decode the
+       strings they use, so opening a store copies nothing and processes
+       reading the same store share its pages. Writers of several
+       processes append one after the other under a file lock.
+    """
+    def __init__(self, path: str = None):
+        """Open or create a sample store.
+
+        Args:
+            path (str, optional): Directory of the store. Defaults to
+                samples within utils.get_data_dir().
+        """
+        if path is None:
+            path = os.path.join(get_data_dir(), 'samples')
+        os.makedirs(path, exist_ok=True)
+        self._path = path
+
+        # Decoded strings per id, string ids are only needed by writers
+        self._strings = {}
+        self._string_ids = {}
+        self._rows = np.zeros(0, dtype=SAMPLE_DTYPE)
+        self._string_ranges = np.zeros(0, dtype=STRING_DTYPE)
+        self._string_blob = b""
+        self._texts = b""
+        self._mapped_files = []
+        self.refresh()
+
+    def get_path(self) -> str:
+        return self._path
+
+    def _get_file(self, name: str) -> str:
+        return os.path.join(self._path, name)
+
+    def _count(self, name: str, itemsize: int) -> int:
+        path = self._get_file(name)
+        if not os.path.exists(path):
+            return 0
+
+        return os.path.getsize(path) // itemsize
+
+    def _map_blob(self, name: str):
+        path = self._get_file(name)
+        if not os.path.exists(path) or not os.path.getsize(path):
+            return b""
+
+        file = open(path, 'rb')
+        blob = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+        self._mapped_files.append((file, blob))
+
+        return blob
+
+    def refresh(self):
+        """Map the store again to see samples appended by other writers"""
+        # Rows are counted before the string ranges and those before the
+        # blobs are mapped, everything of the counted rows is written
+        n_rows = self._count('samples.bin', SAMPLE_DTYPE.itemsize)
+        n_strings = self._count('strings.idx', STRING_DTYPE.itemsize)
+
+        schema_path = self._get_file('schema.json')
+        if os.path.exists(schema_path):
+            with open(schema_path, 'r', encoding='utf-8') as file:
+                schema = json.load(file).get('schema')
+            if schema != SCHEMA_VERSION:
+                raise ValueError('Sample store {} has schema {}!'.format(
+                    self._path, schema))
+        elif n_rows:
+            raise ValueError('Sample store {} has no schema!'.format(
+                self._path))
+
+        self.close()
+        if n_rows:
+            self._rows = np.memmap(self._get_file('samples.bin'),
+                                   dtype=SAMPLE_DTYPE, mode='r',
+                                   shape=(n_rows,))
+        if n_strings:
+            self._string_ranges = np.memmap(
+                self._get_file('strings.idx'), dtype=STRING_DTYPE, mode='r',
+                shape=(n_strings,))
+        self._string_blob = self._map_blob('strings.bin')
+        self._texts = self._map_blob('texts.bin')
+
+    def close(self):
+        for file, blob in self._mapped_files:
+            blob.close()
+            file.close()
+        self._mapped_files = []
+        self._texts = b""
+        self._string_blob = b""
+        self._rows = np.zeros(0, dtype=SAMPLE_DTYPE)
+        self._string_ranges = np.zeros(0, dtype=STRING_DTYPE)
+
+    def __len__(self):
+        return len(self._rows)
+
+    def _get_string(self, string_id: int) -> str:
+        string_id = int(string_id)
+        string = self._strings.get(string_id)
+        if string is None:
+            start, end = self._string_ranges[string_id].tolist()
+            string = self._strings[string_id] = \
+                self._string_blob[start:end].decode('utf-8')
+
+        return string
+
+    def _get_string_id(self, string: str, new_strings: list) -> int:
+        string_id = self._string_ids.get(string)
+        if string_id is None:
+            string_id = self._string_ids[string] = len(self._string_ids)
+            new_strings.append(string)
+
+        return string_id
+
+    def _find_city_id(self, city: str):
+        for city_id in np.unique(self._rows['city']).tolist():
+            if self._get_string(city_id) == city:
+                return city_id
+
+        return None
+
+    def append(self, sample_list: list, city: str):
+        """Append the samples of a city to the store. An exclusive lock
+           on the store is held while writing, so the strings of other
+           writers are read before the string table is extended.
+
+        Args:
+            sample_list (list): Records as returned by retrieve_phrase_data
+            city (str): City of the samples
+        """
+        with locked(self._get_file('lock')):
+            self.refresh()
+            try:
+                self._append(sample_list, city)
+            except BaseException:
+                # Ids of strings, which might not have been written
+                self._string_ids = {}
+                raise
+
+        self.refresh()
+
+    def _append(self, sample_list: list, city: str):
+        schema_path = self._get_file('schema.json')
+        if not os.path.exists(schema_path):
+            with open(schema_path + '.tmp', 'w', encoding='utf-8') as file:
+                json.dump({'schema': SCHEMA_VERSION}, file)
+            os.replace(schema_path + '.tmp', schema_path)
+
+        # Strings written since the last append of this writer
+        for string_id in range(len(self._string_ids),
+                               len(self._string_ranges)):
+            self._string_ids[self._get_string(string_id)] = string_id
+
+        texts_path = self._get_file('texts.bin')
+        text_start = 0
+        if os.path.exists(texts_path):
+            text_start = os.path.getsize(texts_path)
+
+        rows = np.zeros(len(sample_list), dtype=SAMPLE_DTYPE)
+        text_list = []
+        new_strings = []
+        city_id = self._get_string_id(city, new_strings)
+        for row, sample in zip(rows, sample_list):
+            text = sample['text'].encode('utf-8')
+            text_list.append(text)
+            row['text_start'] = text_start
+            text_start += len(text)
+            row['text_end'] = text_start
+            row['label'] = self._get_string_id(sample['label'], new_strings)
+            row['date'] = self._get_string_id(sample['date'], new_strings)
+            row['country'] = self._get_string_id(sample['country'],
+                                                 new_strings)
+            row['city'] = city_id
+
+            label = parse_label(sample['label'])
+            if label is not None:
+                row['gender'] = GENDER_VALUES.index(label.get_gender()) + 1
+                row['age'] = AGE_VALUES.index(label.get_age()) + 1
+                row['education'] = \
+                    EDUCATION_VALUES.index(label.get_education()) + 1
+
+        # Blobs are written before their offsets and rows last, readers
+        # never see a row without its data
+        with open(texts_path, 'ab') as file:
+            file.write(b"".join(text_list))
+
+        if new_strings:
+            strings_path = self._get_file('strings.bin')
+            string_start = 0
+            if os.path.exists(strings_path):
+                string_start = os.path.getsize(strings_path)
+
+            encoded = [string.encode('utf-8') for string in new_strings]
+            string_ranges = np.zeros(len(encoded), dtype=STRING_DTYPE)
+            string_ranges['end'] = string_start + np.cumsum(
+                [len(string) for string in encoded])
+            string_ranges['start'][0] = string_start
+            string_ranges['start'][1:] = string_ranges['end'][:-1]
+
+            with open(strings_path, 'ab') as file:
+                file.write(b"".join(encoded))
+            with open(self._get_file('strings.idx'), 'ab') as file:
+                file.write(string_ranges.tobytes())
+
+        with open(self._get_file('samples.bin'), 'ab') as file:
+            file.write(rows.tobytes())
+
+    def get_columns(self) -> np.ndarray:
+        """Get the rows of all samples without their texts
+
+        Returns:
+            numpy.ndarray: Read-only rows of SAMPLE_DTYPE
+        """
+        return self._rows
+
+    def get_cities(self) -> list:
+        city_ids = np.unique(self._rows['city'])
+
+        return [self._get_string(city_id) for city_id in city_ids.tolist()]
+
+    def get_text(self, idx: int) -> str:
+        row = self._rows[idx]
+        return self._texts[row['text_start']:row['text_end']].decode('utf-8')
+
+    def get_sample(self, idx: int) -> Sample:
+        """Read a single sample
+
+        Args:
+            idx (int): Index of the sample within the store
+
+        Returns:
+            Sample: Record as returned by retrieve_phrase_data
+        """
+        row = self._rows[idx]
+
+        return Sample(self._get_string(row['label']), self.get_text(idx),
+                      self._get_string(row['date']),
+                      self._get_string(row['country']))
+
+    def select(self, city: str = "all", gender: str = "all",
+               age: str = "all", education: str = "all") -> np.ndarray:
+        """Get the indices of the samples within a filter. Samples with
+           unknown labels are only part of the "all" filters.
+
+        Args:
+            city (str, optional): City filter. Defaults to "all".
+            gender (str, optional): Gender filter. Defaults to "all".
+            age (str, optional): Age filter. Defaults to "all".
+            education (str, optional): Education filter. Defaults to "all".
+
+        Returns:
+            numpy.ndarray: Sample indices in ascending order
+        """
+        rows = self._rows
+        selected = np.ones(len(rows), dtype=bool)
+        if city != "all":
+            city_id = self._find_city_id(city)
+            if city_id is None:
+                return np.zeros(0, dtype=np.int64)
+            selected &= rows['city'] == city_id
+
+        for column, value, values in [('gender', gender, GENDER_VALUES),
+                                      ('age', age, AGE_VALUES),
+                                      ('education', education,
+                                       EDUCATION_VALUES)]:
+            if value == "all":
+                continue
+            if value not in values:
+                raise ValueError('Unknown {} filter {}!'.format(column, value))
+            selected &= rows[column] == values.index(value) + 1
+
+        return np.flatnonzero(selected)
+
+    def iter_samples(self, city: str = "all", gender: str = "all",
+                     age: str = "all", education: str = "all"):
+        """Read the samples of a filter one by one, see select
+
+        Yields:
+            Sample: Records as returned by retrieve_phrase_data
+        """
+        for idx in self.select(city, gender, age, education).tolist():
+            yield self.get_sample(idx)
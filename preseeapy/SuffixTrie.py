@@ -0,0 +1,43 @@
+class SuffixTrie():
+    """Trie over reversed suffixes. Every suffix carries a bit mask, and
+       matching a word walks its characters backwards once, combining
+       the masks of all suffixes the word ends with.
+    """
+    def __init__(self):
+        # A node is a pair of its mask and its children by character
+        self._root = [0, {}]
+
+    def add(self, suffix: str, mask: int):
+        """Add a suffix to the trie
+
+        Args:
+            suffix (str): Ending of words
+            mask (int): Bits set for words with this ending
+        """
+        if not suffix:
+            raise ValueError('Suffix has to be a non-empty string!')
+
+        node = self._root
+        for char in reversed(suffix):
+            node = node[1].setdefault(char, [0, {}])
+        node[0] |= mask
+
+    def match(self, word: str) -> int:
+        """Combine the masks of all suffixes of a word
+
+        Args:
+            word (str): Word to be checked
+
+        Returns:
+            int: Bit mask, 0 if the word has no known ending
+        """
+        mask = 0
+        children = self._root[1]
+        for char in reversed(word):
+            node = children.get(char)
+            if node is None:
+                break
+            mask |= node[0]
+            children = node[1]
+
+        return mask
@@ -0,0 +1,150 @@
+import re
+
+# Tokens of the transcriptions which are no words
+NO_WORD_LIST = ["", "/", "…"]
+# Remnants of escaped transcription tags, e.g. "&lt;risas" or "&gt;"
+MARKER_PATTERN = re.compile(r'&lt;|&gt;')
+# Whitespace separated token with its position in the text
+TOKEN_PATTERN = re.compile(r'[^ ]+')
+
+
+def strip_word(word: str) -> str:
+    """Strip the question and exclamation marks of a word
+
+    Args:
+        word (str): Possible word
+
+    Returns:
+        str: Word to classify or None if it is no word
+    """
+    if type(word) != str:
+        return None
+    if len(word) < 2:
+        return None
+    if (word[-1] == "?" or word[-1] == "!"):
+        word = word[:-1]
+    if (word[0] == "¿" or word[0] == "¡"):
+        word = word[1:]
+
+    return word
+
+
+class Tokenizer():
+    """Split transcriptions into words in one pass. Transcription
+       markers are dropped and, if requested, the question and
+       exclamation marks of every word are stripped. The word of every
+       distinct token is computed once and kept in a lookup table.
+       Optionally the character spans or integer ids of the words are
+       returned.
+    """
+    # Distinct tokens kept by the lookup table before it is cleared
+    TABLE_SIZE = 65536
+
+    def __init__(self, no_word_list: list = None, strip: bool = False):
+        """Compile a tokenizer
+
+        Args:
+            no_word_list (list, optional): Tokens which are no words.
+                Defaults to None (NO_WORD_LIST).
+            strip (bool, optional): Strip question and exclamation marks
+                and drop words shorter than two characters, like
+                VerbClassifier does. Defaults to False.
+        """
+        if no_word_list is None:
+            no_word_list = NO_WORD_LIST
+        self._no_words = frozenset(no_word_list)
+        self._strip = strip
+        # Word by token, None for tokens which are no words
+        self._table = {}
+
+    def _to_word(self, token: str) -> str:
+        """Word of a token, None if it is no word"""
+        if token in self._no_words or MARKER_PATTERN.search(token):
+            return None
+        if self._strip:
+            return strip_word(token)
+
+        return token
+
+    def _lookup(self, token: str) -> str:
+        if len(self._table) >= self.TABLE_SIZE:
+            self._table.clear()
+        word = self._table[token] = self._to_word(token)
+
+        return word
+
+    def get_word(self, token) -> str:
+        """Get the word of a single token as tokenize returns it
+
+        Args:
+            token (str): Possible word
+
+        Returns:
+            str: Word or None if the token is no word
+        """
+        if type(token) is not str:
+            return None
+        if token in self._table:
+            return self._table[token]
+
+        return self._lookup(token)
+
+    def tokenize(self, text: str) -> list:
+        """Get the words of a text
+
+        Args:
+            text (str): Transcription or phrase
+
+        Returns:
+            list: Words in order of the text
+        """
+        table = self._table
+        lookup = self._lookup
+        word_list = []
+        append = word_list.append
+        for token in text.split(" "):
+            word = table[token] if token in table else lookup(token)
+            if word is not None:
+                append(word)
+
+        return word_list
+
+    def tokenize_spans(self, text: str) -> list:
+        """Get the words of a text with their positions
+
+        Args:
+            text (str): Transcription or phrase
+
+        Returns:
+            list: Tuples of word, start and end (exclusive) index in text
+        """
+        table = self._table
+        spans = []
+        for match in TOKEN_PATTERN.finditer(text):
+            token = match.group()
+            word = table[token] if token in table else self._lookup(token)
+            if word is None:
+                continue
+
+            start, end = match.span()
+            if word != token:
+                start = start + token.index(word)
+                end = start + len(word)
+            spans.append((word, start, end))
+
+        return spans
+
+    def tokenize_ids(self, text: str, vocabulary: dict) -> list:
+        """Get the words of a text as integer ids
+
+        Args:
+            text (str): Transcription or phrase
+            vocabulary (dict): Ids by word, unknown words are added
+                with the next free id
+
+        Returns:
+            list: Word ids in order of the text
+        """
+        add_word = vocabulary.setdefault
+        return [add_word(word, len(vocabulary))
+                for word in self.tokenize(text)]
@@ -1,11 +1,29 @@
+import functools
 from .WordClassifier import WordClassifier
+from .SuffixTrie import SuffixTrie
+from .Tokenizer import Tokenizer
 
 
 class VerbClassifier():
     gerundium_list = ['iendo']
 
+    # Verb classes and the methods defining their endings and exceptions
+    VERB_CLASSES = {"1ps_sg": "is_1person_singular",
+                    "2ps_sg": "is_2person_singular",
+                    "3ps_sg": "is_3person_singular",
+                    "1ps_pl": "is_1person_plural",
+                    "2ps_pl": "is_2person_plural",
+                    "3ps_pl": "is_3person_plural"}
+
+    # Word forms whose verb classes are kept by the classification cache
+    CACHE_SIZE = 65536
+    # Splits phrases and strips the words to classify in one pass
+    TOKENIZER = Tokenizer(strip=True)
+
     def __init__(self, word_list: list):
         self._word_classifier = WordClassifier("")
+        # Phrase the word classifier is set to when it is needed
+        self._pending_phrase = None
         self.set_word_list(word_list)
 
     def set_phrase(self, phrase: str):
@@ -14,9 +32,8 @@ class VerbClassifier():
         Args:
             phrase (str): Phrase to be set as word list
         """
-        self._word_classifier.set_phrase(phrase)
-        word_list = self._word_classifier.get_word_list()
-        self.set_word_list(word_list)
+        self._pending_phrase = phrase
+        self._word_list = self.TOKENIZER.tokenize(phrase)
 
     def get_environment_verbs(self, word: str) -> (list, list):
         """Get environmental verbs around a search phrase
@@ -27,6 +44,9 @@ class VerbClassifier():
         Returns:
             list: List of dictionaries
         """
+        if self._pending_phrase is not None:
+            self._word_classifier.set_phrase(self._pending_phrase)
+            self._pending_phrase = None
         lead_words, follow_words = self._word_classifier.get_environment_words(word)
 
         return_list = []
@@ -44,25 +64,28 @@ class VerbClassifier():
         Args:
             word_list (list): Input list of possible words
         """
-        checked_list = []
-        for word in word_list:
-            if type(word) != str:
-                continue
-            if len(word) < 2:
-                continue
-            if (word[-1] == "?" or word[-1] == "!"):
-                word = word[:-1]
-            if (word[0] == "¿" or word[0] == "¡"):
-                word = word[1:]
+        get_word = self.TOKENIZER.get_word
+        self._word_list = [word for word in map(get_word, word_list)
+                           if word is not None]
 
-            checked_list.append(word)
+    @staticmethod
+    def normalize_word(word: str) -> str:
+        """Strip the question and exclamation marks of a word
 
-        self._word_list = checked_list
+        Args:
+            word (str): Possible word
+
+        Returns:
+            str: Word to classify or None if it is no word
+        """
+        return VerbClassifier.TOKENIZER.get_word(word)
 
     def get_word_list(self) -> list:
         return self._word_list
 
     def _check_verb(func):
+        # The undecorated definition stays available as __wrapped__
+        @functools.wraps(func)
         def wrapper(self, word: str) -> bool:
             ending_list, exception_list = func(self, word)
 
@@ -192,6 +215,120 @@ class VerbClassifier():
 
         return ending_list, exception_list
 
+    @classmethod
+    def _compile(cls) -> tuple:
+        """Compile the endings, exceptions and gerund endings of all verb
+           classes into one reversed-suffix trie. Bit i of a mask stands
+           for the i-th verb class, the bit after them for gerunds.
+           Compiled once per class.
+
+        Returns:
+            tuple: Suffix trie, exception masks by word, gerund mask
+                and the verb class keys per mask
+        """
+        if '_compiled' in cls.__dict__:
+            return cls._compiled
+
+        trie = SuffixTrie()
+        exception_masks = {}
+        keys = list(cls.VERB_CLASSES.keys())
+        for bit, key in enumerate(keys):
+            definition = getattr(cls, cls.VERB_CLASSES[key]).__wrapped__
+            ending_list, exception_list = definition(None, "")
+            for ending in ending_list:
+                trie.add(ending, 1 << bit)
+            for exception in exception_list:
+                exception_masks[exception] = \
+                    exception_masks.get(exception, 0) | 1 << bit
+
+        gerund_mask = 1 << len(keys)
+        for ending in cls.gerundium_list:
+            trie.add(ending, gerund_mask)
+
+        mask_keys = [[key for bit, key in enumerate(keys) if mask >> bit & 1]
+                     for mask in range(gerund_mask)]
+
+        cls._compiled = (trie, exception_masks, gerund_mask, mask_keys)
+        return cls._compiled
+
+    @classmethod
+    def _match_verb_classes(cls, word: str) -> int:
+        """Get the verb class mask of a word with one backward walk
+           over its characters
+
+        Args:
+            word (str): Single word
+
+        Returns:
+            int: Bit mask of the verb classes
+        """
+        trie, exception_masks, gerund_mask, _ = cls._compile()
+
+        mask = trie.match(word)
+        if mask & gerund_mask:
+            # If given word is a gerundium, no verb
+            return 0
+
+        return mask & ~exception_masks.get(word, 0)
+
+    @classmethod
+    def _get_cache(cls):
+        """Classification cache from word form to verb class mask. It is
+           shared by all instances of a process and evicts the least
+           recently used word forms beyond CACHE_SIZE.
+
+        Returns:
+            function: Cached _match_verb_classes
+        """
+        if '_cache' not in cls.__dict__:
+            cls._cache = functools.lru_cache(cls.CACHE_SIZE)(
+                cls._match_verb_classes)
+
+        return cls._cache
+
+    @classmethod
+    def set_cache_size(cls, size: int):
+        """Replace the classification cache by an empty one of a new size
+
+        Args:
+            size (int): Word forms kept, 0 disables the cache
+        """
+        if type(size) is not int or size < 0:
+            raise ValueError('Cache size has to be a non-negative integer!')
+
+        cls.CACHE_SIZE = size
+        cls._cache = functools.lru_cache(size)(cls._match_verb_classes)
+
+    @classmethod
+    def clear_cache(cls):
+        cls._get_cache().cache_clear()
+
+    @classmethod
+    def get_cache_info(cls) -> dict:
+        """Get hit and miss statistics of the classification cache
+
+        Returns:
+            dict: hits, misses, size and maxsize of the cache
+        """
+        info = cls._get_cache().cache_info()
+
+        return {'hits': info.hits, 'misses': info.misses,
+                'size': info.currsize, 'maxsize': info.maxsize}
+
+    def get_verb_classes(self, word: str) -> list:
+        """Get the verb classes of a single word. Same result as the
+           is_* methods.
+
+        Args:
+            word (str): Single word
+
+        Returns:
+            list: Keys of the verb classes, e.g. ["1ps_sg"]
+        """
+        mask_keys = self._compile()[3]
+
+        return list(mask_keys[self._get_cache()(word)])
+
     def classify_verbs(self) -> dict:
         """This method classfies a list of words according
            their form in their personal conjugation, if it is a verb
@@ -199,28 +336,12 @@ class VerbClassifier():
         Returns:
             dict: Sorted verbs from a list of words
         """
+        verb_class = {key: [] for key in self.VERB_CLASSES}
 
-        verb_class = {
-                "1ps_sg": [],
-                "2ps_sg": [],
-                "3ps_sg": [],
-                "1ps_pl": [],
-                "2ps_pl": [],
-                "3ps_pl": [],
-            }
-
+        mask_keys = self._compile()[3]
+        match_verb_classes = self._get_cache()
         for word in self._word_list:
-            if self.is_1person_singular(word):
-                verb_class["1ps_sg"].append(word)
-            if self.is_2person_singular(word):
-                verb_class["2ps_sg"].append(word)
-            if self.is_3person_singular(word):
-                verb_class["3ps_sg"].append(word)
-            if self.is_1person_plural(word):
-                verb_class["1ps_pl"].append(word)
-            if self.is_2person_plural(word):
-                verb_class["2ps_pl"].append(word)
-            if self.is_3person_plural(word):
-                verb_class["3ps_pl"].append(word)
+            for key in mask_keys[match_verb_classes(word)]:
+                verb_class[key].append(word)
 
         return verb_class
@@ -0,0 +1,201 @@
+from array import array
+import contextlib
+import sys
+import numpy as np
+from .Tokenizer import Tokenizer
+from .VerbClassifier import VerbClassifier
+
+
+class Vocabulary():
+    """Lexicon encoding sample texts as integer token ids. Every sample
+       is tokenized once into a compact id sequence, analyses then work
+       on ids and per-id lookup tables instead of strings. Within
+       keep_texts, the ids of encoded batches are kept per text, so
+       several analyses of the same samples encode them once.
+    """
+    # Bytes of texts and ids kept by keep_texts before the table is cleared
+    TEXT_TABLE_BYTES = 64 * 1024 * 1024
+
+    def __init__(self, tokenizer: Tokenizer = None):
+        """Create an empty lexicon
+
+        Args:
+            tokenizer (Tokenizer, optional): Tokenizer splitting the texts.
+                Defaults to None (Tokenizer with default settings).
+        """
+        self._tokenizer = tokenizer or Tokenizer()
+        # Ids by word and words by id
+        self._ids = {}
+        self._words = []
+        # Verb class mask per id, extended for new words when requested
+        self._verb_masks = array('q')
+        # Token ids by text of the encoded batches within keep_texts
+        self._texts = None
+        self._text_bytes = 0
+        self._max_text_bytes = 0
+
+    @classmethod
+    def shared(cls):
+        """Lexicon shared by all analyses of a process
+
+        Returns:
+            Vocabulary: Process-wide lexicon
+        """
+        if '_shared' not in cls.__dict__:
+            cls._shared = cls()
+
+        return cls._shared
+
+    def __len__(self):
+        return len(self._words)
+
+    def get_tokenizer(self) -> Tokenizer:
+        return self._tokenizer
+
+    def get_id(self, word: str) -> int:
+        """Get the id of a word, unknown words are added
+
+        Args:
+            word (str): Single word
+
+        Returns:
+            int: Token id
+        """
+        return self._add_words([word])[0]
+
+    def find_id(self, word: str) -> int:
+        """Get the id of a word without adding it
+
+        Args:
+            word (str): Single word
+
+        Returns:
+            int: Token id or None if the word is unknown
+        """
+        return self._ids.get(word)
+
+    def get_word(self, token_id: int) -> str:
+        return self._words[token_id]
+
+    def get_words(self) -> list:
+        return self._words
+
+    def _add_words(self, word_list: list) -> list:
+        ids = self._ids
+        token_ids = []
+        for word in word_list:
+            token_id = ids.get(word)
+            if token_id is None:
+                token_id = ids[word] = len(self._words)
+                self._words.append(word)
+            token_ids.append(token_id)
+
+        return token_ids
+
+    def encode(self, text: str) -> array:
+        """Encode a text as token ids
+
+        Args:
+            text (str): Transcription or phrase
+
+        Returns:
+            array: Token ids of type 'I'
+        """
+        return array('I', self._add_words(self._tokenizer.tokenize(text)))
+
+    @contextlib.contextmanager
+    def keep_texts(self, max_bytes: int = None):
+        """Keep the ids of the texts encoded by encode_many within the
+           block, later batches reuse them. The texts are released when
+           the block is left.
+
+        Args:
+            max_bytes (int, optional): Size of the kept texts and ids
+                before they are cleared. Defaults to None
+                (TEXT_TABLE_BYTES).
+
+        Yields:
+            Vocabulary: The lexicon itself
+        """
+        if self._texts is not None:
+            # Nested blocks share the table of the outermost one
+            yield self
+            return
+
+        self._texts = {}
+        self._text_bytes = 0
+        self._max_text_bytes = max_bytes or self.TEXT_TABLE_BYTES
+        try:
+            yield self
+        finally:
+            self._texts = None
+            self._text_bytes = 0
+
+    def encode_many(self, text_list: list) -> tuple:
+        """Encode several texts into one token id array. Within
+           keep_texts, texts encoded by a former batch are not
+           tokenized again.
+
+        Args:
+            text_list (list): Sample texts
+
+        Returns:
+            tuple: Token ids of all texts (int32 array) and the start
+                offset of every text with the end as last element
+                (int64 array)
+        """
+        tokenize = self._tokenizer.tokenize
+        texts = self._texts
+        token_ids = array('I')
+        offsets = [0]
+        for text in text_list:
+            if texts is None:
+                token_ids.extend(self._add_words(tokenize(text)))
+                offsets.append(len(token_ids))
+                continue
+
+            text_ids = texts.get(text)
+            if text_ids is None:
+                text_ids = array('I', self._add_words(tokenize(text)))
+                size = sys.getsizeof(text) + \
+                    text_ids.itemsize * len(text_ids)
+                if self._text_bytes + size > self._max_text_bytes:
+                    texts.clear()
+                    self._text_bytes = 0
+                texts[text] = text_ids
+                self._text_bytes += size
+            token_ids.extend(text_ids)
+            offsets.append(len(token_ids))
+
+        return (np.frombuffer(token_ids, dtype=np.uint32).astype(np.int32),
+                np.array(offsets, dtype=np.int64))
+
+    def decode(self, token_ids) -> list:
+        """Turn token ids back into words
+
+        Args:
+            token_ids (list): Token ids
+
+        Returns:
+            list: Words
+        """
+        words = self._words
+        return [words[token_id] for token_id in token_ids]
+
+    def get_verb_masks(self) -> np.ndarray:
+        """Get the verb class mask of every token id, see
+           VerbClassifier.get_verb_classes. Each word is classified once.
+
+        Returns:
+            numpy.ndarray: Bit masks indexed by token id
+        """
+        verb_masks = self._verb_masks
+        if len(verb_masks) < len(self._words):
+            match_verb_classes = VerbClassifier._get_cache()
+            normalize_word = VerbClassifier.TOKENIZER.get_word
+            for word in self._words[len(verb_masks):]:
+                normalized = normalize_word(word)
+                verb_masks.append(0 if normalized is None
+                                  else match_verb_classes(normalized))
+
+        return np.array(verb_masks, dtype=np.int64)
@@ -1,6 +1,12 @@
+from .Tokenizer import Tokenizer, NO_WORD_LIST
+
+# Tokenizers shared by all instances with the same NO_WORD_LIST
+_TOKENIZERS = {tuple(NO_WORD_LIST): Tokenizer()}
+
+
 class WordClassifier():
     def __init__(self, phrase: str):
-        self.NO_WORD_LIST = ["", "/", "…"]
+        self.NO_WORD_LIST = list(NO_WORD_LIST)
 
         # Environmental words range
         self.WORD_RANGE = 3
@@ -12,23 +18,22 @@ class WordClassifier():
     def get_word_list(self):
         return self._word_list
 
-    def _is_word(self, word: str) -> bool:
-        """This method checks if a string is a word
-
-        Args:
-            word (str): String to be checked
+    def _get_tokenizer(self) -> Tokenizer:
+        """Tokenizer dropping the instance's NO_WORD_LIST
 
         Returns:
-            bool: Is string a word
+            Tokenizer: Tokenizer shared with equal instances
         """
-        is_word = False
-        if word not in self.NO_WORD_LIST:
-            is_word = True
+        no_words = tuple(self.NO_WORD_LIST)
+        tokenizer = _TOKENIZERS.get(no_words)
+        if tokenizer is None:
+            tokenizer = _TOKENIZERS[no_words] = Tokenizer(no_words)
 
-        return is_word
+        return tokenizer
 
     def set_word_list(self, phrase: str) -> list:
-        """Get a list of words from a complete phrase as string
+        """Get a list of words from a complete phrase as string,
+           transcription markers are dropped
 
         Args:
             phrase (str): Complete string describing a phrase
@@ -36,60 +41,126 @@ class WordClassifier():
         Returns:
             list: List of single words within a phrase
         """
-        word_list = phrase.split(" ")
-        word_list = [word for word in word_list if self._is_word(word)]
+        return self._get_tokenizer().tokenize(phrase)
+
+    def _check_word_range(self, word_range: int) -> int:
+        if word_range is None:
+            return self.WORD_RANGE
+        if type(word_range) is not int or word_range < 0:
+            raise ValueError('Word range has to be a non-negative integer!')
+
+        return word_range
+
+    def _iter_windows(self, search_phrase: str, word_range: int):
+        """Yield the environment of every occurrence of the search phrase.
+           The phrase is matched as a sequence of words.
+
+        Yields:
+            tuple: Leading and following words of an occurrence
+        """
+        word_range = self._check_word_range(word_range)
+        sequence = self.set_word_list(search_phrase)
+        words = self._word_list
+
+        for start in iter_sequence(words, sequence):
+            end = start + len(sequence)
+            yield (words[max(start - word_range, 0):start],
+                   words[end:end + word_range])
 
-        return word_list
+    def get_environment_windows(self, search_phrase: str,
+                                word_range: int = None) -> list:
+        """Get leading and following words around every occurrence of
+           the search phrase within a single pass over the phrase.
 
-    def get_leading_words(self, search_phrase: str) -> list:
+        Args:
+            search_phrase (str): Word or words to search, several words
+                are matched as a sequence
+            word_range (int, optional): Number of words around an
+                occurrence. Defaults to None (WORD_RANGE).
+
+        Returns:
+            list: Tuples of leading and following words per occurrence
+        """
+        return list(self._iter_windows(search_phrase, word_range))
+
+    def get_leading_words(self, search_phrase: str,
+                          word_range: int = None) -> list:
         """Get a number of leading words from phrase in
            front of a search phrase
 
         Returns:
             list: Frontal words
         """
-        search_phrase = search_phrase.replace(" ", "")
-        phrase_idx = self._word_list.index(search_phrase)
-        sub_list = self._word_list[:phrase_idx]
+        return self.get_environment_words(search_phrase, word_range)[0]
 
-        if len(sub_list) > self.WORD_RANGE:
-            leading_list = sub_list[-self.WORD_RANGE:]
-        else:
-            leading_list = sub_list
-
-        return leading_list
-
-    def get_following_words(self, search_phrase: str) -> list:
+    def get_following_words(self, search_phrase: str,
+                            word_range: int = None) -> list:
         """Get a number of following words from phrase
            after a search phrase
 
         Returns:
             list: Posterior words
         """
-        search_phrase = search_phrase.replace(" ", "")
-        phrase_idx = self._word_list.index(search_phrase)
-        sub_list = self._word_list[phrase_idx+1:]
-
-        if len(sub_list) > self.WORD_RANGE:
-            following_list = sub_list[:self.WORD_RANGE]
-        else:
-            following_list = sub_list
+        return self.get_environment_words(search_phrase, word_range)[1]
 
-        return following_list
-
-    def get_environment_words(self, search_phrase: str) -> (list, list):
+    def get_environment_words(self, search_phrase: str,
+                              word_range: int = None) -> (list, list):
         """Get leading and following words from phrase
-           around the search phrase.
+           around the first occurrence of the search phrase.
 
         Arguments:
             str: Phrase within phrase to search words around it
+            int: Number of words around the phrase, defaults to WORD_RANGE
 
         Returns:
             list: List of leading words
             list: List of following words
         """
-        # Get environmental words
-        leading_words = self.get_leading_words(search_phrase)
-        following_words = self.get_following_words(search_phrase)
-
-        return leading_words, following_words
+        for leading_words, following_words in self._iter_windows(
+                search_phrase, word_range):
+            return leading_words, following_words
+
+        raise ValueError('{} is not in the phrase'.format(search_phrase))
+
+
+def iter_sequence(word_list: list, sequence: list):
+    """Find every occurrence of a word sequence in linear time
+       (Knuth-Morris-Pratt). Overlapping occurrences are found, too.
+
+    Args:
+        word_list (list): Words to search in
+        sequence (list): Words to search for
+
+    Yields:
+        int: Index of the first word of an occurrence
+    """
+    n_sequence = len(sequence)
+    if n_sequence == 0:
+        return None
+
+    if n_sequence == 1:
+        word = sequence[0]
+        for idx, candidate in enumerate(word_list):
+            if candidate == word:
+                yield idx
+        return None
+
+    # Length of the longest proper prefix which is also a suffix
+    failure = [0]*n_sequence
+    matched = 0
+    for idx in range(1, n_sequence):
+        while matched and sequence[idx] != sequence[matched]:
+            matched = failure[matched - 1]
+        if sequence[idx] == sequence[matched]:
+            matched += 1
+        failure[idx] = matched
+
+    matched = 0
+    for idx, word in enumerate(word_list):
+        while matched and word != sequence[matched]:
+            matched = failure[matched - 1]
+        if word == sequence[matched]:
+            matched += 1
+        if matched == n_sequence:
+            yield idx - n_sequence + 1
+            matched = failure[matched - 1]
@@ -0,0 +1,64 @@
+import time
+
+
+class FormStateCache():
+    """Cache for the hidden ASP.NET form fields (__VIEWSTATE,
+       __EVENTVALIDATION, __dnnVariable, ...) of a form page. One
+       instance is shared by all spiders of a process, so follow-up
+       queries can POST without downloading the form page first.
+    """
+    DEFAULT_TTL = 600
+
+    def __init__(self, ttl: float = DEFAULT_TTL):
+        self._states = {}
+        self.set_ttl(ttl)
+
+    def set_ttl(self, ttl: float):
+        """Set the time to live of cached form states
+
+        Args:
+            ttl (float): Seconds a form state is reused, 0 disables
+                the cache
+        """
+        if ttl < 0:
+            raise ValueError('Time to live has to be positive!')
+
+        self._ttl = ttl
+
+    def get_ttl(self) -> float:
+        return self._ttl
+
+    def get(self, url: str) -> dict:
+        """Get the valid form state of a page
+
+        Args:
+            url (str): Address of the form page
+
+        Returns:
+            dict: Form state or None if not cached or expired
+        """
+        try:
+            timestamp, state = self._states[url]
+        except KeyError:
+            return None
+
+        if time.monotonic() - timestamp >= self._ttl:
+            self.invalidate(url)
+            return None
+
+        return state
+
+    def set(self, url: str, state: dict):
+        self._states[url] = (time.monotonic(), state)
+
+    def invalidate(self, url: str = None):
+        """Remove the form state of a page or, without url, all states
+
+        Args:
+            url (str, optional): Address of the form page.
+                Defaults to None.
+        """
+        if url is None:
+            self._states.clear()
+        else:
+            self._states.pop(url, None)
@@ -5,7 +5,15 @@
 # See documentation in:
 # https://docs.scrapy.org/en/latest/topics/spider-middleware.html
 
+import base64
+import gzip
+import hashlib
+import json
+import os
 from scrapy import signals
+from scrapy.exceptions import IgnoreRequest, NotConfigured
+from scrapy.http import Headers
+from scrapy.responsetypes import responsetypes
 
 
 class PreseeaspiderSpiderMiddleware:
@@ -101,3 +109,134 @@ class PreseeaspiderDownloaderMiddleware:
 
     def spider_opened(self, spider):
         spider.logger.info('Spider opened: %s' % spider.name)
+
+
+def archive_settings(mode: str, path: str) -> dict:
+    """Crawler settings to record into or replay from an HTTP archive
+
+    Args:
+        mode (str): 'record' or 'replay'
+        path (str): Archive file
+
+    Returns:
+        dict: Settings for ASPXTwisterClass or CrawlerPool
+    """
+    middleware = 'preseeapy.preseeaspider.middlewares.RecordReplayDownloaderMiddleware'
+
+    return {'HTTP_ARCHIVE_MODE': mode,
+            'HTTP_ARCHIVE_PATH': path,
+            'DOWNLOADER_MIDDLEWARES': {middleware: 950}}
+
+
+class RecordReplayDownloaderMiddleware:
+    """Record responses into a local archive or serve them from it
+       without network access. Requests are identified by method, url
+       and body, so ASP.NET form POSTs are told apart by their form data.
+
+       Settings:
+           HTTP_ARCHIVE_MODE: 'record' or 'replay'
+           HTTP_ARCHIVE_PATH: gzip compressed JSON lines file
+    """
+    MODES = ['record', 'replay']
+
+    def __init__(self, mode: str, path: str):
+        if mode not in self.MODES:
+            raise ValueError('Unknown archive mode {}! \
+                Available modes: {}'.format(mode, self.MODES))
+
+        self._mode = mode
+        self._path = path
+        self._archive = self.load_archive(path)
+        self._recorded = {}
+
+    @classmethod
+    def from_crawler(cls, crawler):
+        mode = crawler.settings.get('HTTP_ARCHIVE_MODE')
+        if not mode:
+            raise NotConfigured('No HTTP archive mode set')
+
+        s = cls(mode, crawler.settings.get('HTTP_ARCHIVE_PATH'))
+        crawler.signals.connect(s.spider_closed, signal=signals.spider_closed)
+        return s
+
+    @staticmethod
+    def request_key(request) -> str:
+        fingerprint = hashlib.sha1()
+        fingerprint.update(request.method.encode('utf-8'))
+        fingerprint.update(request.url.encode('utf-8'))
+        fingerprint.update(request.body or b'')
+
+        return fingerprint.hexdigest()
+
+    @staticmethod
+    def load_archive(path: str) -> dict:
+        """Read all entries of an archive file
+
+        Args:
+            path (str): Archive file
+
+        Returns:
+            dict: Entries by request key, empty if there is no archive
+        """
+        archive = {}
+        if not os.path.exists(path):
+            return archive
+
+        with gzip.open(path, 'rt', encoding='utf-8') as file:
+            for line in file:
+                entry = json.loads(line)
+                archive[entry['key']] = entry
+
+        return archive
+
+    def process_request(self, request, spider):
+        if self._mode != 'replay':
+            return None
+
+        try:
+            entry = self._archive[self.request_key(request)]
+        except KeyError:
+            raise IgnoreRequest('Not in HTTP archive: {} {}'.format(
+                request.method, request.url))
+
+        headers = Headers({name.encode('latin-1'):
+                           [value.encode('latin-1') for value in values]
+                           for name, values in entry['headers'].items()})
+        body = base64.b64decode(entry['body'])
+        response_class = responsetypes.from_args(headers=headers,
+                                                 url=entry['url'],
+                                                 body=body)
+
+        return response_class(url=entry['url'], status=entry['status'],
+                              headers=headers, body=body, request=request)
+
+    def process_response(self, request, response, spider):
+        if self._mode == 'record':
+            key = self.request_key(request)
+            self._recorded[key] = {
+                'key': key,
+                'url': response.url,
+                'status': response.status,
+                'headers': {name.decode('latin-1'):
+                            [value.decode('latin-1') for value in values]
+                            for name, values in response.headers.items()},
+                'body': base64.b64encode(response.body).decode('ascii'),
+            }
+
+        return response
+
+    def spider_closed(self, spider):
+        if self._mode != 'record' or not self._recorded:
+            return None
+
+        # Other crawls may have recorded into the same archive meanwhile
+        archive = self.load_archive(self._path)
+        archive.update(self._recorded)
+
+        temporary_path = '{}.{}.tmp'.format(self._path, os.getpid())
+        with gzip.open(temporary_path, 'wt', encoding='utf-8') as file:
+            for entry in archive.values():
+                file.write(json.dumps(entry) + '\n')
+        os.replace(temporary_path, self._path)
+        spider.logger.info('Recorded {} responses into {}'.format(
+            len(self._recorded), self._path))
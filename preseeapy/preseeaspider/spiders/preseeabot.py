@@ -1,8 +1,8 @@
 # -*- coding: utf-8 -*-
-import json
 import scrapy
 import re
-from scrapy.shell import inspect_response
+from ..formstate import FormStateCache
+from ...CorpusSchema import CorpusSchema
 
 
 class PreseeabotSpider(scrapy.Spider):
@@ -14,20 +14,49 @@ class PreseeabotSpider(scrapy.Spider):
     allowed_domains = ['preseea.linguas.net']
     start_urls = ['https://preseea.linguas.net/Corpus.aspx']
 
+    # ASP.NET form state shared by all spider runs of a process
+    form_state_cache = FormStateCache()
+    FORM_STATE_ERRORS = ["Validation of viewstate MAC failed",
+                         "Invalid postback or callback argument",
+                         "The state information is invalid"]
+    # Features of preseea.json with precomputed form keys
+    schema = CorpusSchema.shared()
+    # Result pages requested at the same time
+    MAX_CONCURRENT_PAGES = 4
+
+    # Patterns to strip markup from a phrase, compiled once
+    TAG_PATTERN = re.compile(r'\<.*?\>')
+    ESCAPED_TAG_PATTERN = re.compile(r'&lt.*?&gt;')
+
     def __init__(self,
                  filter_parameters: dict):
         super().__init__()
 
-        # Open PRESEEA configuration file
-        with open('preseeapy/preseea.json', 'r') as file:
-            self._feature_dict = json.load(file)
-
         self._search_phrase = filter_parameters["phrase"]
+        self._match_end = "{}</span>".format(self._search_phrase)
         self._city_key = self.map_to_city_key(filter_parameters["city"])
         self._gender_key = self.map_to_gender_key(filter_parameters["gender"])
         self._education_key = self.map_to_education_key(filter_parameters["education"])
         self._age_key = self.map_to_age_key(filter_parameters["age"])
 
+        # Result pages are yielded in order, later pages wait here
+        self._max_concurrent_pages = self.MAX_CONCURRENT_PAGES
+        self._page_count = 1
+        self._next_page_request = 1
+        self._next_page_result = 1
+        self._page_buffer = {}
+
+    @classmethod
+    def from_crawler(cls, crawler, *args, **kwargs):
+        spider = super().from_crawler(crawler, *args, **kwargs)
+        ttl = crawler.settings.getfloat('FORM_STATE_TTL',
+                                        FormStateCache.DEFAULT_TTL)
+        spider.form_state_cache.set_ttl(ttl)
+        spider._max_concurrent_pages = crawler.settings.getint(
+            'MAX_CONCURRENT_PAGES', cls.MAX_CONCURRENT_PAGES)
+
+        return spider
+
     def map_to_city_key(self, city: str) -> str:
         """Map a city or location class to the correct key for the PRESEEA webpage
 
@@ -38,22 +67,11 @@ class PreseeabotSpider(scrapy.Spider):
         Returns:
             str: City/Location class key in the HTML webpage
         """
-        cities_dict = self._feature_dict['City']
         try:
-            if city != "all":
-                city_class_number = cities_dict[city]
-            else:
-                city_class_number = 0
+            return self.schema.get_form_key('City', city)
         except KeyError as e:
             raise KeyError(e)
 
-        # Create city class from correctly listed
-        # configuration file preseea.json
-        default_city_class_string = "dnn$ctr520$TranscriptionQuery$chkFtCity$"
-        city_class = default_city_class_string + str(city_class_number)
-
-        return city_class
-
     def map_to_gender_key(self, gender: str) -> str:
         """Map a gender class to the correct key for the PRESEEA webpage
 
@@ -63,18 +81,12 @@ class PreseeabotSpider(scrapy.Spider):
         Returns:
             str: Gender class key in the HTML webpage
         """
-        if gender == 'Hombre':
-            gender_class = "dnn$ctr520$TranscriptionQuery$chkFtSex$1"
-        elif gender == 'Mujer':
-            gender_class = "dnn$ctr520$TranscriptionQuery$chkFtSex$2"
-        elif gender == 'all':
-            gender_class = "dnn$ctr520$TranscriptionQuery$chkFtSex$0"
-        else:
+        try:
+            return self.schema.get_form_key('Gender', gender)
+        except KeyError:
             raise ValueError('Unkown gender class {}! \
                 Available classes: Hombre, Mujer.'.format(gender))
 
-        return gender_class
-
     def map_to_age_key(self, age: str) -> str:
         """Map an age class to the correct key for the PRESEEA webpage
 
@@ -84,21 +96,12 @@ class PreseeabotSpider(scrapy.Spider):
         Returns:
             str: Age class key in HTML webpage
         """
-
-        if age == 'Grupo 1':
-            age_class = "dnn$ctr520$TranscriptionQuery$chkFtAgeGroup$1"
-        elif age == 'Grupo 2':
-            age_class = "dnn$ctr520$TranscriptionQuery$chkFtAgeGroup$2"
-        elif age == 'Grupo 3':
-            age_class = "dnn$ctr520$TranscriptionQuery$chkFtAgeGroup$3"
-        elif age == 'all':
-            age_class = "dnn$ctr520$TranscriptionQuery$chkFtAgeGroup$0"
-        else:
+        try:
+            return self.schema.get_form_key('Age', age)
+        except KeyError:
             raise ValueError('Unkown age class! \
                 Available classes: Grupo 1, Grupo 2, Grupo 2.')
 
-        return age_class
-
     def map_to_education_key(self, education: str) -> str:
         """Map an education class to the correct key for the PRESEEA webpage
 
@@ -108,29 +111,169 @@ class PreseeabotSpider(scrapy.Spider):
         Returns:
             str: Education class key in HTML webpage
         """
-
-        if education == 'Alto':
-            education_class = "dnn$ctr520$TranscriptionQuery$chkFtStudyLevel$1"
-        elif education == 'Medio':
-            education_class = "dnn$ctr520$TranscriptionQuery$chkFtStudyLevel$2"
-        elif education == 'Bajo':
-            education_class = "dnn$ctr520$TranscriptionQuery$chkFtStudyLevel$3"
-        elif education == 'all':
-            education_class = "dnn$ctr520$TranscriptionQuery$chkFtStudyLevel$0"
-        else:
+        try:
+            return self.schema.get_form_key('Education', education)
+        except KeyError:
             raise ValueError('Unkown education class! \
                 Available classes: Alto, Medio, Bajo.')
 
-        return education_class
-
     def start_requests(self):
-        """POST ASP.NET request with form data
+        """POST ASP.NET request with form data. The form page is only
+           requested if no valid form state is cached.
 
         Yields:
             [scrapy.Request]: Request object to parse form response data
         """
-        yield scrapy.Request(url=self.start_urls[0],
-                             callback=self.parse_form)
+        form_state = self.form_state_cache.get(self.start_urls[0])
+        if form_state is None:
+            yield self._form_page_request()
+        else:
+            yield self._search_request(form_state,
+                                       meta={'cached_form_state': True,
+                                             'handle_httpstatus_all': True})
+
+    def _form_page_request(self) -> scrapy.Request:
+        return scrapy.Request(url=self.start_urls[0],
+                              callback=self.parse_form,
+                              dont_filter=True)
+
+    def _search_request(self, form_state: dict,
+                        meta: dict = None) -> scrapy.FormRequest:
+        """Create the search POST request from a form state
+
+        Args:
+            form_state (dict): Hidden form fields and cookies of the form page
+            meta (dict, optional): Request meta data. Defaults to None.
+
+        Returns:
+            scrapy.FormRequest: Search request
+        """
+        meta = dict(meta or {})
+        meta['form_state'] = form_state
+
+        return scrapy.FormRequest(url=self.start_urls[0],
+                                  formdata=self._build_formdata(form_state),
+                                  cookies=form_state['cookies'],
+                                  meta=meta,
+                                  callback=self.parse_results,
+                                  dont_filter=True)
+
+    def _page_request(self, form_state: dict,
+                      page_index: int) -> scrapy.FormRequest:
+        """Create the POST request for a further result page
+
+        Args:
+            form_state (dict): Form state of the first result page
+            page_index (int): 0-indexed page of the pager
+
+        Returns:
+            scrapy.FormRequest: Result page request
+        """
+        formdata = self._build_formdata(form_state)
+        formdata["dnn$ctr520$TranscriptionQuery$hdnShowPagerResults"] = "true"
+        formdata["dnn$ctr520$TranscriptionQuery$hdnPagerIndex"] = str(page_index)
+
+        return scrapy.FormRequest(url=self.start_urls[0],
+                                  formdata=formdata,
+                                  cookies=form_state['cookies'],
+                                  meta={'page_index': page_index},
+                                  callback=self.parse_results,
+                                  errback=self._page_failed,
+                                  dont_filter=True)
+
+    def _update_form_state(self, form_state: dict, response) -> dict:
+        """Take the state fields of a response over into a form state,
+           since a postback has to send the state of its own page
+
+        Args:
+            form_state (dict): Form state the response was requested with
+            response (scrapy.http.Response): Result page
+
+        Returns:
+            dict: Form state of the result page
+        """
+        page_state = dict(form_state)
+        for name in ["__EVENTTARGET", "__EVENTARGUMENT", "__VIEWSTATE",
+                     "__VIEWSTATEGENERATOR", "__VIEWSTATEENCRYPTED",
+                     "__EVENTVALIDATION"]:
+            value = response.css('input[name="{}"]::attr(value)'.format(name)).get()
+            if value is not None:
+                page_state[name] = value
+
+        return page_state
+
+    def _get_page_count(self, phrase_table) -> int:
+        """Read the number of result pages from the pager rows of the grid
+
+        Args:
+            phrase_table (scrapy.selector.SelectorList): Result grid
+
+        Returns:
+            int: Number of result pages
+        """
+        page_numbers = [1]
+        for row in phrase_table.css("tr"):
+            if row.css("span[id*=TextMatch]"):
+                continue
+            for text in row.css("a::text, span::text").extract():
+                if text.strip().isdigit():
+                    page_numbers.append(int(text))
+
+        return max(page_numbers)
+
+    def _next_page_requests(self, form_state: dict):
+        """Request further result pages until max concurrent pages
+           are pending
+
+        Yields:
+            [scrapy.FormRequest]: Result page requests
+        """
+        n_pending = self._next_page_request - self._next_page_result \
+            - len(self._page_buffer)
+        while self._next_page_request < self._page_count and \
+                n_pending < self._max_concurrent_pages:
+            yield self._page_request(form_state, self._next_page_request)
+            self._next_page_request += 1
+            n_pending += 1
+
+    def _flush_pages(self, page_index: int, records: list):
+        """Yield the records of all pages which are complete in order
+
+        Args:
+            page_index (int): 0-indexed page of the records
+            records (list): Records of that page
+
+        Yields:
+            dict: Records in result order
+        """
+        self._page_buffer[page_index] = records
+        while self._next_page_result in self._page_buffer:
+            yield from self._page_buffer.pop(self._next_page_result)
+            self._next_page_result += 1
+
+    def _page_failed(self, failure):
+        page_index = failure.request.meta['page_index']
+        self.logger.error('Result page {} failed: {}'.format(page_index,
+                                                             failure.value))
+
+        # Let the following pages through and keep requesting the rest
+        yield from self._flush_pages(page_index, [])
+        yield from self._next_page_requests(self._page_form_state)
+
+    def _is_form_state_rejected(self, response) -> bool:
+        """Check if the server refused the posted form state
+
+        Args:
+            response (scrapy.http.Response): Response of a search request
+
+        Returns:
+            bool: Form state has to be requested again
+        """
+        if response.status >= 400:
+            return True
+
+        body = response.text
+        return any(error in body for error in self.FORM_STATE_ERRORS)
 
     def cut_begin(self, phrase: str) -> str:
         """Cut the beginning of a phrases' unnecessary characters
@@ -154,42 +297,89 @@ class PreseeabotSpider(scrapy.Spider):
         return phrase
 
     def parse_results(self, response):
+        if response.meta.get('cached_form_state') and \
+                self._is_form_state_rejected(response):
+            # Outdated form state, start over with the form page
+            self.form_state_cache.invalidate(self.start_urls[0])
+            yield self._form_page_request()
+            return None
+
+        page_index = response.meta.get('page_index', 0)
+        records = list(self._parse_page(response))
+
+        if page_index == 0:
+            # First page is yielded at once, further pages are requested
+            phrase_table = response.css("table.preseea_grid")
+            self._page_count = self._get_page_count(phrase_table)
+            self._page_form_state = self._update_form_state(
+                response.meta.get('form_state'), response)
+            yield from records
+        else:
+            yield from self._flush_pages(page_index, records)
+
+        yield from self._next_page_requests(self._page_form_state)
+
+    def _parse_page(self, response):
+        """Parse the records of a single result page. Every row of the
+           grid is visited once.
+
+        Yields:
+            dict: Phrase with label, date and country
+        """
         # Get table of responses from POST response
         phrase_table = response.css("table.preseea_grid")
 
-        phrase_list = phrase_table.css("tr span").extract()
-        phrase_list = [element for element in phrase_list if ('<span id=' and 'TextMatch') in element]
+        for row in phrase_table.css("tr"):
+            record = self._parse_row(row)
+            if record is not None:
+                yield record
+
+    def _parse_row(self, row) -> dict:
+        """Extract label, text, date and country of a grid row together
+
+        Args:
+            row (scrapy.Selector): Table row of the result grid
+
+        Returns:
+            dict: Record or None for header and pager rows
+        """
+        match_list = row.css("span[id*=TextMatch]").extract()
+        cell_list = row.css("td").extract()
+        if not match_list or len(cell_list) < 4:
+            return None
 
-        NUM_ELEMENTS_PER_ITEM = 5
+        label = cell_list[0].split(")\">", 2)[1].partition("</a>")[0]
+        date = cell_list[2].split("px;\">", 2)[1].partition("</td>")[0]
+        country = cell_list[3].split("<td>", 2)[1].partition("</td>")[0]
 
-        # Iterate each table response
-        for idx, phrase in enumerate(phrase_list):
-            phrase = phrase.split("TextMatch")[1]
+        return {
+            'label': label,
+            'text': self._clean_phrase(match_list[0]),
+            'date': date,
+            'country': country,
+        }
 
-            if(self._search_phrase != " "):
-                phrase = phrase.split("<span")[0]  + " {} ".format(self._search_phrase) + phrase.split("{}</span>".format(self._search_phrase))[1]
-                phrase = re.sub(r'\<.*?\>', '', phrase)
-                phrase = re.sub(r'&lt.*?&gt;', '', phrase)
-                # phrase = self.cut_end(phrase)
+    def _clean_phrase(self, phrase: str) -> str:
+        """Turn the matching span of a row into the plain phrase
 
-                phrase = self.cut_begin(phrase)
-                # phrase = phrase.split('<')[0]
-                # phrase = phrase.split('&lt')[0]
-            else:
-                phrase = phrase# .split("<span")[0]
+        Args:
+            phrase (str): HTML of the TextMatch span
 
-            date_info = phrase_table.css("tr td").extract()[2 + idx*NUM_ELEMENTS_PER_ITEM]
-            country_info = phrase_table.css("tr td").extract()[3 + idx*NUM_ELEMENTS_PER_ITEM]
+        Returns:
+            str: Phrase of interest
+        """
+        phrase = phrase.split("TextMatch", 2)[1]
 
-            label = phrase_table.css("tr td").extract()[0 + idx*NUM_ELEMENTS_PER_ITEM]
-            label = label.split(")\">")[1].split("</a>")[0]
+        if self._search_phrase != " ":
+            phrase = phrase.partition("<span")[0] \
+                + " {} ".format(self._search_phrase) \
+                + phrase.split(self._match_end, 2)[1]
+            phrase = self.TAG_PATTERN.sub('', phrase)
+            phrase = self.ESCAPED_TAG_PATTERN.sub('', phrase)
 
-            yield {
-                'label': label,
-                'text': phrase,
-                'date': date_info.split("px;\">")[1].split('</td>')[0],
-                'country': country_info.split("<td>")[1].split('</td>')[0],
-            }
+            phrase = self.cut_begin(phrase)
+
+        return phrase
 
     def _prepare_DNN(self, dnn_string: str) -> dict:
         """Prepare a DNN for PRESEEA webpage
@@ -217,12 +407,46 @@ class PreseeabotSpider(scrapy.Spider):
         except KeyError as e:
             return None
 
-        # Set up form with generative keys
-        formdata = self._create_formdata(input_element_list)
+        # Keep the form state for the following queries
+        form_state = self._extract_form_state(input_element_list)
+        form_state['cookies'] = self._extract_cookies(response)
+        self.form_state_cache.set(self.start_urls[0], form_state)
+
+        yield self._search_request(form_state)
+
+    def _extract_cookies(self, response) -> dict:
+        cookies = {}
+        for header in response.headers.getlist('Set-Cookie'):
+            cookie = header.decode('latin-1').split(';')[0]
+            if '=' in cookie:
+                name, value = cookie.split('=', 1)
+                cookies[name.strip()] = value
+
+        return cookies
+
+    def _extract_form_state(self, element_list) -> dict:
+        """Extract the ASP.NET state fields from the input elements
+           of the form page
 
-        yield scrapy.FormRequest(url=self.start_urls[0],
-                                 formdata=formdata,
-                                 callback=self.parse_results)
+        Args:
+            element_list (list): List of input elements for POST
+
+        Returns:
+            dict: Form state independent of the search filters
+        """
+        form_state = {"StylesheetManager_TSSM": element_list[2],
+                      "__EVENTTARGET": element_list[3],
+                      "__EVENTARGUMENT": element_list[4],
+                      "__VIEWSTATE": element_list[5],
+                      "__VIEWSTATEGENERATOR": element_list[6],
+                      "__VIEWSTATEENCRYPTED": element_list[7],
+                      "__EVENTVALIDATION": element_list[8],
+                      "SEARCH": element_list[9],
+                      "SHOW": element_list[11],
+                      "__dnnVariable": self._prepare_DNN(element_list[12]),
+                      "cookies": {}}
+
+        return form_state
 
     def _create_formdata(self, element_list) -> dict:
         """Create an ASPX form for the PRESEEA POST request
@@ -230,29 +454,31 @@ class PreseeabotSpider(scrapy.Spider):
         Args:
             element_list (list): List of input elements for POST
 
+        Returns:
+            dict: Necessary aspx form data for POST
+        """
+        return self._build_formdata(self._extract_form_state(element_list))
+
+    def _build_formdata(self, form_state: dict) -> dict:
+        """Create an ASPX form for the PRESEEA POST request from
+           a form state
+
+        Args:
+            form_state (dict): Form state of the form page
+
         Returns:
             dict: Necessary aspx form data for POST
         """
         ScriptManager_TSM = ";;System.Web.Extensions, Version=3.5.0.0, Culture=neutral, PublicKeyToken=31bf3856ad364e35:en:16997a38-7253-4f67-80d9-0cbcc01b3057:ea597d4b:b25378d2"
-        StylesheetManager_TSSM = element_list[2]
-        EVENTTARGET = element_list[3]
-        EVENTARGUMENT = element_list[4]
-        VIEWSTATE = element_list[5]
-        VIEWSTATEGENERATOR = element_list[6]
-        VIEWSTATEENCRYPTED = element_list[7]
-        EVENTVALIDATION = element_list[8]
-        SEARCH = element_list[9]
-        SHOW = element_list[11]
-        DNN = self._prepare_DNN(element_list[12])
-
-        formdata = {"StylesheetManager_TSSM": StylesheetManager_TSSM,
+
+        formdata = {"StylesheetManager_TSSM": form_state["StylesheetManager_TSSM"],
                     "ScriptManager_TSM": ScriptManager_TSM,
-                    "__EVENTTARGET": EVENTTARGET,
-                    "__EVENTARGUMENT": EVENTARGUMENT,
-                    "__VIEWSTATE": VIEWSTATE,
-                    "__VIEWSTATEGENERATOR": VIEWSTATEGENERATOR,
-                    "__VIEWSTATEENCRYPTED": VIEWSTATEENCRYPTED,
-                    "__EVENTVALIDATION": EVENTVALIDATION,
+                    "__EVENTTARGET": form_state["__EVENTTARGET"],
+                    "__EVENTARGUMENT": form_state["__EVENTARGUMENT"],
+                    "__VIEWSTATE": form_state["__VIEWSTATE"],
+                    "__VIEWSTATEGENERATOR": form_state["__VIEWSTATEGENERATOR"],
+                    "__VIEWSTATEENCRYPTED": form_state["__VIEWSTATEENCRYPTED"],
+                    "__EVENTVALIDATION": form_state["__EVENTVALIDATION"],
                     "dnn$ctr520$TranscriptionQuery$txtFirstname": self.FIRST_NAME,
                     "dnn$ctr520$TranscriptionQuery$txtSurname": self.SURNAME,
                     "dnn$ctr520$TranscriptionQuery$txtInstitution": self.INSTITUTION,
@@ -261,13 +487,13 @@ class PreseeabotSpider(scrapy.Spider):
                     self._age_key: "on",
                     self._education_key: "on",
                     "dnn$ctr520$TranscriptionQuery$txtFtValue": self._search_phrase,
-                    "dnn$ctr520$TranscriptionQuery$btnFtSearch": SEARCH,
+                    "dnn$ctr520$TranscriptionQuery$btnFtSearch": form_state["SEARCH"],
                     "dnn$ctr520$TranscriptionQuery$hdnShowPagerResults": "",
                     "dnn$ctr520$TranscriptionQuery$hdnPagerIndex": "",
                     "dnn$ctr520$TranscriptionQuery$summary1$txtValidatorHack": "",
-                    "dnn$ctr520$TranscriptionQuery$summary1$hdnReShow": SHOW,
+                    "dnn$ctr520$TranscriptionQuery$summary1$hdnReShow": form_state["SHOW"],
                     "ScrollTop": "536",
-                    "__dnnVariable": DNN}
+                    "__dnnVariable": form_state["__dnnVariable"]}
 
         # if self._search_phrase != "":
         #     formdata["dnn$ctr520$TranscriptionQuery$txtFtValue"] = self._search_phrase
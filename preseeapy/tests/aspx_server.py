@@ -0,0 +1,169 @@
+"""Local stand-in for the PRESEEA Corpus.aspx page.
+
+GET requests are answered with the search form and its hidden ASP.NET
+fields, POST requests with a preseea_grid of synthetic rows. Results are
+split into pages of page_size rows; hdnPagerIndex selects the page.
+"""
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs
+from preseeapy.preseeaspider.spiders.preseeabot import PreseeabotSpider
+from preseeapy.tests import synthetic
+
+PHRASE_FIELD = "dnn$ctr520$TranscriptionQuery$txtFtValue"
+PAGER_FIELD = "dnn$ctr520$TranscriptionQuery$hdnPagerIndex"
+
+
+class _CorpusHandler(BaseHTTPRequestHandler):
+    def do_GET(self):
+        self.server.stand_in.count_request()
+        self._send(synthetic.build_form_page())
+
+    def do_POST(self):
+        stand_in = self.server.stand_in
+        stand_in.count_request()
+
+        length = int(self.headers.get('Content-Length', 0))
+        form = parse_qs(self.rfile.read(length).decode('utf-8'),
+                        keep_blank_values=True)
+        phrase = form.get(PHRASE_FIELD, [" "])[0]
+        page_index = form.get(PAGER_FIELD, [""])[0]
+        page_index = int(page_index) if page_index.isdigit() else 0
+
+        self._send(stand_in.build_page(phrase, page_index))
+
+    def _send(self, page: str):
+        latency = self.server.stand_in.get_latency()
+        if latency:
+            time.sleep(latency)
+
+        body = page.encode('utf-8')
+        self.send_response(200)
+        self.send_header('Content-Type', 'text/html; charset=utf-8')
+        self.send_header('Content-Length', str(len(body)))
+        self.send_header('Set-Cookie', 'ASP.NET_SessionId=standin; path=/')
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+class AspxStandInServer():
+    """Threaded HTTP server imitating Corpus.aspx on localhost
+
+    Args:
+        n_rows (int, optional): Result rows of every query.
+            Defaults to 100.
+        page_size (int, optional): Rows per result page. Defaults to 50.
+        latency (float, optional): Seconds every response is delayed.
+            Defaults to 0.
+        port (int, optional): Port to listen on, 0 picks a free one.
+            Defaults to 0.
+    """
+    def __init__(self, n_rows: int = 100, page_size: int = 50,
+                 latency: float = 0, port: int = 0):
+        if page_size < 1:
+            raise ValueError('Page size has to be positive!')
+
+        self._n_rows = n_rows
+        self._page_size = page_size
+        self._latency = latency
+        self._rows = {}
+        self._lock = threading.Lock()
+        self._n_requests = 0
+
+        self._server = ThreadingHTTPServer(('127.0.0.1', port), _CorpusHandler)
+        self._server.daemon_threads = True
+        self._server.stand_in = self
+        self._thread = None
+
+    def __enter__(self):
+        self.start()
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.stop()
+
+    def start(self):
+        self._thread = threading.Thread(target=self._server.serve_forever,
+                                        daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        self._server.shutdown()
+        self._server.server_close()
+        self._thread.join()
+
+    def get_url(self) -> str:
+        host, port = self._server.server_address
+        return 'http://{}:{}/Corpus.aspx'.format(host, port)
+
+    def get_latency(self) -> float:
+        return self._latency
+
+    def get_page_count(self) -> int:
+        return max(1, -(-self._n_rows // self._page_size))
+
+    def count_request(self):
+        with self._lock:
+            self._n_requests += 1
+
+    def get_number_requests(self) -> int:
+        return self._n_requests
+
+    def reset_number_requests(self):
+        with self._lock:
+            self._n_requests = 0
+
+    def get_rows(self, phrase: str) -> list:
+        """Synthetic rows served for a phrase, the same on every query
+
+        Args:
+            phrase (str): Searched phrase
+
+        Returns:
+            list: Rows as returned by synthetic.build_rows
+        """
+        with self._lock:
+            if phrase not in self._rows:
+                self._rows[phrase] = synthetic.build_rows(self._n_rows, phrase)
+
+        return self._rows[phrase]
+
+    def build_page(self, phrase: str, page_index: int) -> str:
+        begin = page_index * self._page_size
+        rows = self.get_rows(phrase)[begin:begin + self._page_size]
+
+        return synthetic.build_result_page(rows, phrase,
+                                           page_count=self.get_page_count(),
+                                           page_index=page_index)
+
+
+class StandInPreseeabotSpider(PreseeabotSpider):
+    """PreseeabotSpider crawling a stand-in server instead of the
+       PRESEEA page. The address is read from the STAND_IN_URL setting,
+       so the class can be pickled for spawned crawler processes.
+    """
+    allowed_domains = ['127.0.0.1']
+
+    @classmethod
+    def from_crawler(cls, crawler, *args, **kwargs):
+        spider = super().from_crawler(crawler, *args, **kwargs)
+        spider.start_urls = [crawler.settings.get('STAND_IN_URL')]
+
+        return spider
+
+
+def stand_in_settings(url: str, settings: dict = None) -> dict:
+    """Crawler settings for StandInPreseeabotSpider
+
+    Args:
+        url (str): Address returned by AspxStandInServer.get_url
+        settings (dict, optional): Further settings. Defaults to None.
+
+    Returns:
+        dict: Settings for ASPXTwisterClass
+    """
+    return dict(settings or {}, STAND_IN_URL=url)
@@ -0,0 +1,31 @@
+import os
+import scrapy
+
+
+class EchoSpider(scrapy.Spider):
+    """Offline spider returning its filter phrase as item, repeated
+       by the optional 'repeat' filter
+    """
+    name = 'echo'
+
+    def __init__(self, filter_parameters: dict):
+        super().__init__()
+        self._phrase = filter_parameters['phrase']
+        self._repeat = int(filter_parameters.get('repeat', 1))
+
+    def start_requests(self):
+        yield scrapy.Request(url='data:,echo', callback=self.parse)
+
+    def parse(self, response):
+        for _ in range(self._repeat):
+            yield {'text': self._phrase}
+
+
+class CrashSpider(EchoSpider):
+    """EchoSpider whose process exits on the phrase 'crash'"""
+    name = 'crash'
+
+    def parse(self, response):
+        if self._phrase == 'crash':
+            os._exit(1)
+        yield from super().parse(response)
@@ -0,0 +1,188 @@
+"""Synthetic PRESEEA Corpus.aspx pages in the markup the spider parses"""
+import random
+from scrapy.http import HtmlResponse
+from preseeapy.preseeaspider.middlewares import RecordReplayDownloaderMiddleware
+from preseeapy.preseeaspider.spiders.preseeabot import PreseeabotSpider
+
+FORM_INPUTS = [
+    ("dnn$dnnSEARCH$txtSearch", ""),
+    ("dnn$dnnSEARCH$optSite", "S"),
+    ("StylesheetManager_TSSM", ""),
+    ("__EVENTTARGET", ""),
+    ("__EVENTARGUMENT", ""),
+    ("__VIEWSTATE", "/wEPDwUKMTY1NDU2MTA1Mg9kFgJmD2QWAgIBD2QWAgIDD2QWAg"),
+    ("__VIEWSTATEGENERATOR", "CA0B0334"),
+    ("__VIEWSTATEENCRYPTED", ""),
+    ("__EVENTVALIDATION", "/wEWBwL+raDpAgKM54rGBgK7q7GGCAKM54rGBg"),
+    ("dnn$ctr520$TranscriptionQuery$btnFtSearch", "Buscar"),
+    ("dnn$ctr520$TranscriptionQuery$btnFtClear", "Limpiar"),
+    ("dnn$ctr520$TranscriptionQuery$summary1$hdnReShow", "0"),
+    ("__dnnVariable", "`{`__scdoff`:`1`}"),
+]
+
+NO_MATCH = "[ Sin coincidencias de texto ]"
+
+WORDS = ["bueno", "pues", "yo", "que", "sé", "la", "casa", "tienen", "dos",
+         "hablamos", "estaba", "con", "los", "niños", "/", "…", "vosotros",
+         "ustedes", "saben", "cómo", "eso", "decía", "nosotros", "vamos"]
+
+
+def build_form_page(view_state: str = None) -> str:
+    """Form page with the hidden fields of the PRESEEA search form
+
+    Args:
+        view_state (str, optional): Value of __VIEWSTATE. Defaults to None.
+
+    Returns:
+        str: HTML document
+    """
+    inputs = []
+    for name, value in FORM_INPUTS:
+        if name == "__VIEWSTATE" and view_state is not None:
+            value = view_state
+        inputs.append('<input type="hidden" name="{}" id="{}" value="{}" />'
+                      .format(name, name.replace("$", "_"), value))
+
+    return ('<html><body><form method="post" action="Corpus.aspx" id="Form">'
+            '{}</form></body></html>'.format("\n".join(inputs)))
+
+
+def build_rows(n_rows: int, search_phrase: str, seed: int = 0) -> list:
+    """Generate result records of random conversation snippets
+
+    Args:
+        n_rows (int): Number of records
+        search_phrase (str): Phrase contained by each snippet
+        seed (int, optional): Random seed. Defaults to 0.
+
+    Returns:
+        list: List of dictionaries with label, text, date and country
+    """
+    generator = random.Random(seed)
+    rows = []
+    for idx in range(n_rows):
+        lead = " ".join(generator.choice(WORDS) for _ in range(6))
+        follow = " ".join(generator.choice(WORDS) for _ in range(6))
+        label = "MADR_{}{}{}_{:03d}".format(generator.choice("HM"),
+                                             generator.randint(1, 3),
+                                             generator.randint(1, 3),
+                                             idx % 1000)
+        rows.append({'label': label,
+                     'lead': "… " + lead,
+                     'follow': follow + " …",
+                     'date': "20{:02d}-0{}-1{}".format(generator.randint(0, 19),
+                                                      generator.randint(1, 9),
+                                                      generator.randint(0, 9)),
+                     'country': "España"})
+
+    return rows
+
+
+def _build_row(idx: int, row: dict, search_phrase: str) -> str:
+    if search_phrase == " ":
+        text = NO_MATCH
+    else:
+        text = '{} <span class="preseea_match">{}</span> {}'.format(
+            row['lead'], search_phrase, row['follow'])
+
+    return ('<tr class="preseea_grid_row">'
+            '<td><a href="javascript:ShowTranscription({idx})">{label}</a></td>'
+            '<td><span id="dnn_ctr520_TranscriptionQuery_grdResults_ctl{idx:02d}_lblTextMatch">{text}</span></td>'
+            '<td style="width:80px;">{date}</td>'
+            '<td>{country}</td>'
+            '<td>Madrid</td></tr>').format(idx=idx, label=row['label'],
+                                           text=text, date=row['date'],
+                                           country=row['country'])
+
+
+def build_result_page(rows: list, search_phrase: str, page_count: int = 1,
+                      page_index: int = 0, view_state: str = None) -> str:
+    """Result page with a preseea_grid table and an optional pager
+
+    Args:
+        rows (list): Records of this page as returned by build_rows
+        search_phrase (str): Searched phrase
+        page_count (int, optional): Pages of the pager. Defaults to 1.
+        page_index (int, optional): 0-indexed current page. Defaults to 0.
+        view_state (str, optional): Value of __VIEWSTATE. Defaults to None.
+
+    Returns:
+        str: HTML document
+    """
+    table = ['<table class="preseea_grid">',
+             '<tr><th>Muestra</th><th>Texto</th><th>Fecha</th>'
+             '<th>País</th><th>Ciudad</th></tr>']
+    table.extend(_build_row(idx, row, search_phrase)
+                 for idx, row in enumerate(rows))
+
+    if page_count > 1:
+        pages = []
+        for number in range(1, page_count + 1):
+            if number == page_index + 1:
+                pages.append('<span>{}</span>'.format(number))
+            else:
+                pages.append('<a href="javascript:ShowPage({})">{}</a>'
+                             .format(number - 1, number))
+        table.append('<tr class="preseea_grid_pager"><td colspan="5">{}</td></tr>'
+                     .format(" ".join(pages)))
+    table.append('</table>')
+
+    form_page = build_form_page(view_state)
+    return form_page.replace('</form>', "\n".join(table) + '</form>')
+
+
+def expected_record(row: dict, search_phrase: str) -> dict:
+    """Record the spider yields for a generated row
+
+    Args:
+        row (dict): Record as returned by build_rows
+        search_phrase (str): Searched phrase
+
+    Returns:
+        dict: Dictionary with label, text, date and country
+    """
+    if search_phrase == " ":
+        text = '">{}</span>'.format(NO_MATCH)
+    else:
+        text = "{}  {}  {}".format(row['lead'], search_phrase, row['follow'])
+
+    return {'label': row['label'], 'text': text,
+            'date': row['date'], 'country': row['country']}
+
+
+def write_archive(path: str, filter_list: list, n_rows: int):
+    """Record a synthetic crawl for every filter into an HTTP archive,
+       as RecordReplayDownloaderMiddleware would have recorded it
+
+    Args:
+        path (str): Archive file
+        filter_list (list): Filter dictionaries of the crawls
+        n_rows (int): Records per result page
+
+    Returns:
+        dict: Generated rows per phrase
+    """
+    recorder = RecordReplayDownloaderMiddleware('record', path)
+    rows = {}
+    for filter_dict in filter_list:
+        spider = PreseeabotSpider(filter_dict)
+        form_request = spider._form_page_request()
+        form_response = HtmlResponse(url=form_request.url,
+                                     body=build_form_page().encode('utf-8'),
+                                     encoding='utf-8', request=form_request)
+        recorder.process_response(form_request, form_response, spider)
+
+        phrase = filter_dict['phrase']
+        rows[phrase] = build_rows(n_rows, phrase)
+        search_request = next(spider.parse_form(form_response))
+        body = build_result_page(rows[phrase], phrase)
+        search_response = HtmlResponse(url=search_request.url,
+                                       body=body.encode('utf-8'),
+                                       encoding='utf-8',
+                                       request=search_request)
+        recorder.process_response(search_request, search_response, spider)
+
+    recorder.spider_closed(spider)
+    PreseeabotSpider.form_state_cache.invalidate()
+
+    return rows
@@ -1,5 +1,8 @@
+import functools
 import unittest
-from preseeapy.ASPXTwister import ASPXTwisterClass
+from preseeapy.ASPXTwister import ASPXTwisterClass, crawl_many, END_OF_STREAM
+from preseeapy.utils import ProcessHandler
+from preseeapy.tests.spiders import EchoSpider
 from preseeapy.preseeaspider.spiders.preseeabot import PreseeabotSpider
 
 
@@ -26,3 +29,32 @@ class TestASPXTwisterClass(unittest.TestCase):
 
         self.assertEqual(object_parameters["filter_1"],
                          self.parameter_dict["filter_1"])
+
+    def test_crawl_many(self):
+        """Test several filters within one reactor run"""
+        parameter_list = [{"phrase": "yo"}, {"phrase": ""},
+                          {"phrase": "ustedes"}]
+        twister = ASPXTwisterClass({}, EchoSpider)
+        attach_function = functools.partial(
+            twister._retrieve_many_subprocess, parameter_list, 2)
+        process_instance = ProcessHandler(attach_function)
+        results = process_instance.get_queue_content()
+        process_instance.close()
+
+        self.assertEqual([[{"text": "yo"}], None, [{"text": "ustedes"}]],
+                         results)
+        self.assertRaises(ValueError, crawl_many,
+                          *(None, EchoSpider, parameter_list, 0))
+
+    def test_stream_phrase_data(self):
+        """Test streamed results arrive in bounded chunks"""
+        twister = ASPXTwisterClass({"phrase": "yo", "repeat": "5"},
+                                   EchoSpider)
+        attach_function = functools.partial(
+            twister._stream_phrase_data_subprocess, 2)
+        process_instance = ProcessHandler(attach_function, 1)
+        chunks = list(process_instance.iter_queue_content(END_OF_STREAM))
+        process_instance.close()
+
+        self.assertEqual([2, 2, 1], [len(chunk) for chunk in chunks])
+        self.assertEqual({"text": "yo"}, chunks[-1][0])
@@ -0,0 +1,119 @@
+import unittest
+import numpy as np
+from preseeapy.BatchAnalyser import (BatchAnalyser, analyse_parallel,
+                                     get_number_workers)
+from preseeapy.VerbClassifier import VerbClassifier
+from preseeapy.Pronoun import Pronoun
+from preseeapy.tests import synthetic
+
+
+def analyse_samples(text_list: list, search_phrase: str) -> tuple:
+    """Sample by sample analysis of PRESEEA.analyse_verbs before the
+       batch analysis
+    """
+    leading, following, unmatch = [], [], []
+    classfier = VerbClassifier("")
+    pp_key = Pronoun().get_pronoun_key(search_phrase)
+    for text in text_list:
+        classfier.set_phrase(text)
+        lead, follow = classfier.get_environment_verbs(search_phrase)
+        leading.append(lead)
+        following.append(follow)
+        if pp_key is None or (not lead[pp_key] and not follow[pp_key]):
+            unmatch.append(True)
+        else:
+            unmatch.append(False)
+
+    return leading, following, unmatch
+
+
+class TestBatchAnalyserClass(unittest.TestCase):
+    def setUp(self):
+        self.text_list = [
+            '… o sea yo les diría a los americanos /   ustedes  tienen dos bases ¿quieren veinte? / veinte …',
+            '… sé dónde / y les decía  ¡pero bueno! ¿ ustedes  saben el mal que están haciendo / con la …',
+            '… unos coches o un yate o yo que sé cosas /  ustedes  se están repartiendo el dinero // ustedes / …\t',
+            '… cele  cómo suelen celebrar  ustedes  la  Navidad?   I: …',
+            'ustedes',
+            'ustedes saben']
+
+    def test_analyse(self):
+        analyser = BatchAnalyser('ustedes ')
+        result = analyser.analyse(self.text_list)
+        lead, follow = analyser.get_verb_lists()
+
+        self.assertEqual(['suelen'], lead[3]['3ps_pl'])
+        self.assertEqual(['tienen'], follow[0]['3ps_pl'])
+        self.assertEqual((6, 6), result['Leading counts'].shape)
+        self.assertEqual(1, result['Following counts'][0, 5])
+        self.assertEqual([False, False, False, False, True, False],
+                         result['Unmatch'].tolist())
+
+    def test_equivalence(self):
+        """Batch and sample by sample analysis give the same results"""
+        for phrase in ['ustedes ', 'yo ', 'se ', 'nosotros ']:
+            rows = synthetic.build_rows(300, phrase, seed=len(phrase))
+            text_list = [synthetic.expected_record(row, phrase)['text']
+                         for row in rows]
+            if phrase == 'ustedes ':
+                text_list += self.text_list
+
+            analyser = BatchAnalyser(phrase)
+            result = analyser.analyse(text_list)
+            lead, follow = analyser.get_verb_lists()
+            expected = analyse_samples(text_list, phrase)
+
+            self.assertEqual(expected[0], lead)
+            self.assertEqual(expected[1], follow)
+            self.assertEqual(expected[2], result['Unmatch'].tolist())
+
+            counts = [[len(verbs[key]) for key in analyser.get_verb_classes()]
+                      for verbs in expected[0]]
+            np.testing.assert_array_equal(counts, result['Leading counts'])
+
+    def test_phrase_sequence(self):
+        """Several search words are matched as a sequence per sample"""
+        text_list = ['yo creo que tienen razón', 'creo tienen que yo creo',
+                     'nosotros vamos yo creo', 'yo creo']
+        analyser = BatchAnalyser('yo creo')
+        result = analyser.analyse(text_list)
+        lead, follow = analyser.get_verb_lists()
+
+        self.assertEqual(analyse_samples(text_list, 'yo creo')[:2],
+                         (lead, follow))
+        self.assertEqual(['tienen'], follow[0]['3ps_pl'])
+        self.assertEqual(['vamos'], lead[2]['1ps_pl'])
+        self.assertEqual(0, result['Following counts'][2:].sum())
+
+    def test_missing_phrase(self):
+        analyser = BatchAnalyser('ustedes ')
+        result = analyser.analyse(['yo tengo', ''])
+
+        self.assertEqual([True, True], result['Unmatch'].tolist())
+        self.assertEqual(0, result['Following counts'].sum())
+        self.assertRaises(ValueError, BatchAnalyser('yo ').get_verb_lists)
+
+    def test_analyse_parallel(self):
+        """Chunks analysed on a process pool are merged in order"""
+        rows = synthetic.build_rows(200, 'ustedes ')
+        text_list = [synthetic.expected_record(row, 'ustedes ')['text']
+                     for row in rows] + self.text_list
+
+        serial = analyse_parallel(text_list, 'ustedes ', 1)
+        parallel = analyse_parallel(text_list, 'ustedes ', 2)
+
+        self.assertEqual(serial[1:], parallel[1:])
+        for key in serial[0]:
+            np.testing.assert_array_equal(serial[0][key], parallel[0][key])
+
+        self.assertEqual(([], []), analyse_parallel([], 'ustedes ', 2)[1:])
+        self.assertRaises(ValueError, analyse_parallel, text_list,
+                          'ustedes ', 0)
+
+    def test_get_number_workers(self):
+        self.assertEqual(1, get_number_workers(100))
+        self.assertGreaterEqual(get_number_workers(10**6), 1)
+
+
+if __name__ == '__main__':
+    unittest.main()
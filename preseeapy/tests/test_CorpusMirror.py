@@ -0,0 +1,106 @@
+import os
+import shutil
+import tempfile
+import unittest
+import mock
+from preseeapy.PRESEEA import PRESEEA
+from preseeapy.CorpusMirror import CorpusMirror
+from preseeapy.CorpusSchema import CorpusSchema
+from preseeapy.SampleCountIndex import ALL_SAMPLES_PHRASE
+from preseeapy.utils import freeze_filter
+
+
+class TestCorpusMirrorClass(unittest.TestCase):
+    def setUp(self):
+        self._directory = tempfile.mkdtemp()
+        self._path = os.path.join(self._directory, 'mirror.sqlite')
+        self.mirror = CorpusMirror(self._path)
+        self.corpus = PRESEEA("test", corpus_mirror=self.mirror)
+        self.labels = {'Madrid': ['MADR_H11_001', 'MADR_M32_002'],
+                       'Lima': ['LIMA_H23_001']}
+        self.crawled = []
+
+    def tearDown(self):
+        self.mirror.close()
+        shutil.rmtree(self._directory)
+
+    def retrieve_many(self, filter_list, concurrency, refresh, cache_only):
+        self.crawled.append([(filter_dict['city'], filter_dict['phrase'])
+                             for filter_dict in filter_list])
+        results = {}
+        for filter_dict in filter_list:
+            labels = self.labels[filter_dict['city']]
+            if filter_dict['phrase'] == ALL_SAMPLES_PHRASE:
+                samples = [{'label': label} for label in labels]
+            else:
+                samples = [{'label': label, 'text': filter_dict['phrase'],
+                            'date': '2000', 'country': 'Spain'}
+                           for label in labels]
+            results[freeze_filter(filter_dict)] = samples
+
+        return results
+
+    def sync(self, phrase_list):
+        with mock.patch.object(self.corpus, 'retrieve_many',
+                               side_effect=self.retrieve_many):
+            return self.corpus.sync_mirror(phrase_list, ['Madrid', 'Lima'])
+
+    def test_sync(self):
+        """Only new phrases and changed cities are crawled again"""
+        self.assertEqual(['Madrid', 'Lima'], self.sync(['yo ']))
+        self.assertEqual([('Madrid', ALL_SAMPLES_PHRASE),
+                          ('Lima', ALL_SAMPLES_PHRASE)], self.crawled[0])
+        self.assertEqual([('Madrid', 'yo '), ('Lima', 'yo ')],
+                         self.crawled[1])
+        self.assertEqual(['Lima', 'Madrid'], self.mirror.get_cities())
+
+        self.crawled = []
+        self.assertEqual([], self.sync(['yo ']))
+        self.assertEqual(1, len(self.crawled))
+
+        self.labels['Lima'].append('LIMA_M11_002')
+        self.crawled = []
+        self.assertEqual(['Madrid', 'Lima'], self.sync(['yo ', 'tú ']))
+        self.assertEqual([('Madrid', 'tú '), ('Lima', 'yo '),
+                          ('Lima', 'tú ')], self.crawled[1])
+        self.assertEqual(2, len(self.mirror.get_samples('Lima', 'tú ')))
+
+    def test_retrieve_phrase_data(self):
+        self.sync(['yo '])
+
+        self.corpus.set_filter('Madrid', 'Mujer', 'all', 'all', 'yo ')
+        with mock.patch("preseeapy.PRESEEA._crawl_phrase_data") as crawl:
+            samples = self.corpus.retrieve_phrase_data(source="local")
+        crawl.assert_not_called()
+        self.assertEqual(['MADR_M32_002'],
+                         [sample['label'] for sample in samples])
+
+        # "all" needs every city of the corpus
+        self.corpus.set_filter('all', 'Hombre', 'all', 'all', 'yo ')
+        self.assertRaises(KeyError, self.corpus.retrieve_phrase_data,
+                          source="local")
+        with mock.patch.object(CorpusSchema.shared(), 'get_values',
+                               return_value=frozenset(self.labels)):
+            samples = self.corpus.retrieve_phrase_data(source="local")
+        self.assertEqual(['LIMA_H23_001', 'MADR_H11_001'],
+                         [sample['label'] for sample in samples])
+
+        self.corpus.set_filter('Madrid', 'all', 'all', 'all', 'tú ')
+        self.assertRaises(KeyError, self.corpus.retrieve_phrase_data,
+                          source="local")
+        self.assertRaises(ValueError, self.corpus.retrieve_phrase_data,
+                          source="web")
+
+        empty_mirror = CorpusMirror(os.path.join(self._directory,
+                                                 'empty.sqlite'))
+        self.assertRaises(KeyError, empty_mirror.query,
+                          self.corpus.get_filter())
+        empty_mirror.close()
+
+        reopened_mirror = CorpusMirror(self._path)
+        self.assertEqual(['yo '], reopened_mirror.get_phrases('Lima'))
+        reopened_mirror.close()
+
+
+if __name__ == '__main__':
+    unittest.main()
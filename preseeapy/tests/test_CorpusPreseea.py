@@ -1,6 +1,13 @@
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
 import unittest
 import mock
 from preseeapy.PRESEEA import PRESEEA
+from preseeapy.utils import freeze_filter
+from preseeapy.ResultCache import ResultCache
 
 
 class TestCorpusPreseeaClass(unittest.TestCase):
@@ -21,6 +28,15 @@ class TestCorpusPreseeaClass(unittest.TestCase):
                       "date": "test",
                       "country": "test"}]
 
+    def test_lazy_import(self):
+        """Crawl machinery and NumPy are not imported with the corpus"""
+        probe = ("import sys, preseeapy.PRESEEA; print(sorted(name for name "
+                 "in ['scrapy', 'twisted', 'numpy'] if name in sys.modules))")
+        output = subprocess.run([sys.executable, '-c', probe], check=True,
+                                capture_output=True, text=True).stdout
+
+        self.assertEqual("[]", output.strip())
+
     def test_get_corpus_name(self):
         self.assertEqual(self.corpus_1.get_corpus_name(), 'PRESEEA')
 
@@ -130,6 +146,83 @@ class TestCorpusPreseeaClass(unittest.TestCase):
         # Test if responded result is empty, since no city is defined
         self.assertEqual([{"test": "test"}], results)
 
+    @mock.patch.multiple("preseeapy.utils.ProcessHandler",
+                         _start_process=mock.DEFAULT, close=mock.DEFAULT,
+                         get_queue_content=mock.Mock(
+                             return_value=[[{"test": "yo"}],
+                                           [{"test": "tú"}]]))
+    def test_retrieve_many(self, **process_patches):
+        """Test the results of a batch query are keyed by filter and
+           duplicated filters are crawled once
+        """
+        filter_list = []
+        for phrase in ["yo", "tú", "yo"]:
+            self.corpus_1.set_filter(city=self._city, gender=self._gender,
+                                     age=self._age,
+                                     education=self._education,
+                                     phrase=phrase)
+            filter_list.append(self.corpus_1.get_filter())
+
+        results = self.corpus_1.retrieve_many(filter_list)
+
+        self.assertEqual(2, len(results))
+        self.assertEqual([{"test": "tú"}],
+                         results[freeze_filter(filter_list[1])])
+
+    @mock.patch("preseeapy.PRESEEA.retrieve_city_info", return_value=54)
+    def test_analyse_verbs(self, city_patch):
+        """Serial and parallel analysis give the same verbs per sample"""
+        samples_list = [{'label': 'MADR_H13_013', 'text': '… o sea yo les diría a los americanos /   ustedes  tienen dos bases', 'date': '2008-02-27', 'country': 'España'},
+                        {'label': 'MADR_H31_037', 'text': '… cele  cómo suelen celebrar  ustedes  la  Navidad?   I: …', 'date': '2009-01-29', 'country': 'España'}]
+        self.corpus_1.set_search_phrase('ustedes ')
+
+        serial_data = self.corpus_1.analyse_verbs(samples_list)
+        parallel_data = self.corpus_1.analyse_verbs(samples_list,
+                                                    parallel=True)
+
+        self.assertEqual(54, serial_data['Total samples'])
+        self.assertEqual(['tienen'], serial_data['Following verbs'][0]['3ps_pl'])
+        self.assertEqual(['suelen'], serial_data['Leading verbs'][1]['3ps_pl'])
+        self.assertEqual(['', ''], serial_data['Unmatch'])
+        self.assertEqual(1, serial_data['Leading counts'][1, 5])
+        for key in ['Leading verbs', 'Following verbs', 'Unmatch']:
+            self.assertEqual(serial_data[key], parallel_data[key])
+
+    @mock.patch("preseeapy.PRESEEA._crawl_phrase_data",
+                return_value=[{"test": "test"}])
+    def test_result_cache(self, crawl_patch):
+        """Test cached phrase data is returned without crawling"""
+        directory = tempfile.mkdtemp()
+        cache = ResultCache(os.path.join(directory, 'results.sqlite'))
+        self.corpus_1.set_result_cache(cache)
+        self.corpus_1.set_filter(city=self._city, gender=self._gender,
+                                 age=self._age, education=self._education,
+                                 phrase=self._phrase)
+
+        self.assertRaises(KeyError, self.corpus_1.retrieve_phrase_data,
+                          **{'cache_only': True})
+        self.corpus_1.retrieve_phrase_data()
+        self.assertEqual([{"test": "test"}],
+                         self.corpus_1.retrieve_phrase_data(cache_only=True))
+        self.assertEqual(1, crawl_patch.call_count)
+
+        self.corpus_1.retrieve_phrase_data(refresh=True)
+        self.assertEqual(2, crawl_patch.call_count)
+
+        cache.close()
+        shutil.rmtree(directory)
+
+    @mock.patch("preseeapy.utils.ProcessHandler.iter_queue_content",
+                return_value=iter([[{"test": "yo"}, {"test": "yo"}],
+                                   [{"test": "yo"}]]))
+    def test_iter_phrase_data(self, queue_content_patch):
+        """Test the streamed chunks are flattened to single samples"""
+        results = list(self.corpus_1.iter_phrase_data(chunk_size=2))
+
+        self.assertEqual(3, len(results))
+        self.assertRaises(ValueError, list,
+                          self.corpus_1.iter_phrase_data(chunk_size=0))
+
     @mock.patch("preseeapy.PRESEEA.retrieve_phrase_data",
                 return_value=[{"test": "test"}, {"test": "test"}])
     def test_get_number_city_samples(self, retrieved_sample_list):
@@ -0,0 +1,71 @@
+import os
+import subprocess
+import sys
+import tempfile
+import unittest
+from preseeapy.CorpusSchema import CorpusSchema
+from preseeapy.PRESEEA import PRESEEA
+
+
+class TestCorpusSchemaClass(unittest.TestCase):
+    def setUp(self):
+        self.schema = CorpusSchema.shared()
+
+    def test_shared(self):
+        self.assertIs(self.schema, CorpusSchema.shared())
+        self.assertIs(self.schema, PRESEEA(author='Test')._schema)
+
+        feature_dict = self.schema.get_feature_dict()
+        self.assertEqual(['Country', 'Gender', 'Age', 'Education', 'City'],
+                         list(feature_dict.keys()))
+
+    def test_load_outside_repository(self):
+        # The packaged file is found from any working directory
+        root = os.path.dirname(os.path.dirname(os.path.dirname(
+            os.path.abspath(__file__))))
+        code = ("from preseeapy.CorpusSchema import CorpusSchema; "
+                "print(len(CorpusSchema.shared().get_all_cities()))")
+        with tempfile.TemporaryDirectory() as directory:
+            env = dict(os.environ, PYTHONPATH=root)
+            output = subprocess.check_output([sys.executable, '-c', code],
+                                             cwd=directory, env=env)
+
+        self.assertEqual(len(self.schema.get_all_cities()),
+                         int(output.decode().strip()))
+
+    def test_is_valid(self):
+        self.assertTrue(self.schema.is_valid('City', 'Madrid'))
+        self.assertTrue(self.schema.is_valid('Gender', 'Mujer'))
+        self.assertTrue(self.schema.is_valid('Age', 'Grupo 3'))
+        self.assertTrue(self.schema.is_valid('Education', 'Bajo'))
+        self.assertFalse(self.schema.is_valid('City', 'all'))
+        self.assertFalse(self.schema.is_valid('Gender', 'Otro'))
+        self.assertIsInstance(self.schema.get_values('Age'), frozenset)
+
+    def test_get_form_key(self):
+        prefix = "dnn$ctr520$TranscriptionQuery$"
+        self.assertEqual(prefix + "chkFtSex$2",
+                         self.schema.get_form_key('Gender', 'Mujer'))
+        self.assertEqual(prefix + "chkFtAgeGroup$0",
+                         self.schema.get_form_key('Age', 'all'))
+        self.assertEqual(prefix + "chkFtStudyLevel$1",
+                         self.schema.get_form_key('Education', 'Alto'))
+        city_number = self.schema.get_feature_dict()['City']['Madrid']
+        self.assertEqual(prefix + "chkFtCity$" + str(city_number),
+                         self.schema.get_form_key('City', 'Madrid'))
+        self.assertRaises(KeyError, self.schema.get_form_key,
+                          'City', 'Berlin')
+
+    def test_cities(self):
+        corpus = PRESEEA(author='Test')
+        countries = corpus.get_corpus_countries()
+        self.assertEqual(self.schema.get_countries(), countries)
+
+        n_cities = sum(corpus.get_number_cities(country)
+                       for country in countries)
+        self.assertEqual(n_cities, corpus.get_number_all_cities())
+        self.assertRaises(KeyError, corpus.get_cities, 'Atlantis')
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,50 @@
+import unittest
+from preseeapy.CrawlerPool import CrawlerPool
+from preseeapy.tests.spiders import EchoSpider, CrashSpider
+
+
+class TestCrawlerPoolClass(unittest.TestCase):
+    def test_number_workers(self):
+        self.assertRaises(ValueError, CrawlerPool, EchoSpider, 0)
+
+    def test_map(self):
+        """Several queries on one pool are returned in submit order and
+           the workers stay alive in between.
+        """
+        parameter_list = [{'phrase': 'yo'}, {'phrase': 'tú'},
+                          {'phrase': ''}, {'phrase': 'usted'}]
+
+        with CrawlerPool(EchoSpider, n_workers=2) as pool:
+            results = pool.map(parameter_list)
+            self.assertTrue(pool.is_alive())
+            self.assertEqual([{'text': 'yo'}], pool.retrieve({'phrase': 'yo'}))
+
+        self.assertEqual([{'text': 'yo'}], results[0])
+        self.assertEqual([{'text': 'tú'}], results[1])
+        # Incomplete filters are not crawled
+        self.assertIsNone(results[2])
+        self.assertEqual([{'text': 'usted'}], results[3])
+        self.assertFalse(pool.is_alive())
+
+    def test_worker_died(self):
+        """The job of a dying worker fails, the others are crawled"""
+        with CrawlerPool(CrashSpider, n_workers=2) as pool:
+            pool.POLL_INTERVAL = 0.1
+            results = pool.map([{'phrase': 'yo'}, {'phrase': 'crash'},
+                                {'phrase': 'tú'}, {'phrase': 'usted'}])
+
+        self.assertEqual([{'text': 'yo'}], results[0])
+        self.assertIsInstance(results[1], RuntimeError)
+        self.assertEqual([{'text': 'tú'}], results[2])
+        self.assertEqual([{'text': 'usted'}], results[3])
+
+    def test_dead_workers(self):
+        """Results of a pool without living workers are not awaited"""
+        with CrawlerPool(EchoSpider, n_workers=1) as pool:
+            pool.POLL_INTERVAL = 0.1
+            for worker in pool._workers:
+                worker.kill()
+                worker.join()
+
+            job_id = pool.submit({'phrase': 'yo'})
+            self.assertRaises(RuntimeError, pool.get_result, job_id)
@@ -0,0 +1,32 @@
+import unittest
+import mock
+from preseeapy.preseeaspider.formstate import FormStateCache
+
+
+class TestFormStateCacheClass(unittest.TestCase):
+    def setUp(self):
+        self.url = 'https://preseea.linguas.net/Corpus.aspx'
+        self.cache = FormStateCache(ttl=10)
+
+    def test_get(self):
+        self.assertIsNone(self.cache.get(self.url))
+
+        self.cache.set(self.url, {'__VIEWSTATE': 'state'})
+        self.assertEqual({'__VIEWSTATE': 'state'}, self.cache.get(self.url))
+
+    @mock.patch("preseeapy.preseeaspider.formstate.time.monotonic")
+    def test_ttl(self, monotonic_patch):
+        monotonic_patch.return_value = 100
+        self.cache.set(self.url, {'__VIEWSTATE': 'state'})
+
+        monotonic_patch.return_value = 109
+        self.assertIsNotNone(self.cache.get(self.url))
+        monotonic_patch.return_value = 110
+        self.assertIsNone(self.cache.get(self.url))
+
+        self.assertRaises(ValueError, self.cache.set_ttl, -1)
+
+    def test_invalidate(self):
+        self.cache.set(self.url, {'__VIEWSTATE': 'state'})
+        self.cache.invalidate(self.url)
+        self.assertIsNone(self.cache.get(self.url))
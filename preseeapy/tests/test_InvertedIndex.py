@@ -0,0 +1,82 @@
+import unittest
+import mock
+from preseeapy.CorpusSchema import CorpusSchema
+from preseeapy.InvertedIndex import InvertedIndex
+from preseeapy.WordClassifier import WordClassifier, iter_sequence
+from preseeapy.QueryPlanner import filter_samples
+from preseeapy.tests import synthetic
+
+
+class TestInvertedIndexClass(unittest.TestCase):
+    def setUp(self):
+        self.index = InvertedIndex()
+        self.samples = {}
+        for city, phrase in [('Madrid', 'ustedes '), ('Madrid', 'yo '),
+                             ('Lima', 'yo ')]:
+            rows = synthetic.build_rows(60, phrase, seed=len(city))
+            sample_list = [synthetic.expected_record(row, phrase)
+                           for row in rows]
+            self.samples[(city, phrase)] = sample_list
+            self.index.add_samples(sample_list, city, phrase)
+
+    def scan(self, phrase: str) -> list:
+        """Brute-force search of all indexed sample texts"""
+        sequence = WordClassifier(phrase).get_word_list()
+        sample_list = [sample for samples in self.samples.values()
+                       for sample in samples]
+        return [idx for idx, sample in enumerate(sample_list)
+                if any(True for _ in iter_sequence(
+                    WordClassifier(sample['text']).get_word_list(),
+                    sequence))]
+
+    def test_get_postings(self):
+        """Postings decode to the word positions"""
+        index = InvertedIndex()
+        index.add_samples([{'label': 'A', 'text': 'yo / yo creo yo'},
+                           {'label': 'B', 'text': 'creo'},
+                           {'label': 'C', 'text': 'pues yo'}],
+                          'Madrid', 'yo ')
+
+        self.assertEqual([(0, 0), (0, 1), (0, 3), (2, 1)],
+                         index.get_postings('yo'))
+        self.assertEqual([(0, 2), (1, 0)], index.get_postings('creo'))
+        self.assertEqual([], index.get_postings('tengo'))
+        self.assertEqual([(0, 1)], index.find('yo creo'))
+        self.assertEqual([(0, 0)], index.find('yo yo'))
+        self.assertEqual([(0, 2)], index.find('creo yo'))
+        self.assertEqual([], index.find('creo pues'))
+        self.assertEqual([], index.find('yo tengo'))
+
+    def test_find(self):
+        for phrase in ['yo ', 'ustedes ', 'saben cómo', 'la casa tienen']:
+            self.assertEqual(self.scan(phrase), sorted(
+                {sample_idx for sample_idx, _ in self.index.find(phrase)}))
+
+    def test_lookup(self):
+        # Only the records crawled for the phrase, not every text with it
+        for (city, phrase), sample_list in self.samples.items():
+            self.assertEqual(sample_list, self.index.lookup(phrase, city))
+
+        self.assertRaises(KeyError, self.index.lookup, 'ustedes ', 'Lima')
+        self.assertRaises(KeyError, self.index.lookup, 'saben cómo',
+                          'Madrid')
+
+    def test_lookup_filters(self):
+        expected = filter_samples(self.samples[('Madrid', 'yo ')],
+                                  'Mujer', 'Grupo 2', 'all')
+
+        self.assertEqual(expected, self.index.query(
+            {'phrase': 'yo ', 'city': 'Madrid', 'gender': 'Mujer',
+             'education': 'all', 'age': 'Grupo 2'}))
+
+        # "all" needs the phrase for every city of the corpus
+        self.assertRaises(KeyError, self.index.lookup, 'yo ')
+        with mock.patch.object(CorpusSchema.shared(), 'get_values',
+                               return_value=frozenset(['Madrid', 'Lima'])):
+            self.assertEqual(len(self.index.lookup('yo ')),
+                             len(self.index.lookup('yo ', 'Madrid')) +
+                             len(self.index.lookup('yo ', 'Lima')))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,31 @@
+import unittest
+from preseeapy.PhraseAutomaton import PhraseAutomaton
+
+
+class TestPhraseAutomatonClass(unittest.TestCase):
+    def setUp(self):
+        self.automaton = PhraseAutomaton([["yo"], ["yo", "creo"],
+                                          ["creo", "que"], ["a", "b", "a"]])
+
+    def test_iter_matches(self):
+        words = ["pues", "yo", "creo", "que", "yo"]
+
+        self.assertEqual([(1, 2, 0), (1, 3, 1), (2, 4, 2), (4, 5, 0)],
+                         list(self.automaton.iter_matches(words)))
+
+    def test_overlapping(self):
+        """Matches overlap and are found through the failure states"""
+        words = ["a", "b", "a", "b", "a", "creo", "que"]
+
+        self.assertEqual([(0, 3, 3), (2, 5, 3), (5, 7, 2)],
+                         list(self.automaton.iter_matches(words)))
+
+    def test_add_phrase(self):
+        self.assertRaises(ValueError, self.automaton.add_phrase, [])
+        self.assertEqual(4, self.automaton.add_phrase(["que"]))
+        self.assertEqual([(0, 2, 2), (1, 2, 4)],
+                         list(self.automaton.iter_matches(["creo", "que"])))
+
+
+if __name__ == '__main__':
+    unittest.main()
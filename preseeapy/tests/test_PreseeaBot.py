@@ -1,5 +1,13 @@
 import unittest
+import mock
+from scrapy.http import HtmlResponse, Request
 from preseeapy.preseeaspider.spiders.preseeabot import PreseeabotSpider
+from preseeapy.ASPXTwister import ASPXTwisterClass
+from preseeapy.utils import ProcessHandler
+from preseeapy.tests import synthetic
+from preseeapy.tests.aspx_server import (AspxStandInServer,
+                                         StandInPreseeabotSpider,
+                                         stand_in_settings)
 
 
 class TestPreseeaBot(unittest.TestCase):
@@ -120,5 +128,166 @@ class TestPreseeaBot(unittest.TestCase):
         # self.assertEqual(None, wrong_input_response)
 
 
+class TestPreseeaBotFormState(unittest.TestCase):
+    def setUp(self):
+        self.spider = PreseeabotSpider({'phrase': 'hago ',
+                                        'city': 'Madrid',
+                                        'gender': 'Mujer',
+                                        'education': 'Alto',
+                                        'age': 'Grupo 1'})
+        self.url = self.spider.start_urls[0]
+        self.form_state = self.spider._extract_form_state(
+            ['', '', 'tssm', '', '', 'viewstate', 'generator', '',
+             'validation', 'Buscar', '', 'show', "{`a`:`b`}"])
+
+    def tearDown(self):
+        self.spider.form_state_cache.invalidate()
+
+    def test_start_requests(self):
+        """Without a cached form state the form page is requested first,
+           afterwards the search is posted directly
+        """
+        request = next(self.spider.start_requests())
+        self.assertEqual('GET', request.method)
+        self.assertEqual(self.spider.parse_form, request.callback)
+
+        self.spider.form_state_cache.set(self.url, self.form_state)
+        request = next(self.spider.start_requests())
+        self.assertEqual('POST', request.method)
+        self.assertEqual(self.spider.parse_results, request.callback)
+        self.assertIn(b'viewstate', request.body)
+
+    def test_rejected_form_state(self):
+        """A refused form state is removed from the cache and the
+           form page is requested again
+        """
+        self.spider.form_state_cache.set(self.url, self.form_state)
+        request = next(self.spider.start_requests())
+        response = HtmlResponse(url=self.url, status=500, body=b'',
+                                request=request)
+
+        retry_request = next(self.spider.parse_results(response))
+
+        self.assertIsNone(self.spider.form_state_cache.get(self.url))
+        self.assertEqual(self.spider.parse_form, retry_request.callback)
+
+
+class TestPreseeaBotPagination(unittest.TestCase):
+    def setUp(self):
+        self._phrase = 'ustedes '
+        self.spider = PreseeabotSpider({'phrase': self._phrase,
+                                        'city': 'Madrid',
+                                        'gender': 'all',
+                                        'education': 'all',
+                                        'age': 'all'})
+        self.spider._max_concurrent_pages = 2
+        self.url = self.spider.start_urls[0]
+        self.rows = synthetic.build_rows(10, self._phrase)
+        self.form_state = self.spider._extract_form_state(
+            [value for _, value in synthetic.FORM_INPUTS])
+
+    def _response(self, request, page_index):
+        body = synthetic.build_result_page(
+            self.rows[page_index*2:(page_index+1)*2], self._phrase,
+            page_count=5, page_index=page_index, view_state='page_state')
+
+        return HtmlResponse(url=self.url, body=body.encode('utf-8'),
+                            encoding='utf-8', request=request)
+
+    def test_parse_page(self):
+        """Rows are parsed into records, header and pager rows skipped"""
+        for phrase in [self._phrase, " "]:
+            self.spider._search_phrase = phrase
+            self.spider._match_end = "{}</span>".format(phrase)
+            body = synthetic.build_result_page(self.rows, phrase, page_count=3)
+            response = HtmlResponse(url=self.url, body=body.encode('utf-8'),
+                                    encoding='utf-8')
+
+            records = list(self.spider._parse_page(response))
+
+            self.assertEqual([synthetic.expected_record(row, phrase)
+                              for row in self.rows], records)
+
+    def test_parse_results(self):
+        """Further pages are requested up to the concurrency limit and
+           their records are yielded in result order
+        """
+        request = self.spider._search_request(self.form_state)
+        output = list(self.spider.parse_results(self._response(request, 0)))
+
+        records = [element for element in output if isinstance(element, dict)]
+        page_requests = [element for element in output
+                         if not isinstance(element, dict)]
+        self.assertEqual(2, len(records))
+        self.assertEqual([1, 2], [page_request.meta['page_index']
+                                  for page_request in page_requests])
+        self.assertIn(b'hdnPagerIndex=1', page_requests[0].body)
+        self.assertIn(b'page_state', page_requests[0].body)
+
+        # Second page arrives first and is held back
+        output = list(self.spider.parse_results(
+            self._response(page_requests[1], 2)))
+        self.assertEqual([], [element for element in output
+                              if isinstance(element, dict)])
+
+        output = list(self.spider.parse_results(
+            self._response(page_requests[0], 1)))
+        records += [element for element in output
+                    if isinstance(element, dict)]
+
+        expected = [synthetic.expected_record(row, self._phrase)
+                    for row in self.rows[:6]]
+        self.assertEqual(expected, records)
+
+    def test_page_failed(self):
+        """Failed pages are skipped and the remaining pages requested"""
+        request = self.spider._search_request(self.form_state)
+        output = list(self.spider.parse_results(self._response(request, 0)))
+        failed_requests = [element for element in output
+                           if not isinstance(element, dict)]
+
+        page_requests = []
+        for failed_request in failed_requests:
+            failure = mock.Mock(request=failed_request, value='timeout')
+            page_requests += list(self.spider._page_failed(failure))
+        self.assertEqual([3, 4], [page_request.meta['page_index']
+                                  for page_request in page_requests])
+
+        records = []
+        for page_request in page_requests:
+            records += list(self.spider.parse_results(self._response(
+                page_request, page_request.meta['page_index'])))
+        self.assertEqual([synthetic.expected_record(row, self._phrase)
+                          for row in self.rows[6:10]], records)
+
+
+class TestPreseeaBotStandIn(unittest.TestCase):
+    def setUp(self):
+        self.server = AspxStandInServer(n_rows=120, page_size=50)
+        self.server.start()
+
+    def tearDown(self):
+        self.server.stop()
+
+    def test_crawl(self):
+        """A paginated crawl against the stand-in server returns every
+           row in result order
+        """
+        filter_dict = {'phrase': 'ustedes ', 'city': 'Madrid',
+                       'gender': 'all', 'education': 'all', 'age': 'all'}
+        twister = ASPXTwisterClass(filter_dict, StandInPreseeabotSpider,
+                                   stand_in_settings(self.server.get_url()))
+        process_instance = ProcessHandler(
+            twister._retrieve_phrase_data_subprocess)
+        results = process_instance.get_queue_content()
+        process_instance.close()
+
+        expected = [synthetic.expected_record(row, 'ustedes ')
+                    for row in self.server.get_rows('ustedes ')]
+        self.assertEqual(expected, results)
+        # Form page, search and two further result pages
+        self.assertEqual(4, self.server.get_number_requests())
+
+
 if __name__ == '__main__':
     unittest.main()
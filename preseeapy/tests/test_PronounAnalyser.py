@@ -0,0 +1,80 @@
+import unittest
+import mock
+import numpy as np
+from preseeapy.PRESEEA import PRESEEA
+from preseeapy.PronounAnalyser import PronounAnalyser
+from preseeapy.BatchAnalyser import BatchAnalyser
+from preseeapy.WordClassifier import WordClassifier
+from preseeapy.utils import freeze_filter
+from preseeapy.tests import synthetic
+
+
+class TestPronounAnalyserClass(unittest.TestCase):
+    def setUp(self):
+        self.text_list = []
+        for phrase in ['ustedes ', 'yo ', 'vosotros ', 'nosotros ']:
+            rows = synthetic.build_rows(100, phrase, seed=len(phrase))
+            self.text_list += [synthetic.expected_record(row, phrase)['text']
+                               for row in rows]
+
+    def test_analyse(self):
+        """One scan gives the statistics of one batch analysis per
+           phrase on the samples containing it
+        """
+        analyser = PronounAnalyser()
+        statistics = analyser.analyse(self.text_list)
+
+        self.assertIn('ellas', statistics)
+        for phrase in ['ustedes', 'yo', 'vosotros', 'nosotros', 'tú']:
+            text_list = [text for text in self.text_list
+                         if phrase in WordClassifier(text).get_word_list()]
+            result = BatchAnalyser(phrase + ' ').analyse(text_list)
+
+            self.assertEqual(len(text_list), statistics[phrase]['Samples'])
+            self.assertEqual(len(text_list),
+                             statistics[phrase]['Occurrences'])
+            np.testing.assert_array_equal(
+                result['Leading counts'].sum(axis=0),
+                statistics[phrase]['Leading counts'])
+            np.testing.assert_array_equal(
+                result['Following counts'].sum(axis=0),
+                statistics[phrase]['Following counts'])
+            self.assertEqual(result['Unmatch'].sum(),
+                             statistics[phrase]['Unmatch'])
+
+    def test_all_occurrences(self):
+        analyser = PronounAnalyser(['yo', 'creo que'], word_range=1,
+                                   first_only=False)
+        statistics = analyser.analyse(['yo creo que yo tengo', 'yo'])
+
+        self.assertEqual(3, statistics['yo']['Occurrences'])
+        self.assertEqual(2, statistics['yo']['Samples'])
+        self.assertEqual(2, statistics['yo']['Following counts'][0])
+        self.assertEqual(1, statistics['yo']['Unmatch'])
+        self.assertEqual(1, statistics['creo que']['Occurrences'])
+        self.assertEqual(1, statistics['creo que']['Unmatch'])
+
+    def test_retrieve_pronoun_data(self):
+        corpus = PRESEEA("test")
+        corpus.set_filter('Madrid', 'all', 'all', 'all', 'yo ')
+        sample = {'label': 'MADR_H13_013', 'text': 'yo creo que ustedes'}
+
+        def retrieve_many(filter_list, concurrency, refresh, cache_only):
+            return {freeze_filter(filter_dict): [dict(sample)]
+                    for filter_dict in filter_list}
+
+        with mock.patch.object(corpus, 'retrieve_many',
+                               side_effect=retrieve_many) as batch_patch:
+            samples_list = corpus.retrieve_pronoun_data()
+
+        self.assertEqual(1, batch_patch.call_count)
+        self.assertEqual(12, len(batch_patch.call_args[0][0]))
+        self.assertEqual([sample], samples_list)
+
+        statistics = corpus.analyse_pronouns(samples_list)
+        self.assertEqual(1, statistics['ustedes']['Samples'])
+        self.assertEqual(1, statistics['yo']['Following counts'][0])
+
+
+if __name__ == '__main__':
+    unittest.main()
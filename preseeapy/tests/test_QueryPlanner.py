@@ -0,0 +1,80 @@
+import unittest
+import mock
+from preseeapy.PRESEEA import PRESEEA
+from preseeapy.QueryPlanner import QueryPlanner, filter_samples
+from preseeapy.utils import freeze_filter
+
+
+SAMPLES = [{'label': 'MADR_H13_013', 'text': 'a'},
+           {'label': ' MADR_ M11_004', 'text': 'b'},
+           {'label': 'MADR_M33_054', 'text': 'c'},
+           {'label': 'unknown', 'text': 'd'}]
+
+
+def retrieve_many(filter_list, concurrency, refresh, cache_only):
+    return {freeze_filter(filter_dict): list(SAMPLES)
+            for filter_dict in filter_list}
+
+
+class TestQueryPlannerClass(unittest.TestCase):
+    def setUp(self):
+        self.corpus = PRESEEA("test")
+        self.planner = QueryPlanner(self.corpus)
+
+    def _filter(self, gender, age, education, phrase='ustedes'):
+        self.corpus.set_filter('Madrid', gender, age, education, phrase)
+        return self.corpus.get_filter()
+
+    def test_filter_samples(self):
+        self.assertEqual(SAMPLES, filter_samples(SAMPLES))
+        self.assertEqual(['b', 'c'], [sample['text'] for sample
+                                      in filter_samples(SAMPLES, 'Mujer')])
+        self.assertEqual(['a'], [sample['text'] for sample in
+                                 filter_samples(SAMPLES, education='Alto',
+                                                age='Grupo 1')])
+
+    def test_plan(self):
+        filters = [self._filter('Mujer', 'all', 'all'),
+                   self._filter('Hombre', 'Grupo 1', 'Alto'),
+                   self._filter('all', 'all', 'all', phrase='yo'),
+                   self._filter('', 'all', 'all')]
+
+        crawls = self.planner.plan(filters)
+
+        self.assertEqual(2, len(crawls))
+        base_key = freeze_filter(self._filter('all', 'all', 'all'))
+        self.assertEqual(2, len(crawls[base_key]))
+
+    def test_retrieve(self):
+        """Sub-filters of one city and phrase share a single crawl"""
+        filters = [self._filter('Mujer', 'all', 'all'),
+                   self._filter('Hombre', 'Grupo 1', 'Alto'),
+                   self._filter('all', 'all', 'all'),
+                   self._filter('', 'all', 'all')]
+
+        with mock.patch.object(self.corpus, 'retrieve_many',
+                               side_effect=retrieve_many) as batch_patch:
+            results = self.planner.retrieve(filters)
+
+        self.assertEqual(1, batch_patch.call_count)
+        self.assertEqual(1, len(batch_patch.call_args[0][0]))
+        self.assertEqual(2, len(results[freeze_filter(filters[0])]))
+        self.assertEqual([SAMPLES[0]], results[freeze_filter(filters[1])])
+        self.assertEqual(SAMPLES, results[freeze_filter(filters[2])])
+        self.assertIsNone(results[freeze_filter(filters[3])])
+
+    def test_retrieve_breakdown(self):
+        self.corpus.set_filter('Madrid', 'all', 'all', 'all', 'ustedes')
+
+        with mock.patch.object(self.corpus, 'retrieve_many',
+                               side_effect=retrieve_many) as batch_patch:
+            results = self.corpus.retrieve_breakdown()
+
+        self.assertEqual(1, batch_patch.call_count)
+        self.assertEqual(18, len(results))
+        self.assertEqual(3, sum(len(sample_list)
+                                for sample_list in results.values()))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,60 @@
+import os
+import shutil
+import tempfile
+import unittest
+from scrapy.exceptions import IgnoreRequest
+from scrapy.http import FormRequest, HtmlResponse, Request
+from preseeapy.ASPXTwister import ASPXTwisterClass
+from preseeapy.preseeaspider.middlewares import (
+    RecordReplayDownloaderMiddleware, archive_settings)
+from preseeapy.preseeaspider.spiders.preseeabot import PreseeabotSpider
+from preseeapy.utils import ProcessHandler
+from preseeapy.tests import synthetic
+
+
+class TestRecordReplayMiddleware(unittest.TestCase):
+    def setUp(self):
+        self._directory = tempfile.mkdtemp()
+        self._path = os.path.join(self._directory, 'archive.jsonl.gz')
+        self.url = 'https://preseea.linguas.net/Corpus.aspx'
+
+    def tearDown(self):
+        shutil.rmtree(self._directory)
+
+    def test_record_replay(self):
+        """Recorded responses are replayed for the same request only"""
+        request = FormRequest(url=self.url, formdata={'phrase': 'ustedes'})
+        response = HtmlResponse(url=self.url, body=b'<html>ustedes</html>',
+                                request=request)
+        recorder = RecordReplayDownloaderMiddleware('record', self._path)
+        recorder.process_response(request, response, None)
+        recorder.spider_closed(PreseeabotSpider.__new__(PreseeabotSpider))
+
+        player = RecordReplayDownloaderMiddleware('replay', self._path)
+        replayed = player.process_request(
+            FormRequest(url=self.url, formdata={'phrase': 'ustedes'}), None)
+
+        self.assertEqual(response.body, replayed.body)
+        self.assertEqual(200, replayed.status)
+        self.assertIsInstance(replayed, HtmlResponse)
+        self.assertRaises(IgnoreRequest, player.process_request,
+                          FormRequest(url=self.url, formdata={'phrase': 'yo'}),
+                          None)
+        self.assertRaises(ValueError, RecordReplayDownloaderMiddleware,
+                          'live', self._path)
+
+    def test_replay_crawl(self):
+        """A replayed crawl runs through the spider without network"""
+        filter_dict = {'phrase': 'ustedes ', 'city': 'Madrid',
+                       'gender': 'all', 'education': 'all', 'age': 'all'}
+        rows = synthetic.write_archive(self._path, [filter_dict], 20)
+
+        twister = ASPXTwisterClass(filter_dict, PreseeabotSpider,
+                                   archive_settings('replay', self._path))
+        process_instance = ProcessHandler(
+            twister._retrieve_phrase_data_subprocess)
+        results = process_instance.get_queue_content()
+        process_instance.close()
+
+        self.assertEqual([synthetic.expected_record(row, 'ustedes ')
+                          for row in rows['ustedes ']], results)
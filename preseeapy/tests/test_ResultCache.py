@@ -0,0 +1,85 @@
+import os
+import shutil
+import tempfile
+import unittest
+import mock
+from preseeapy.ResultCache import ResultCache
+from preseeapy.Sample import Sample
+
+
+class TestResultCacheClass(unittest.TestCase):
+    def setUp(self):
+        self._directory = tempfile.mkdtemp()
+        self._path = os.path.join(self._directory, 'results.sqlite')
+        self.cache = ResultCache(self._path, max_entries=2)
+        self.filter_dict = {'phrase': 'ustedes ', 'city': 'Madrid',
+                            'gender': 'all', 'education': 'all', 'age': 'all'}
+        self.data = [{'label': 'MADR_H13_013', 'text': 'ustedes tienen',
+                      'date': '2008-02-27', 'country': 'España'}]
+
+    def tearDown(self):
+        self.cache.close()
+        shutil.rmtree(self._directory)
+
+    def test_get(self):
+        self.assertIsNone(self.cache.get(self.filter_dict))
+
+        self.cache.set(self.filter_dict, self.data)
+        self.assertEqual(self.data, self.cache.get(self.filter_dict))
+
+        # Entries persist and keys do not depend on the filter order
+        reordered_filter = dict(reversed(list(self.filter_dict.items())))
+        reopened_cache = ResultCache(self._path)
+        self.assertEqual(self.data, reopened_cache.get(reordered_filter))
+        reopened_cache.close()
+
+    def test_samples(self):
+        """Samples are stored as records and loaded as samples"""
+        self.cache.set(self.filter_dict, [Sample.from_dict(self.data[0])])
+
+        loaded = self.cache.get(self.filter_dict)
+        self.assertEqual(self.data, loaded)
+        self.assertIsInstance(loaded[0], Sample)
+
+    def test_schema_version(self):
+        self.cache.set(self.filter_dict, self.data)
+
+        with mock.patch("preseeapy.ResultCache.SCHEMA_VERSION", -1):
+            self.assertIsNone(self.cache.get(self.filter_dict))
+
+    @mock.patch("preseeapy.ResultCache.time.time")
+    def test_ttl(self, time_patch):
+        cache = ResultCache(self._path, ttl=60)
+        time_patch.return_value = 1000
+        cache.set(self.filter_dict, self.data)
+
+        time_patch.return_value = 1059
+        self.assertIsNotNone(cache.get(self.filter_dict))
+        time_patch.return_value = 1060
+        self.assertIsNone(cache.get(self.filter_dict))
+        self.assertEqual(0, len(cache))
+        cache.close()
+
+    @mock.patch("preseeapy.ResultCache.time.time")
+    def test_eviction(self, time_patch):
+        """The least recently used entry is evicted first"""
+        filter_list = [dict(self.filter_dict, phrase=phrase)
+                       for phrase in ['yo', 'tú', 'usted']]
+
+        time_patch.return_value = 1
+        self.cache.set(filter_list[0], self.data)
+        time_patch.return_value = 2
+        self.cache.set(filter_list[1], self.data)
+        time_patch.return_value = 3
+        self.cache.get(filter_list[0])
+        time_patch.return_value = 4
+        self.cache.set(filter_list[2], self.data)
+
+        self.assertEqual(2, len(self.cache))
+        self.assertIsNone(self.cache.get(filter_list[1]))
+        self.assertIsNotNone(self.cache.get(filter_list[0]))
+
+    def test_invalidate(self):
+        self.cache.set(self.filter_dict, self.data)
+        self.cache.invalidate(self.filter_dict)
+        self.assertIsNone(self.cache.get(self.filter_dict))
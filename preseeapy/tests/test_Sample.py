@@ -0,0 +1,39 @@
+import pickle
+import unittest
+from preseeapy.Sample import Sample, to_sample
+
+
+class TestSampleClass(unittest.TestCase):
+    def setUp(self):
+        self.record = {'label': 'MADR_H13_013', 'text': 'ustedes tienen',
+                       'date': '2008-02-27', 'country': 'España'}
+        self.sample = Sample.from_dict(self.record)
+
+    def test_mapping(self):
+        """Samples are read like the dictionaries they replace"""
+        self.assertEqual('ustedes tienen', self.sample['text'])
+        self.assertEqual('España', self.sample.country)
+        self.assertEqual(self.record, self.sample)
+        self.assertEqual(self.record, dict(self.sample))
+        self.assertEqual(self.record, self.sample.to_dict())
+        self.assertEqual(list(self.record.keys()), list(self.sample.keys()))
+        self.assertIn('date', self.sample)
+        self.assertIsNone(self.sample.get('city'))
+        self.assertRaises(KeyError, self.sample.__getitem__, 'city')
+        self.assertFalse(hasattr(self.sample, '__dict__'))
+
+    def test_pickle(self):
+        loaded = pickle.loads(pickle.dumps([self.sample, self.sample]))
+
+        self.assertEqual([self.record, self.record], loaded)
+        self.assertIsInstance(loaded[0], Sample)
+        self.assertIs(self.sample.date, loaded[1].date)
+
+    def test_to_sample(self):
+        self.assertIsInstance(to_sample(self.record), Sample)
+        self.assertEqual({'text': 'yo'}, to_sample({'text': 'yo'}))
+        self.assertNotIsInstance(to_sample({'text': 'yo'}), Sample)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,72 @@
+import os
+import shutil
+import tempfile
+import unittest
+import mock
+from preseeapy.PRESEEA import PRESEEA
+from preseeapy.SampleCountIndex import SampleCountIndex
+from preseeapy.utils import freeze_filter
+
+
+class TestSampleCountIndexClass(unittest.TestCase):
+    def setUp(self):
+        self._directory = tempfile.mkdtemp()
+        self._path = os.path.join(self._directory, 'sample_index.json')
+        self.index = SampleCountIndex(self._path)
+
+    def tearDown(self):
+        shutil.rmtree(self._directory)
+
+    def test_get_count(self):
+        self.assertIsNone(self.index.get_count('Madrid'))
+
+        self.index.set_count('Madrid', 'all', 'all', 'all', 54)
+        self.index.set_count('Madrid', 'Mujer', 'Grupo 1', 'Alto', 3)
+        self.index.save()
+
+        reopened_index = SampleCountIndex(self._path)
+        self.assertEqual(54, reopened_index.get_count('Madrid'))
+        self.assertEqual(3, reopened_index.get_count('Madrid', 'Mujer',
+                                                     'Grupo 1', 'Alto'))
+        self.assertIsNone(reopened_index.get_count('Madrid', 'Hombre',
+                                                   'Grupo 1', 'Alto'))
+
+    def test_rebuild(self):
+        corpus = PRESEEA("test")
+
+        def retrieve_many(filter_list, concurrency, refresh, cache_only):
+            # One sample for every informant cell
+            labels = ['LIMA_{}{}{}_001'.format(gender, age, education)
+                      for gender in 'HM' for age in '123'
+                      for education in '123']
+            return {freeze_filter(filter_dict):
+                    [{'label': label} for label in labels]
+                    for filter_dict in filter_list}
+
+        with mock.patch.object(corpus, 'retrieve_many',
+                               side_effect=retrieve_many) as batch_patch:
+            self.index.rebuild(corpus, cities=['Madrid', 'Lima'])
+
+        # One batch with a single crawl per city
+        filter_list = batch_patch.call_args[0][0]
+        self.assertEqual(2, len(filter_list))
+        self.assertEqual(18, self.index.get_count('Lima'))
+        self.assertEqual(3, self.index.get_count('Lima', 'Hombre',
+                                                 'all', 'Bajo'))
+        self.assertEqual(1, self.index.get_count('Lima', 'Mujer',
+                                                 'Grupo 2', 'Alto'))
+        self.assertIsNotNone(SampleCountIndex(self._path).get_built_time())
+
+    @mock.patch("preseeapy.PRESEEA.get_number_city_samples",
+                return_value=10)
+    def test_retrieve_city_info(self, crawl_patch):
+        """Indexed cities are answered without crawling"""
+        self.index.set_count('Madrid', 'all', 'all', 'all', 54)
+        corpus = PRESEEA("test", sample_index=self.index)
+        corpus.set_filter('Madrid', 'all', 'all', 'all', 'ustedes')
+
+        self.assertEqual(54, corpus.retrieve_city_info())
+        self.assertEqual(0, crawl_patch.call_count)
+
+        corpus.set_filter('Lima', 'all', 'all', 'all', 'ustedes')
+        self.assertEqual(10, corpus.retrieve_city_info())
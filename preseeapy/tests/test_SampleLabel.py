@@ -0,0 +1,40 @@
+import unittest
+from preseeapy.SampleLabel import SampleLabel, parse_label
+
+
+class TestSampleLabelClass(unittest.TestCase):
+    def test_parse(self):
+        label = SampleLabel('MADR_H13_013')
+
+        self.assertEqual('MADR', label.get_city_code())
+        self.assertEqual('Hombre', label.get_gender())
+        self.assertEqual('Grupo 1', label.get_age())
+        self.assertEqual('Alto', label.get_education())
+        self.assertEqual(13, label.get_number())
+
+    def test_parse_spaces(self):
+        """Stray spaces of crawled labels are ignored"""
+        label = SampleLabel(' MADR_ M21_004')
+
+        self.assertEqual('Mujer', label.get_gender())
+        self.assertEqual('Grupo 2', label.get_age())
+        self.assertEqual('Bajo', label.get_education())
+        self.assertEqual('MADR_4', str(label))
+
+    def test_unknown_label(self):
+        self.assertRaises(ValueError, SampleLabel, 'MADR_X13_013')
+        self.assertRaises(ValueError, SampleLabel, 'Entrevista 12')
+        self.assertIsNone(parse_label('MADR_H43_013'))
+
+    def test_matches(self):
+        label = SampleLabel('LIMA_M32_040')
+
+        self.assertTrue(label.matches())
+        self.assertTrue(label.matches('Mujer', 'Grupo 3', 'Medio'))
+        self.assertTrue(label.matches(education='Medio'))
+        self.assertFalse(label.matches('Hombre'))
+        self.assertFalse(label.matches('Mujer', 'Grupo 3', 'Alto'))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,119 @@
+import os
+import shutil
+import sys
+import tempfile
+import unittest
+import mock
+from multiprocessing import Process, Queue
+from preseeapy.SampleStore import SampleStore
+from preseeapy.QueryPlanner import filter_samples
+from preseeapy.tests import synthetic
+
+
+def count_samples(path: str, queue: Queue):
+    queue.put(len(list(SampleStore(path).iter_samples(city='Lima'))))
+
+
+class TestSampleStoreClass(unittest.TestCase):
+    def setUp(self):
+        self._directory = tempfile.mkdtemp()
+        self.store = SampleStore(self._directory)
+        self.samples = {}
+        for city in ['Madrid', 'Lima']:
+            rows = synthetic.build_rows(40, 'señor ', seed=len(city))
+            self.samples[city] = [synthetic.expected_record(row, 'señor ')
+                                  for row in rows]
+
+    def tearDown(self):
+        self.store.close()
+        shutil.rmtree(self._directory)
+
+    def test_append(self):
+        self.assertEqual(0, len(self.store))
+        self.assertEqual([], list(self.store.iter_samples()))
+
+        self.store.append(self.samples['Madrid'], 'Madrid')
+        self.store.append(self.samples['Lima'] + [
+            {'label': 'unknown', 'text': '', 'date': '', 'country': 'Perú'}],
+            'Lima')
+
+        self.assertEqual(81, len(self.store))
+        self.assertEqual(['Lima', 'Madrid'], sorted(self.store.get_cities()))
+        self.assertEqual(self.samples['Madrid'],
+                         [sample.to_dict() for sample
+                          in self.store.iter_samples(city='Madrid')])
+        self.assertEqual('', self.store.get_sample(80)['text'])
+
+        reopened_store = SampleStore(self._directory)
+        self.assertEqual(81, len(reopened_store))
+        self.assertEqual(self.store.get_sample(45),
+                         reopened_store.get_sample(45))
+        reopened_store.close()
+
+    def test_concurrent_writers(self):
+        """Writers with a stale string table keep the strings apart"""
+        other_store = SampleStore(self._directory)
+        self.store.append(self.samples['Madrid'], 'Madrid')
+        other_store.append(self.samples['Lima'], 'Lima')
+        self.store.append(self.samples['Madrid'][:1], 'Madrid')
+
+        reopened_store = SampleStore(self._directory)
+        self.assertEqual(81, len(reopened_store))
+        self.assertEqual(self.samples['Lima'],
+                         [sample.to_dict() for sample
+                          in reopened_store.iter_samples(city='Lima')])
+        self.assertEqual(self.samples['Madrid'][0],
+                         reopened_store.get_sample(80).to_dict())
+        reopened_store.close()
+        other_store.close()
+
+    def test_append_strings(self):
+        """Strings are appended, known strings are not written again"""
+        strings_path = os.path.join(self._directory, 'strings.bin')
+        self.store.append(self.samples['Madrid'], 'Madrid')
+        with open(strings_path, 'rb') as file:
+            strings = file.read()
+
+        self.store.append(self.samples['Madrid'], 'Madrid')
+        with open(strings_path, 'rb') as file:
+            self.assertEqual(strings, file.read())
+
+        self.store.append(self.samples['Lima'], 'Lima')
+        with open(strings_path, 'rb') as file:
+            self.assertTrue(file.read().startswith(strings))
+        self.assertEqual(['Lima', 'Madrid'], sorted(self.store.get_cities()))
+
+    def test_lock_without_fcntl(self):
+        """Windows has no fcntl, the store is locked with msvcrt"""
+        msvcrt = mock.Mock(LK_LOCK=2, LK_UNLCK=0)
+        with mock.patch.dict(sys.modules, {'fcntl': None, 'msvcrt': msvcrt}):
+            self.store.append(self.samples['Lima'], 'Lima')
+
+        self.assertEqual([2, 0], [call[0][1] for call
+                                  in msvcrt.locking.call_args_list])
+        self.assertEqual(40, len(self.store))
+
+    def test_select(self):
+        self.store.append(self.samples['Madrid'], 'Madrid')
+        self.store.append(self.samples['Lima'], 'Lima')
+
+        expected = filter_samples(self.samples['Lima'], 'Mujer', 'all', 'Alto')
+        self.assertEqual(expected, [sample.to_dict() for sample in
+                                    self.store.iter_samples('Lima', 'Mujer',
+                                                            'all', 'Alto')])
+        self.assertEqual(0, len(self.store.select(city='Quito')))
+        self.assertRaises(ValueError, self.store.select, gender='Otro')
+
+    def test_shared_reader(self):
+        """Another process maps the same store"""
+        self.store.append(self.samples['Lima'], 'Lima')
+
+        queue = Queue()
+        process = Process(target=count_samples, args=(self._directory, queue))
+        process.start()
+        self.assertEqual(40, queue.get())
+        process.join()
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,30 @@
+import unittest
+from preseeapy.SuffixTrie import SuffixTrie
+
+
+class TestSuffixTrieClass(unittest.TestCase):
+    def setUp(self):
+        self.trie = SuffixTrie()
+        self.trie.add('o', 1)
+        self.trie.add('oy', 1)
+        self.trie.add('mos', 2)
+        self.trie.add('monos', 2)
+        self.trie.add('os', 4)
+
+    def test_match(self):
+        self.assertEqual(1, self.trie.match('llamo'))
+        self.assertEqual(1, self.trie.match('voy'))
+        self.assertEqual(2 | 4, self.trie.match('vamos'))
+        self.assertEqual(2 | 4, self.trie.match('monos'))
+        self.assertEqual(4, self.trie.match('os'))
+        self.assertEqual(0, self.trie.match('son'))
+        self.assertEqual(0, self.trie.match(''))
+
+    def test_add(self):
+        self.assertRaises(ValueError, self.trie.add, '', 1)
+        self.trie.add('o', 8)
+        self.assertEqual(1 | 8, self.trie.match('llamo'))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,46 @@
+import unittest
+from preseeapy.Tokenizer import Tokenizer, strip_word
+from preseeapy.VerbClassifier import VerbClassifier
+
+
+class TestTokenizerClass(unittest.TestCase):
+    def setUp(self):
+        self.text = "¿tú vas? / a  la &lt;risas&gt; casa… …"
+        self.tokenizer = Tokenizer()
+
+    def test_tokenize(self):
+        self.assertEqual(["¿tú", "vas?", "a", "la", "casa…"],
+                         self.tokenizer.tokenize(self.text))
+        self.assertEqual(["tú", "vas", "la", "casa…"],
+                         Tokenizer(strip=True).tokenize(self.text))
+
+    def test_strip_word(self):
+        """Stripping matches the former VerbClassifier.set_word_list"""
+        classifier = VerbClassifier([])
+        words = ["¿vienes?", "¡ya!", "a", "?", "", 3, None, "hablo"]
+
+        classifier.set_word_list(words)
+        self.assertEqual(["vienes", "ya", "hablo"],
+                         classifier.get_word_list())
+        self.assertEqual("vienes", strip_word("¿vienes?"))
+        self.assertIsNone(strip_word("a"))
+        self.assertIsNone(strip_word(3))
+
+    def test_tokenize_spans(self):
+        spans = Tokenizer(strip=True).tokenize_spans(self.text)
+
+        self.assertEqual([word for word, _, _ in spans],
+                         Tokenizer(strip=True).tokenize(self.text))
+        for word, start, end in spans:
+            self.assertEqual(word, self.text[start:end])
+
+    def test_tokenize_ids(self):
+        vocabulary = {"la": 0}
+        token_ids = self.tokenizer.tokenize_ids("la casa y la mesa", vocabulary)
+
+        self.assertEqual([0, 1, 2, 0, 3], token_ids)
+        self.assertEqual({"la": 0, "casa": 1, "y": 2, "mesa": 3}, vocabulary)
+
+
+if __name__ == '__main__':
+    unittest.main()
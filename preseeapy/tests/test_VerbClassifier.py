@@ -1,5 +1,7 @@
+import itertools
 import unittest
 from preseeapy.VerbClassifier import VerbClassifier
+from preseeapy.tests import synthetic
 
 
 class TestVerbClassifierClass(unittest.TestCase):
@@ -42,3 +44,49 @@ class TestVerbClassifierClass(unittest.TestCase):
         test_word = 'sois'
         is_2p_pl_verb = self.classifier.is_2person_plural(test_word)
         self.assertTrue(is_2p_pl_verb)
+
+    def test_compiled_classification(self):
+        """The suffix trie gives the results of the is_* methods"""
+        suffixes = ['', 'o', 'oy', 'as', 'es', 'e', 'a', 'mos', 'monos',
+                    'eis', 'áis', 'en', 'án', 'iendo', 'ndo', 'n', 's']
+        words = [' no ', 'bueno', 'cosas', 'que', 'la', 'se', 'con', 'en',
+                 ' monos ', 'monos', 'comiendo', 'o', 'a', '']
+        words += [word + suffix for word, suffix
+                  in itertools.product(synthetic.WORDS, suffixes)]
+
+        for word in words:
+            expected = [key for key, name
+                        in VerbClassifier.VERB_CLASSES.items()
+                        if getattr(self.classifier, name)(word)]
+            self.assertEqual(expected, self.classifier.get_verb_classes(word),
+                             word)
+
+    def test_classification_cache(self):
+        """Word forms are classified once and evicted beyond the size"""
+        cache_size = VerbClassifier.CACHE_SIZE
+        VerbClassifier.set_cache_size(2)
+        try:
+            self.classifier.set_word_list(["llamo", "vamos", "llamo",
+                                           "llamo", "abren"])
+            classified_verbs = self.classifier.classify_verbs()
+            info = VerbClassifier.get_cache_info()
+
+            self.assertEqual(["llamo", "llamo", "llamo"],
+                             classified_verbs['1ps_sg'])
+            self.assertEqual(2, info['hits'])
+            self.assertEqual(3, info['misses'])
+            self.assertEqual(2, info['size'])
+
+            # Shared by other instances, vamos was evicted by abren
+            VerbClassifier(["abren", "vamos"]).classify_verbs()
+            info = VerbClassifier.get_cache_info()
+            self.assertEqual(3, info['hits'])
+            self.assertEqual(4, info['misses'])
+
+            self.assertRaises(ValueError, VerbClassifier.set_cache_size, -1)
+        finally:
+            VerbClassifier.set_cache_size(cache_size)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,72 @@
+import unittest
+import mock
+import numpy as np
+from preseeapy.Vocabulary import Vocabulary
+from preseeapy.VerbClassifier import VerbClassifier
+
+
+class TestVocabularyClass(unittest.TestCase):
+    def setUp(self):
+        self.vocabulary = Vocabulary()
+
+    def test_encode(self):
+        token_ids = self.vocabulary.encode("yo creo / que yo")
+
+        self.assertEqual('I', token_ids.typecode)
+        self.assertEqual([0, 1, 2, 0], list(token_ids))
+        self.assertEqual(["yo", "creo", "que", "yo"],
+                         self.vocabulary.decode(token_ids))
+        self.assertEqual(1, self.vocabulary.find_id("creo"))
+        self.assertIsNone(self.vocabulary.find_id("tengo"))
+        self.assertEqual(3, self.vocabulary.get_id("tengo"))
+
+    def test_encode_many(self):
+        token_ids, offsets = self.vocabulary.encode_many(
+            ["yo creo", "", "creo que sí"])
+
+        self.assertEqual(np.int32, token_ids.dtype)
+        np.testing.assert_array_equal([0, 1, 1, 2, 3], token_ids)
+        np.testing.assert_array_equal([0, 2, 2, 5], offsets)
+
+    def test_keep_texts(self):
+        """Texts of a former batch are not tokenized again within
+           keep_texts, the kept texts are bounded and released after it
+        """
+        tokenizer = self.vocabulary.get_tokenizer()
+        with mock.patch.object(tokenizer, 'tokenize',
+                               wraps=tokenizer.tokenize) as tokenize:
+            with self.vocabulary.keep_texts():
+                self.vocabulary.encode_many(["yo creo", "creo que sí"])
+                token_ids, offsets = self.vocabulary.encode_many(
+                    ["creo que sí", "tú", "yo creo"])
+            self.assertEqual(3, tokenize.call_count)
+            np.testing.assert_array_equal([1, 2, 3, 4, 0, 1], token_ids)
+            np.testing.assert_array_equal([0, 3, 4, 6], offsets)
+
+            self.vocabulary.encode_many(["tú"])
+            self.assertEqual(4, tokenize.call_count)
+
+            # A table smaller than two texts keeps only the last one
+            with self.vocabulary.keep_texts(max_bytes=100):
+                self.vocabulary.encode_many(["yo creo", "tú", "yo creo"])
+            self.assertEqual(7, tokenize.call_count)
+
+    def test_get_verb_masks(self):
+        """Masks are kept per id and extended for new words"""
+        self.vocabulary.encode("¿vienes? que")
+        self.assertEqual(2, len(self.vocabulary.get_verb_masks()))
+
+        self.vocabulary.encode("vamos")
+        masks = self.vocabulary.get_verb_masks()
+        classifier = VerbClassifier([])
+        mask_keys = VerbClassifier._compile()[3]
+        for word, mask in zip(["vienes", "que", "vamos"], masks):
+            self.assertEqual(classifier.get_verb_classes(word),
+                             mask_keys[mask])
+
+    def test_shared(self):
+        self.assertIs(Vocabulary.shared(), Vocabulary.shared())
+
+
+if __name__ == '__main__':
+    unittest.main()
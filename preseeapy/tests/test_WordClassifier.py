@@ -1,5 +1,5 @@
 import unittest
-from preseeapy.WordClassifier import WordClassifier
+from preseeapy.WordClassifier import WordClassifier, iter_sequence
 
 
 class TestWordClassifierClass(unittest.TestCase):
@@ -13,6 +13,16 @@ class TestWordClassifierClass(unittest.TestCase):
         self.assertEqual(7, len(returned_list))
         self.assertEqual("tal?/", returned_list[2])
 
+    def test_no_word_list(self):
+        self.classifier.NO_WORD_LIST.append("has")
+        self.classifier.set_phrase(self.test_phrase)
+
+        self.assertEqual(["Finalmente", "llegado"],
+                         self.classifier.get_word_list()[3:5])
+        # Other instances keep their own list
+        self.assertEqual(["hola", "has", "visto"],
+                         WordClassifier("hola / has visto").get_word_list())
+
     def test_get_following_words(self):
         following_list = self.classifier.get_following_words("Finalmente")
 
@@ -29,3 +39,36 @@ class TestWordClassifierClass(unittest.TestCase):
 
         self.assertEqual(leading_list[0], "?Hola,")
         self.assertEqual(following_list[0], "has")
+
+    def test_get_environment_windows(self):
+        """Every occurrence is found, several words as a sequence"""
+        classifier = WordClassifier("a ustedes b c d ustedes e ustedes")
+
+        windows = classifier.get_environment_windows("ustedes ")
+        self.assertEqual([(["a"], ["b", "c", "d"]),
+                          (["b", "c", "d"], ["e", "ustedes"]),
+                          (["d", "ustedes", "e"], [])], windows)
+
+        windows = classifier.get_environment_windows("c d ustedes",
+                                                     word_range=1)
+        self.assertEqual([(["b"], ["e"])], windows)
+        self.assertEqual([], classifier.get_environment_windows("d c"))
+        self.assertRaises(ValueError, classifier.get_environment_windows,
+                          "ustedes", -1)
+        self.assertRaises(ValueError, classifier.get_environment_words, "x")
+
+        leading_list, following_list = classifier.get_environment_words(
+            "ustedes", word_range=2)
+        self.assertEqual((["a"], ["b", "c"]), (leading_list, following_list))
+
+    def test_iter_sequence(self):
+        words = ["a", "a", "b", "a", "a", "a", "b"]
+
+        self.assertEqual([1, 5], list(iter_sequence(words, ["a", "b"])))
+        self.assertEqual([0, 3, 4], list(iter_sequence(words, ["a", "a"])))
+        self.assertEqual([0, 1, 3, 4, 5], list(iter_sequence(words, ["a"])))
+        self.assertEqual([], list(iter_sequence(words, [])))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -1,7 +1,28 @@
 import unittest
-from preseeapy.utils import ProcessHandler
+from multiprocessing import Queue
+from preseeapy.utils import ProcessHandler, freeze_filter
+
+
+def _put_numbers(queue: Queue):
+    for number in range(3):
+        queue.put(number)
+    queue.put(None)
 
 
 class TestUtilsClass(unittest.TestCase):
     def test_ProcessHandler(self):
         self.assertRaises(ValueError, ProcessHandler, 5)
+
+    def test_iter_queue_content(self):
+        process_instance = ProcessHandler(_put_numbers, 1)
+        content = list(process_instance.iter_queue_content(None))
+        process_instance.close()
+
+        self.assertEqual([0, 1, 2], content)
+
+    def test_freeze_filter(self):
+        filter_dict = {'phrase': 'yo ', 'city': 'Madrid', 'gender': 'all'}
+        reordered = {'gender': 'all', 'phrase': 'yo ', 'city': 'Madrid'}
+
+        self.assertEqual(freeze_filter(filter_dict), freeze_filter(reordered))
+        self.assertEqual(filter_dict, dict(freeze_filter(reordered)))
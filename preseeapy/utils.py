@@ -1,3 +1,4 @@
+import os
 import types
 from multiprocessing import Process, Queue
 
@@ -6,13 +7,15 @@ class ProcessHandler():
     """A ProcessHandler object gets a function to attach to a
        subprocess.
     """
-    def __init__(self, attach_function: types.FunctionType):
+    def __init__(self, attach_function: types.FunctionType,
+                 queue_size: int = 0):
         # It is necessary for later usability that the function
         # object contains a magic function __call__
         if not hasattr(attach_function, '__call__'):
             raise ValueError("Attach function object to ProcessHandler!")
 
-        self._queue = Queue()
+        # A bounded queue blocks the subprocess until content is read
+        self._queue = Queue(queue_size)
         self._process = self._start_process(attach_function)
 
     def _start_process(self, function) -> Process:
@@ -35,5 +38,54 @@ class ProcessHandler():
 
         return content
 
+    def iter_queue_content(self, sentinel):
+        """Yield the queue content until the sentinel is received.
+
+        Args:
+            sentinel (object): Last element put by the subprocess
+
+        Yields:
+            object: Content put by the subprocess
+        """
+        content = self._queue.get()
+        while content != sentinel:
+            yield content
+            content = self._queue.get()
+
     def close(self):
         self._process.join()
+
+    def terminate(self):
+        """Stop the subprocess without waiting for its function"""
+        self._process.terminate()
+        self._process.join()
+
+
+def freeze_filter(filter_dict: dict) -> tuple:
+    """Turn a filter dictionary into a hashable key, e.g. to key
+       the results of several queries by their filter. Equal filters
+       give the same key regardless of their key order.
+
+    Args:
+        filter_dict (dict): Filter as returned by PRESEEA.get_filter
+
+    Returns:
+        tuple: Tuple of (filter name, value) pairs sorted by name
+    """
+    return tuple(sorted(filter_dict.items()))
+
+
+def get_data_dir() -> str:
+    """Directory for persistent preseeapy data like caches and indices.
+       Set PRESEEAPY_HOME to move it away from ~/.preseeapy.
+
+    Returns:
+        str: Existing directory path
+    """
+    data_dir = os.environ.get('PRESEEAPY_HOME',
+                              os.path.join(os.path.expanduser('~'),
+                                           '.preseeapy'))
+    if not os.path.exists(data_dir):
+        os.makedirs(data_dir)
+
+    return data_dir